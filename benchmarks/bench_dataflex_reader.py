@@ -0,0 +1,106 @@
+""" Benchmark - dataflex reader (one connection, fetch_size batches) vs a connection per vld file """
+
+# standard library imports
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# local library imports
+from source_readers import DataFlexReader
+
+# constants
+TABLE_COUNT = 200
+ROW_COUNT = 5000
+# the dataflex driver reads filelist.cfg & the vld headers on every connect
+CONNECT_SECONDS = 0.02
+
+def build_database(database_file: str):
+    """ Stand-in dataflex directory - a sqlite database with a table per vld file """
+
+    connection = sqlite3.connect(database_file)
+
+    for table_index in range(TABLE_COUNT):
+        connection.execute(f'create table file_{table_index} (id integer, name text, amount numeric, added date)')
+        connection.executemany(
+            f'insert into file_{table_index} values (?, ?, ?, ?)',
+            ((row, f'CUSTOMER {row}', row * 1.25, '2024-01-01') for row in range(ROW_COUNT)),
+        )
+
+    connection.commit()
+    connection.close()
+
+def stand_in_connect(database_file: str) -> callable:
+    """ Returns a DB-API connect function with the driver's connect time """
+
+    def connect(connection_string: str):
+        time.sleep(CONNECT_SECONDS)
+        return sqlite3.connect(database_file)
+
+    return connect
+
+def connection_per_file(connect: callable, file_list: list) -> int:
+    """ The previous DataPipeline.__dataflex_source - a connection per file, 1000 row batches """
+
+    row_count = 0
+
+    for file_list_table in file_list:
+        odbc_connection = connect('DRIVER={DataFlex Driver};DBQ=.')
+        data_cursor = odbc_connection.cursor()
+        data_cursor.execute(f"select * from {file_list_table.split('.')[0]}")
+
+        row_batch = data_cursor.fetchmany(1000)
+        while row_batch:
+            row_count += len(row_batch)
+            row_batch = data_cursor.fetchmany(1000)
+
+        data_cursor.close()
+        odbc_connection.close()
+
+    return row_count
+
+def dataflex_reader(connect: callable, file_list: list, fetch_size: int) -> int:
+    """ One reader for the directory """
+
+    row_count = 0
+
+    with DataFlexReader('.', fetch_size, connect) as reader:
+        for file_list_table in file_list:
+            table_source = reader.batches(file_list_table)
+            next(table_source)
+
+            for row_batch in table_source:
+                row_count += len(row_batch)
+
+        assert reader.get_connection_count() == 1
+
+    return row_count
+
+def rows_per_second(read: callable, *arguments) -> int:
+    """ Returns rows per second for the read """
+
+    start_time = time.perf_counter()
+    row_count = read(*arguments)
+
+    return int(row_count / (time.perf_counter() - start_time))
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as bench_directory:
+        bench_file = os.path.join(bench_directory, 'dataflex.db')
+        build_database(bench_file)
+
+        bench_connect = stand_in_connect(bench_file)
+        bench_files = [f'file_{table_index}.vld' for table_index in range(TABLE_COUNT)]
+
+        # same rows before running timings
+        assert connection_per_file(bench_connect, bench_files) == dataflex_reader(bench_connect, bench_files, 1000)
+
+        before = rows_per_second(connection_per_file, bench_connect, bench_files)
+        print(f'connection per file (before):  {before:>12,} rows/sec')
+
+        for bench_fetch_size in (1000, 10000):
+            after = rows_per_second(dataflex_reader, bench_connect, bench_files, bench_fetch_size)
+            print(f'reader fetch_size {bench_fetch_size:<6} (after): {after:>12,} rows/sec  {after / before:.1f}x')
@@ -0,0 +1,168 @@
+""" Benchmark - fox pro reader column batches vs the row at a time transform they replaced """
+
+# standard library imports
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# third party library imports
+import dbfread
+
+# local library imports
+from copy_format import CopyTextEncoder
+from source_readers import FoxProReader
+from utilities import ArrayList
+
+# constants
+ROW_COUNT = 200000
+# name, type, length, decimal count
+FIELDS = [
+    ('custno', 'C', 10, 0),
+    ('company', 'C', 40, 0),
+    ('active', 'L', 1, 0),
+    ('added', 'D', 8, 0),
+    ('balance', 'N', 12, 2),
+    ('credit', 'N', 6, 2),
+    ('visits', 'N', 8, 0),
+    ('rating', 'F', 10, 3),
+]
+
+def build_dbf(dbf_file: str, seed: int = 1):
+    """ dBase III file with the fields, the odd null & a credit too wide for pg's numeric(6,2) """
+
+    random.seed(seed)
+    record_length = 1 + sum(field[2] for field in FIELDS)
+
+    with open(dbf_file, 'wb') as dbf:
+        dbf.write(struct.pack('<BBBBIHH20x', 0x03, 124, 1, 1, ROW_COUNT, 32 + 32 * len(FIELDS) + 1, record_length))
+        for name, field_type, length, decimal_count in FIELDS:
+            dbf.write(struct.pack('<11sc4xBB14x', name.upper().encode(), field_type.encode(), length, decimal_count))
+        dbf.write(b'\r')
+
+        for row in range(ROW_COUNT):
+            values = [
+                f'C{row:08}',
+                random.choice(['ACME SUPPLY CO', "O'BRIEN & SONS", 'CAFÉ DU MONDE', '']),
+                random.choice('TF?'),
+                '' if row % 50 == 0 else date(2000 + row % 24, 1 + row % 12, 1 + row % 28).strftime('%Y%m%d'),
+                f'{random.uniform(-99999, 99999):.2f}',
+                '12345' if row % 100 == 0 else f'{random.uniform(0, 999):.2f}',
+                '' if row % 10 == 0 else str(row % 5000),
+                f'{random.uniform(0, 5):.3f}',
+            ]
+            dbf.write(b' ' + b''.join(
+                value.encode('cp1252').ljust(field[2]) if field[1] == 'C' else value.encode().rjust(field[2])
+                for field, value in zip(FIELDS, values)
+            ))
+
+        dbf.write(b'\x1a')
+
+def row_transform(path: str, file_list_table: str, fetch_size: int) -> list:
+    """ The previous FoxProReader.batches (streaming) - a row at a time, from the OrderedDict of every record """
+
+    dbf_cursor = dbfread.DBF(
+        filename=os.path.join(path, file_list_table), encoding='cp1252', lowernames=True, load=False
+    )
+    dbf_fields = dbf_cursor.fields
+    table_fields = ArrayList(
+        ['string' if field.type == 'C' else 'boolean' if field.type == 'L' else 'date' if field.type == 'D'
+            else 'number' if field.type == 'F' else 'decimal' for field in dbf_fields]
+    )
+
+    row_batch = ArrayList()
+    for row in dbf_cursor.records:
+        row_values = ArrayList()
+
+        column_count = 0
+        for column in ArrayList(row.items()):
+            if table_fields[column_count] == 'boolean':
+                row_values.append(str(column[1]) == 'True')
+            elif table_fields[column_count] == 'number':
+                row_values.append(column[1] if column[1] is not None else 0)
+            elif table_fields[column_count] == 'decimal':
+                if column[1] is None:
+                    row_values.append(0)
+                elif (
+                    len(str(column[1]).split('.', maxsplit=1)[0])
+                    > dbf_fields[column_count].length - dbf_fields[column_count].decimal_count
+                ):
+                    row_values.append(
+                        float('9' * (dbf_fields[column_count].length - dbf_fields[column_count].decimal_count)
+                            + '.' + '9' * dbf_fields[column_count].decimal_count)
+                    )
+                else:
+                    row_values.append(str(column[1]).strip()[0 : dbf_fields[column_count].length])
+            elif table_fields[column_count] == 'string':
+                row_values.append(str(column[1]) if column[1] is not None else '')
+            elif column[1] is None:
+                row_values.append(None)
+            elif table_fields[column_count] == 'date':
+                row_values.append(column[1])
+            column_count += 1
+        row_batch.append(row_values)
+
+        if len(row_batch) == fetch_size:
+            yield row_batch
+            row_batch = ArrayList()
+
+    if len(row_batch) != 0:
+        yield row_batch
+
+def column_batches(path: str, file_list_table: str, fetch_size: int) -> list:
+    """ FoxProReader - a column at a time into ColumnBatch batches """
+
+    table_source = FoxProReader(path, streaming=True, fetch_size=fetch_size).batches(file_list_table)
+    next(table_source)
+
+    return table_source
+
+def copy_seconds(batches) -> float:
+    """ Returns the seconds to read & encode every batch as copy text """
+
+    copy_encoder = CopyTextEncoder()
+    start_time = time.perf_counter()
+
+    for row_batch in batches:
+        copy_encoder.encode_rows(row_batch)
+
+    return time.perf_counter() - start_time
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as bench_directory:
+        build_dbf(os.path.join(bench_directory, 'customer.dbf'))
+
+        # same copy text before running timings
+        copy_encoder = CopyTextEncoder()
+        for before_batch, after_batch in zip(
+            row_transform(bench_directory, 'customer.dbf', 1000), column_batches(bench_directory, 'customer.dbf', 1000)
+        ):
+            assert copy_encoder.encode_rows(before_batch) == copy_encoder.encode_rows(after_batch)
+
+        before_seconds = copy_seconds(row_transform(bench_directory, 'customer.dbf', 1000))
+        print(f'row at a time (before):     {ROW_COUNT / before_seconds:>12,.0f} rows/sec')
+
+        after_seconds = copy_seconds(column_batches(bench_directory, 'customer.dbf', 1000))
+        print(
+            f'column batches (after):     {ROW_COUNT / after_seconds:>12,.0f} rows/sec  '
+            f'{before_seconds / after_seconds:.1f}x'
+        )
+
+        # batch memory - rows of python objects vs the column buffers, strings, decimals & dates counted in both
+        before_batch = next(row_transform(bench_directory, 'customer.dbf', 1000))
+        after_batch = next(column_batches(bench_directory, 'customer.dbf', 1000))
+        row_bytes = sys.getsizeof(before_batch) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in before_batch
+        )
+        column_bytes = after_batch.get_byte_size() + sum(
+            sys.getsizeof(value)
+            for column_index, column_kind in enumerate(after_batch.get_column_kinds())
+            if column_kind == 'object'
+            for value in after_batch.get_column(column_index)
+        )
+        print(f'1,000 row batch: {row_bytes:,} bytes as rows, {column_bytes:,} bytes as column batch')
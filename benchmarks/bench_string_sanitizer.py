@@ -0,0 +1,73 @@
+""" Benchmark - string sanitizer vs the regex passes it replaced """
+
+# standard library imports
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# local library imports
+from utilities import StringSanitizer
+
+# constants
+CELL_COUNT = 200000
+WORDS = ['SMITH', "O'BRIEN", 'ACME SUPPLY CO', 'C:\\DATA\\VFP', '123 MAIN ST', 'CAFÉ', 'NOTES\r\nLINE 2', 'TAB\tSEP']
+
+def regex_transform_string_data(str_data: str) -> str:
+    """ The previous DataPipeline.__transform_string_data """
+
+    str_data = str_data.rstrip()
+    str_data = re.sub(r'\x00|\x01|\x02|\x03|\x04|\x05|\x06|\x07|\x08|\x0B|\x0C|\x0E|\x0F', '', str_data, flags=re.IGNORECASE)
+    str_data = re.sub(
+        r'\x10|\x11|\x12|\x13|\x14|\x15|\x16|\x17|\x18|\x19|\x1A|\x1B|\x1C|\x1D|\x1E|\x1F', '', str_data, flags=re.IGNORECASE
+    )
+    str_data = re.sub(r'\x5C', '\\\\\\\\', str_data, flags=re.IGNORECASE)
+    str_data = re.sub(r'\x7F', '', str_data, flags=re.IGNORECASE)
+    for high_byte in range(0x80, 0x100, 0x10):
+        pattern = '|'.join(f'\\x{character:02X}' for character in range(high_byte, high_byte + 0x10))
+        str_data = re.sub(pattern, '', str_data, flags=re.IGNORECASE)
+    str_data = str_data.replace("'", "''")
+
+    return str_data
+
+def build_cells(seed: int = 1) -> list:
+    """ Fox pro style cells - padded to field width with the odd control & high byte character """
+
+    random.seed(seed)
+
+    cells = []
+    for _ in range(CELL_COUNT):
+        cell = ' '.join(random.choice(WORDS) for _ in range(random.randint(1, 4)))
+        if random.random() < 0.05:
+            cell += random.choice(['\x00', '\x1a', '\x7f', '\xa0', '\xff'])
+        cells.append(cell.ljust(random.choice([10, 40, 80])))
+
+    return cells
+
+def cells_per_second(transform: callable, cells: list) -> int:
+    """ Returns cells per second for the transform """
+
+    start_time = time.perf_counter()
+    for cell in cells:
+        transform(cell)
+
+    return int(len(cells) / (time.perf_counter() - start_time))
+
+if __name__ == '__main__':
+    bench_cells = build_cells()
+    insert_sanitizer = StringSanitizer('insert')
+
+    # same output before running timings
+    for bench_cell in bench_cells:
+        assert regex_transform_string_data(bench_cell) == insert_sanitizer.sanitize(bench_cell), repr(bench_cell)
+
+    before = cells_per_second(regex_transform_string_data, bench_cells)
+    after = cells_per_second(insert_sanitizer.sanitize, bench_cells)
+    copy_after = cells_per_second(StringSanitizer('copy').sanitize, bench_cells)
+
+    print(f'regex passes (before):    {before:>12,} cells/sec')
+    print(f'sanitizer insert (after): {after:>12,} cells/sec  {after / before:.1f}x')
+    print(f'sanitizer copy (after):   {copy_after:>12,} cells/sec  {copy_after / before:.1f}x')
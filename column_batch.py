@@ -0,0 +1,182 @@
+""" Column Batch """
+
+# standard library imports
+import sys
+from array import array
+
+# constants
+# array typecodes of the fixed width column kinds, object columns (strings, decimals, dates & bytes) are lists
+ARRAY_TYPECODES = {'boolean': 'b', 'integer': 'q', 'float': 'd'}
+COLUMN_KINDS = ('boolean', 'integer', 'float', 'object')
+
+class ColumnBatch:
+    """ A batch of rows stored by column - an array buffer & null bitmap per column, python objects only for the
+        object columns
+    """
+
+    def __init__(self, column_kinds: list):
+        # column_kinds - per column: boolean, integer, float or object
+
+        for column_kind in column_kinds:
+            if column_kind not in COLUMN_KINDS:
+                raise ValueError(f'column batch does not support the column kind: {column_kind}')
+
+        # constants - private
+        self.__column_kinds = list(column_kinds)
+
+        # variables - private
+        self.__row_count = 0
+        self.__buffers = [self.__new_buffer(column_kind) for column_kind in self.__column_kinds]
+        # a bit per row, set for nulls (stored as 0 in the array buffers & None in the object columns)
+        self.__null_bitmaps = [bytearray() for _ in self.__column_kinds]
+
+    def __iter__(self):
+        """ Yields the rows as tuples, nulls as None """
+
+        return zip(*[self.get_column_values(column_index) for column_index in range(len(self.__column_kinds))])
+
+    def __len__(self) -> int:
+        """ Returns the row count """
+
+        return self.__row_count
+
+    # Public
+    @classmethod
+    def from_columns(cls, column_kinds: list, columns: list) -> 'ColumnBatch':
+        """ Returns a batch of the column value lists (all the same length), None values are nulls """
+
+        column_batch = cls(column_kinds)
+        column_batch.__row_count = len(columns[0]) if columns else 0
+
+        for column_index, column in enumerate(columns):
+            null_rows = [row_index for row_index, value in enumerate(column) if value is None] if None in column else []
+            column_batch.__null_bitmaps[column_index] = column_batch.__bitmap(null_rows, column_batch.__row_count)
+
+            # array buffers hold a 0 in place of a null
+            if column_kinds[column_index] in ARRAY_TYPECODES:
+                typecode = ARRAY_TYPECODES[column_kinds[column_index]]
+                column = column if not null_rows else [0 if value is None else value for value in column]
+                column_batch.__buffers[column_index] = array(typecode, column)
+            else:
+                column_batch.__buffers[column_index] = list(column)
+
+        return column_batch
+
+    def clear(self):
+        """ Removes every row, keeping the column kinds """
+
+        self.__row_count = 0
+        self.__buffers = [self.__new_buffer(column_kind) for column_kind in self.__column_kinds]
+        self.__null_bitmaps = [bytearray() for _ in self.__column_kinds]
+
+    def extend(self, column_batch: 'ColumnBatch', start: int = 0, end: int = None):
+        """ Appends the rows start to end of a batch with the same column kinds """
+
+        if column_batch.__column_kinds != self.__column_kinds:
+            raise ValueError(f'column batch kinds differ: {column_batch.__column_kinds} & {self.__column_kinds}')
+
+        end = len(column_batch) if end is None else min(end, len(column_batch))
+        if end <= start:
+            return
+
+        for column_index, buffer in enumerate(column_batch.__buffers):
+            self.__buffers[column_index].extend(buffer[start:end])
+            source_bitmap = column_batch.__null_bitmaps[column_index]
+            self.__null_bitmaps[column_index] = self.__bitmap_extend(
+                self.__null_bitmaps[column_index], self.__row_count, source_bitmap, start, end
+            )
+
+        self.__row_count += end - start
+
+    def get_byte_size(self) -> int:
+        """ Returns the bytes held by the column buffers & null bitmaps, object columns by their references """
+
+        byte_size = 0
+        for buffer, null_bitmap in zip(self.__buffers, self.__null_bitmaps):
+            if isinstance(buffer, array):
+                byte_size += buffer.buffer_info()[1] * buffer.itemsize
+            else:
+                byte_size += sys.getsizeof(buffer)
+            byte_size += len(null_bitmap)
+
+        return byte_size
+
+    def get_column(self, column_index: int):
+        """ Returns a column's buffer - an array for the fixed width kinds, a list for object columns """
+
+        return self.__buffers[column_index]
+
+    def get_column_kinds(self) -> list:
+        """ Returns the kind of every column """
+
+        return list(self.__column_kinds)
+
+    def get_column_values(self, column_index: int) -> list:
+        """ Returns a column's values as python objects, nulls as None """
+
+        buffer = self.__buffers[column_index]
+
+        # object columns already hold None for the nulls
+        if not isinstance(buffer, array):
+            return buffer
+
+        if self.__column_kinds[column_index] == 'boolean':
+            column_values = [value != 0 for value in buffer]
+        else:
+            column_values = buffer.tolist()
+
+        for row_index in self.get_null_rows(column_index):
+            column_values[row_index] = None
+
+        return column_values
+
+    def get_null_rows(self, column_index: int) -> list:
+        """ Returns the row indexes of a column's nulls """
+
+        null_rows = []
+        for byte_index, bits in enumerate(self.__null_bitmaps[column_index]):
+            # skips the bytes without a null
+            if bits:
+                null_rows.extend(byte_index * 8 + bit for bit in range(8) if bits >> bit & 1)
+
+        return null_rows
+
+    # Private
+    @staticmethod
+    def __bitmap(null_rows: list, row_count: int) -> bytearray:
+        """ Returns the null bitmap of a column from its null row indexes """
+
+        null_bitmap = bytearray((row_count + 7) // 8)
+        for row_index in null_rows:
+            null_bitmap[row_index // 8] |= 1 << (row_index % 8)
+
+        return null_bitmap
+
+    @staticmethod
+    def __bitmap_extend(null_bitmap: bytearray, row_count: int, source_bitmap: bytearray, start: int, end: int):
+        """ Returns the null bitmap of row_count rows with the bits start to end of another bitmap appended """
+
+        # byte aligned - the bytes are copied, with the bits past end cleared
+        if row_count % 8 == 0 and start % 8 == 0:
+            null_bitmap = null_bitmap + source_bitmap[start // 8 : (end + 7) // 8]
+            if end % 8 != 0:
+                null_bitmap[-1] &= (1 << (end % 8)) - 1
+
+            return null_bitmap
+
+        null_bitmap.extend(bytes((row_count + end - start + 7) // 8 - len(null_bitmap)))
+        for byte_index in range(start // 8, (end + 7) // 8):
+            # skips the bytes without a null
+            if source_bitmap[byte_index]:
+                for row_index in range(max(start, byte_index * 8), min(end, byte_index * 8 + 8)):
+                    if source_bitmap[byte_index] >> (row_index % 8) & 1:
+                        target_index = row_count + row_index - start
+                        null_bitmap[target_index // 8] |= 1 << (target_index % 8)
+
+        return null_bitmap
+
+    @staticmethod
+    def __new_buffer(column_kind: str):
+        """ Returns an empty buffer for a column kind """
+
+        return array(ARRAY_TYPECODES[column_kind]) if column_kind in ARRAY_TYPECODES else []
@@ -0,0 +1,320 @@
+""" PG Copy Format """
+
+# standard library imports
+import decimal
+import struct
+import uuid
+from datetime import date, datetime, time, timedelta
+
+# local library imports
+from column_batch import ColumnBatch
+
+# constants
+BINARY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+PG_EPOCH_DATE = date(2000, 1, 1)
+PG_EPOCH_DATETIME = datetime(2000, 1, 1)
+
+class CopyTextEncoder:
+    """ Encodes rows into the postgresql copy text format """
+
+    def __init__(self, encoding: str = 'utf-8', string_sanitizer=None):
+        # string_sanitizer - object with sanitize(str) that cleans & escapes strings for copy text in one pass
+
+        # constants - private
+        self.__encoding = encoding
+        self.__string_sanitizer = string_sanitizer
+        # backslash, tab, newline & carriage return are the only characters copy text needs escaped
+        self.__escape_table = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+    # Public
+    def encode_rows(self, rows: list) -> bytes:
+        """ Returns the copy text payload for a batch of rows, a ColumnBatch is encoded a column at a time """
+
+        if isinstance(rows, ColumnBatch):
+            columns = [self.__encode_column(rows, column_index) for column_index in range(len(rows.get_column_kinds()))]
+            lines = ['\t'.join(row) for row in zip(*columns)]
+        else:
+            lines = ['\t'.join([self.encode_value(column) for column in row]) for row in rows]
+
+        # copy text needs every line ended with a newline
+        return ('\n'.join(lines) + '\n').encode(self.__encoding) if lines else b''
+
+    def encode_value(self, value) -> str:
+        """ Returns a single column value in copy text format """
+
+        # nulls
+        if value is None:
+            return '\\N'
+        # boolean
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        # numbers
+        if isinstance(value, (int, float, decimal.Decimal)):
+            return str(value)
+        # bytes - bytea hex format with the backslash escaped for copy
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return '\\\\x' + bytes(value).hex()
+        # strings
+        if isinstance(value, str) and self.__string_sanitizer is not None:
+            return self.__string_sanitizer.sanitize(value)
+        # dates & everything else
+        return str(value).translate(self.__escape_table)
+
+    # Private
+    def __encode_column(self, column_batch: ColumnBatch, column_index: int) -> list:
+        """ Returns a batch column's values in copy text format """
+
+        column_kind = column_batch.get_column_kinds()[column_index]
+        buffer = column_batch.get_column(column_index)
+
+        # object columns hold None for their nulls
+        if column_kind == 'object':
+            return [self.encode_value(value) for value in buffer]
+
+        if column_kind == 'boolean':
+            column_values = ['t' if value else 'f' for value in buffer]
+        # integer & float
+        else:
+            column_values = list(map(str, buffer))
+
+        for row_index in column_batch.get_null_rows(column_index):
+            column_values[row_index] = '\\N'
+
+        return column_values
+
+
+class CopyBinaryEncoder:
+    """ Encodes rows into the postgresql copy binary format """
+
+    def __init__(self, column_types: list, encoding: str = 'utf-8', string_sanitizer=None):
+        # string_sanitizer - object with sanitize(str) used to clean strings, binary needs no escaping
+
+        # constants - private
+        self.__encoding = encoding
+        self.__string_sanitizer = string_sanitizer
+
+        # one encoder function per column, from the pg format_type() names
+        self.__column_encoders = [self.__type_encoder(column_type) for column_type in column_types]
+
+        if None in self.__column_encoders:
+            raise ValueError(f'copy binary format does not support: {column_types}')
+
+    # Public
+    @staticmethod
+    def supports(column_types: list) -> bool:
+        """ Returns True if every column type can be written in binary format """
+
+        for column_type in column_types:
+            if CopyBinaryEncoder.__type_encoder(column_type) is None:
+                return False
+
+        return True
+
+    def encode_rows(self, rows: list) -> bytes:
+        """ Returns the copy binary payload (header, tuples & trailer) for a batch of rows """
+
+        # header - signature, flags & header extension length
+        payload = [BINARY_SIGNATURE, struct.pack('!ii', 0, 0)]
+        field_count = struct.pack('!h', len(self.__column_encoders))
+
+        for row in rows:
+            payload.append(field_count)
+
+            for column_encoder, column in zip(self.__column_encoders, row):
+                # nulls have a -1 length and no data
+                if column is None:
+                    payload.append(b'\xff\xff\xff\xff')
+                else:
+                    data = column_encoder(self, column)
+                    payload.append(struct.pack('!i', len(data)))
+                    payload.append(data)
+
+        # trailer
+        payload.append(b'\xff\xff')
+
+        return b''.join(payload)
+
+    # Private
+    @staticmethod
+    def __type_encoder(column_type: str):
+        """ Returns the encoder function for a pg type name or None when not supported """
+
+        column_type = column_type.lower()
+
+        if column_type == 'boolean':
+            return CopyBinaryEncoder.__encode_boolean
+        elif column_type == 'smallint':
+            return CopyBinaryEncoder.__encode_smallint
+        elif column_type == 'integer':
+            return CopyBinaryEncoder.__encode_integer
+        elif column_type == 'bigint':
+            return CopyBinaryEncoder.__encode_bigint
+        elif column_type == 'real':
+            return CopyBinaryEncoder.__encode_real
+        elif column_type == 'double precision':
+            return CopyBinaryEncoder.__encode_double
+        elif column_type.startswith('numeric'):
+            return CopyBinaryEncoder.__encode_numeric
+        elif column_type.startswith(('character', 'text')):
+            return CopyBinaryEncoder.__encode_text
+        elif column_type == 'date':
+            return CopyBinaryEncoder.__encode_date
+        # timestamp with time zone is left to the text format
+        elif column_type.startswith('timestamp') and column_type.endswith('without time zone'):
+            return CopyBinaryEncoder.__encode_timestamp
+        elif column_type.startswith('time') and column_type.endswith('without time zone'):
+            return CopyBinaryEncoder.__encode_time
+        elif column_type.startswith('interval'):
+            return CopyBinaryEncoder.__encode_interval
+        elif column_type == 'bytea':
+            return CopyBinaryEncoder.__encode_bytea
+        elif column_type == 'uuid':
+            return CopyBinaryEncoder.__encode_uuid
+
+        return None
+
+    def __encode_boolean(self, value) -> bytes:
+        """ Binary boolean """
+
+        if isinstance(value, str):
+            value = value.strip().lower() in ('t', 'true', 'y', 'yes', '1')
+
+        return b'\x01' if value else b'\x00'
+
+    def __encode_smallint(self, value) -> bytes:
+        """ Binary int2 """
+
+        return struct.pack('!h', int(value))
+
+    def __encode_integer(self, value) -> bytes:
+        """ Binary int4 """
+
+        return struct.pack('!i', int(value))
+
+    def __encode_bigint(self, value) -> bytes:
+        """ Binary int8 """
+
+        return struct.pack('!q', int(value))
+
+    def __encode_real(self, value) -> bytes:
+        """ Binary float4 """
+
+        return struct.pack('!f', float(value))
+
+    def __encode_double(self, value) -> bytes:
+        """ Binary float8 """
+
+        return struct.pack('!d', float(value))
+
+    def __encode_numeric(self, value) -> bytes:
+        """ Binary numeric - base 10000 digits with weight, sign & display scale """
+
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+
+        # NaN
+        if value.is_nan():
+            return struct.pack('!hhHH', 0, 0, 0xC000, 0)
+
+        sign, digits, exponent = value.as_tuple()
+        digit_string = ''.join(str(digit) for digit in digits)
+        display_scale = max(0, -exponent)
+
+        # split digits at the decimal point
+        if exponent >= 0:
+            integer_part = digit_string + '0' * exponent
+            fraction_part = ''
+        else:
+            digit_string = digit_string.rjust(display_scale, '0')
+            integer_part = digit_string[: len(digit_string) - display_scale]
+            fraction_part = digit_string[len(digit_string) - display_scale :]
+
+        # pad both sides to groups of 4 decimal digits
+        integer_part = integer_part.rjust((len(integer_part) + 3) // 4 * 4, '0')
+        fraction_part = fraction_part.ljust((len(fraction_part) + 3) // 4 * 4, '0')
+
+        groups = [int(integer_part[index : index + 4]) for index in range(0, len(integer_part), 4)]
+        weight = len(groups) - 1
+        groups += [int(fraction_part[index : index + 4]) for index in range(0, len(fraction_part), 4)]
+
+        # remove leading & trailing zero groups
+        while groups and groups[0] == 0:
+            groups.pop(0)
+            weight -= 1
+        while groups and groups[-1] == 0:
+            groups.pop()
+        if not groups:
+            weight = 0
+
+        return struct.pack(
+            f'!hhHH{len(groups)}H', len(groups), weight, 0x4000 if sign and groups else 0x0000, display_scale, *groups
+        )
+
+    def __encode_text(self, value) -> bytes:
+        """ Binary text, varchar & char """
+
+        if isinstance(value, str) and self.__string_sanitizer is not None:
+            value = self.__string_sanitizer.sanitize(value)
+
+        return str(value).encode(self.__encoding)
+
+    def __encode_date(self, value) -> bytes:
+        """ Binary date - days since 2000-01-01 """
+
+        if isinstance(value, datetime):
+            value = value.date()
+        elif not isinstance(value, date):
+            value = date.fromisoformat(str(value).strip()[0:10])
+
+        return struct.pack('!i', (value - PG_EPOCH_DATE).days)
+
+    def __encode_timestamp(self, value) -> bytes:
+        """ Binary timestamp - microseconds since 2000-01-01 """
+
+        if isinstance(value, datetime):
+            value = value.replace(tzinfo=None)
+        elif isinstance(value, date):
+            value = datetime(value.year, value.month, value.day)
+        else:
+            value = datetime.fromisoformat(str(value).strip())
+
+        delta = value - PG_EPOCH_DATETIME
+
+        return struct.pack('!q', (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+    def __encode_time(self, value) -> bytes:
+        """ Binary time - microseconds since midnight """
+
+        if isinstance(value, timedelta):
+            return struct.pack('!q', value // timedelta(microseconds=1))
+
+        if not isinstance(value, time):
+            value = time.fromisoformat(str(value).strip())
+
+        return struct.pack(
+            '!q', ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+        )
+
+    def __encode_interval(self, value) -> bytes:
+        """ Binary interval - microseconds, days & months """
+
+        if not isinstance(value, timedelta):
+            raise ValueError(f'copy binary interval needs a timedelta: {value!r}')
+
+        return struct.pack('!qii', (value.seconds * 1000000) + value.microseconds, value.days, 0)
+
+    def __encode_bytea(self, value) -> bytes:
+        """ Binary bytea """
+
+        if isinstance(value, str):
+            return value.encode(self.__encoding)
+
+        return bytes(value)
+
+    def __encode_uuid(self, value) -> bytes:
+        """ Binary uuid """
+
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+
+        return value.bytes
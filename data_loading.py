@@ -3,37 +3,114 @@
 # standard library imports
 import os
 import re
+import csv
+import queue
+import json
 import decimal
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
 from binascii import hexlify
 from datetime import date
-
-# third party library imports
-import dbfread
-import pyexcel
-import pyodbc
-import pymssql
-import pymysql
+from datetime import datetime
 
 # local library imports
+from column_batch import ColumnBatch
+from copy_format import CopyBinaryEncoder
+from copy_format import CopyTextEncoder
+from databases import PG_CONNECTION_POOL
 from databases import PgSql
+from source_readers import ColumnChanges
+from source_readers import CsvReader
+from source_readers import DataFlexReader
+from source_readers import FoxProReader
+from source_readers import MySqlReader
+from source_readers import OverflowRows
+from source_readers import SpreadsheetReader
+from source_readers import SqlServerReader
+from type_inference import TypeInference
 from utilities import ArrayList
 from utilities import DataLocation
+from utilities import FileSignature
 from utilities import Logger
+from utilities import MemoryUsage
+from utilities import PrefetchQueue
+from utilities import StringSanitizer
 from utilities import Timer
 
 class DataPipeline(PgSql):
     """ Extends PostgreSQL database for ETL Data """
 
-    def __init__( self, database: str, connection: str, sql_queue_count: int = 500):
+    def __init__(
+        self,
+        database: str,
+        connection: str,
+        sql_queue_count: int = 500,
+        copy_batch_size: int = 10000,
+        adaptive_queue: bool = True,
+        bulk_load: bool = False,
+        vacuum_workers: int = 1,
+    ):
         # sql_queue_count to small ~< 100 and to big ~> 800 it becomes slower
+        # copy_batch_size is the number of rows sent in each copy from stdin
+        # adaptive_queue tunes sql_queue_count at runtime from each batch's round trip time & throughput
+        # bulk_load creates unlogged tables, adds primary keys & sets them logged once each table is loaded
+        # vacuum_workers is the number of connections the loaded tables are vacuumed & analyzed across
 
-        super().__init__(database, connection, sql_queue_count)
+        super().__init__(database, connection, sql_queue_count, adaptive_queue)
 
         # constants - private
         self.__encoding = 'utf-8'
         self.__error_log = Logger(os.path.join(os.path.dirname(__file__), 'info', 'error.log'))
+        self.__copy_batch_size = copy_batch_size
+        self.__load_modes = ('insert', 'copy', 'copy_binary')
+        self.__journal_modes = ('sql', 'compressed', 'none')
+        self.__insert_sanitizer = StringSanitizer('insert')
+        self.__copy_sanitizer = StringSanitizer('copy')
+        self.__clean_sanitizer = StringSanitizer('clean')
+        # pipelined loads - rows per file source batch & batches the producer may read ahead of the loader
+        self.__source_batch_size = 1000
+        self.__prefetch_batches = 4
+        # csv fast path - bytes per record aligned chunk a worker validates & loads
+        self.__csv_chunk_size = 64 * 1048576
+        # bulk load - session settings while a table loads, reset once it is set logged
+        self.__bulk_load = bulk_load
+        self.__bulk_settings = {'synchronous_commit': 'off', 'maintenance_work_mem': "'1GB'"}
+        self.__vacuum_workers = vacuum_workers
+
+        # process pool workers create their own DataPipeline from these
+        self.__init_arguments = (database, connection, sql_queue_count, copy_batch_size, adaptive_queue, bulk_load)
+
+        # variables - private
+        self.__load_mode = 'insert'
+        self.__journal_mode = 'sql'
+        self.__journal_rows = ArrayList()
+        self.__journal_sequence = 0
+        self.__source_signatures = {}
+        self.__row_count = 0
+        self.__copy_rows = ArrayList()
+        self.__copy_encoder = None
+        self.__bulk_timer = None
+        self.__deferred_statements = ArrayList()
+        self.__bulk_stats = {'tables': 0, 'unlogged_seconds': 0.0, 'logged_seconds': 0.0}
+        self.__loaded_tables = ArrayList()
+        self.__lazy_create = False
+        self.__pending_table = None
+        self.__empty_tables = ArrayList()
+        self.__staging = False
+        self.__dataflex_readers = {}
 
     # Public
+    def close(self):
+        """ Closes the dataflex readers & returns the database connections to the connection pool, closing again does
+            nothing
+        """
+
+        self.__dataflex_readers_close()
+        super().close()
+
     def etl_dataflex_data(
         self,
         path: str,
@@ -41,16 +118,32 @@ class DataPipeline(PgSql):
         data_schema: str = 'dflex',
         remove_empty_tables: bool = True,
         exclude_tables: ArrayList = ArrayList(),
+        load_mode: str = 'insert',
+        journal_mode: str = 'sql',
+        workers: int = 1,
+        incremental: bool = False,
+        pipelined: bool = False,
+        staging: bool = False,
+        keep_previous: bool = True,
+        fetch_size: int = 10000,
     ):
         """ Processing dataflex data """
 
+        # load mode (insert, copy or copy_binary) & journal mode (sql, compressed or none)
+        self.__set_load_options(load_mode, journal_mode)
+
+        # staging - loads into stage_[data_schema], swapped in for data_schema once every table is loaded
+        live_schema = data_schema
+        data_schema = self.__staging_schema(data_schema, staging, incremental or file_name != '')
+
         # total timing
         total_timer = Timer()
 
         print('Extracting, transforming & loading dataflex data...')
 
         # sql_[data_type] schema
-        self.create_schema(self._sql_schema + data_schema)
+        if journal_mode == 'sql':
+            self.create_schema(self._sql_schema + data_schema)
         # dataflex schema
         self.create_schema(data_schema)
 
@@ -61,88 +154,79 @@ class DataPipeline(PgSql):
         for table_name in exclude_tables:
             location.get_file_list().remove(table_name.lower())
 
-        # loop thru file list
-        for file_list_table in location.get_file_list():
-            # table timing
-            table_timer = Timer()
+        # incremental - removes files unchanged since their last load
+        if incremental:
+            self.__incremental_file_list(path, location.get_file_list(), data_schema)
 
-            table_name = file_list_table.split('.')[0]
-            print(f'  {table_name} completed in: ', end='', flush=True)
-
-            # queue drop table statements
-            sql_drop = self.__drop_table_statements(data_schema, table_name)
-
-            # open table
-            odbc_connection = pyodbc.connect(f'DRIVER={0};DBQ={path}'.format("{DataFlex Driver}"))
-            odbc_cursor = odbc_connection.cursor()
-            odbc_cursor.execute(f'select * from {table_name}')
-
-            # create table string - data schema
-            sql_create = f'create table if not exists {data_schema}.{table_name}('
-            # columns in description
-            #   (name, type_code, display_size, internal_size, precision, scale, null_ok)
-            for column in odbc_cursor.description:
-                # creates column name
-                sql_create += f'"{self.__modify_column_name(column[0].lower())}" '
-
-                # creates data type & size
-                if str(column[1]) == "<class 'str'>":
-                    sql_create += f'varchar({column[3]}), '
-                elif str(column[1]) == "<class 'int'>":
-                    sql_create += 'integer, '
-                elif str(column[1]) == "<class 'decimal.Decimal'>":
-                    sql_create += f'numeric({column[4]},{column[5]}), '
-                elif str(column[1]) == "<class 'datetime.date'>":
-                    sql_create += 'date NULL, '
-            # remove last comma and space and replace with );
-            sql_create = sql_create.rstrip(', ') + ');'
-            # queue create table statements
-            self.__create_table_statements(data_schema, table_name, sql_create)
-
-            # write drop & create statments after sql_[data_type].table is setup
-            self.__sql_table_setup(data_schema, table_name, sql_drop, sql_create)
+        # only when multiple files - tables are created with their first row, 0 record tables never are
+        self.__lazy_create = remove_empty_tables and len(location.get_file_list()) > 1
 
-            # rows from odbc connection
-            for row in odbc_cursor:
-                sql_row = ''
-                # columns from each row
-                for column in row:
-                    # nulls
-                    if column is None:
-                        sql_row += 'null, '
-                    # numbers & boolean
-                    elif isinstance(column, (bool, int, float, decimal.Decimal)):  #
-                        sql_row += f'{column}, '
-                    # bytes
-                    elif isinstance(column, bytes):
-                        sql_row += f'{self.__transform_byte_data(column)}, '
-                    # strings & dates
-                    else:
-                        sql_row += f"E'{self.__transform_string_data(str(column))}', "
-                # remove last comma and space
-                sql_row = sql_row.rstrip(', ')
-                # queue insert into statements
-                self.__insert_into_statements(data_schema, table_name, sql_row)
+        # process pool - each worker process has its own pg connection & sql queue
+        if workers > 1 and len(location.get_file_list()) > 1:
+            results = self.__etl_table_pool(
+                'dataflex',
+                [(path, file_list_table, data_schema, fetch_size) for file_list_table in location.get_file_list()],
+                workers,
+            )
 
-            # execute anything left in the queue
-            self.sql_queue_exec(execute=True)
+            if incremental:
+                for result in results:
+                    self.__source_loaded(path, result['file'], data_schema)
+        else:
+            # pipelined - a producer thread reads the files in order, ahead of the pg load
+            prefetch = None
+            if pipelined:
+                prefetch = PrefetchQueue(
+                    [
+                        (
+                            file_list_table,
+                            lambda file_list_table=file_list_table: self.__dataflex_reader(path, fetch_size).batches(
+                                file_list_table
+                            ),
+                        )
+                        for file_list_table in location.get_file_list()
+                    ],
+                    self.__prefetch_batches,
+                )
 
-            # close table
-            odbc_cursor.close()
+            try:
+                # loop thru file list
+                for file_list_table in location.get_file_list():
+                    # table timing
+                    table_timer = Timer()
 
-            # print table timer
-            table_timer.print_time()
+                    print(f"  {file_list_table.split('.')[0]} completed in: ", end='', flush=True)
 
-        # vacuums
-        self.sql_vacuum()
-        # only run when multiple files
-        if len(location.get_file_list()) > 1:
-            # removes 0 record tables
-            self.sql_remove_empty_tables(data_schema, remove_empty_tables)
+                    self.__etl_dataflex_table(
+                        path,
+                        file_list_table,
+                        data_schema,
+                        fetch_size,
+                        prefetch.batches(file_list_table) if prefetch is not None else None,
+                    )
+
+                    if incremental:
+                        self.__source_loaded(path, file_list_table, data_schema)
+
+                    # print table timer
+                    table_timer.print_time()
+            finally:
+                if prefetch is not None:
+                    prefetch.close()
+
+                # the directory's odbc connection, once the producer is done with it
+                self.__dataflex_readers_close()
+
+        # vacuums - only the loaded tables
+        self.__vacuum_loaded_tables()
+        self.print_queue_stats()
+        self.__print_bulk_stats()
+        # 0 record tables were never created
+        self.__print_empty_tables()
 
-        # close connection
-        if len(location.get_file_list()) > 0:
-            odbc_connection.close()
+        # staging - every table is loaded, swaps the schema in
+        if staging:
+            self.swap_schema(data_schema, live_schema, keep_previous)
 
         if len(location.get_file_list()) > 1:
             # print total timer
@@ -155,13 +239,21 @@ class DataPipeline(PgSql):
         data_schema: str = 'vfp',
         remove_empty_tables: bool = True,
         exclude_tables: ArrayList = ArrayList(),
+        load_mode: str = 'insert',
+        journal_mode: str = 'sql',
+        workers: int = 1,
+        streaming: bool = False,
+        incremental: bool = False,
+        pipelined: bool = False,
+        staging: bool = False,
+        keep_previous: bool = True,
     ):
         """ Processing fox pro data """
 
-        try:
-            # constants
-            default_encoding = 'cp1252'
+        # load mode (insert, copy or copy_binary) & journal mode (sql, compressed or none)
+        self.__set_load_options(load_mode, journal_mode)
 
+        try:
             # total timing
             total_timer = Timer()
 
@@ -169,11 +261,17 @@ class DataPipeline(PgSql):
                 re.search('v\\d[_]\\d[_]\\d{4}', data_schema) is None and data_schema != self._sys_schema
             )
 
+            # staging - loads into stage_[data_schema], swapped in for data_schema once every table is loaded,
+            #   wt schemas are always loaded in place
+            staging = staging and normal_fox_pro_operation
+            live_schema = data_schema
+            data_schema = self.__staging_schema(data_schema, staging, incremental or file_name != '')
+
             if normal_fox_pro_operation:
                 print('Extracting, transforming & loading fox pro data...')
 
             # sql_[data_type] schema
-            if normal_fox_pro_operation:
+            if normal_fox_pro_operation and journal_mode == 'sql':
                 self.create_schema(self._sql_schema + data_schema)
             # fox pro schema
             self.create_schema(data_schema)
@@ -185,163 +283,93 @@ class DataPipeline(PgSql):
             for table_name in exclude_tables:
                 location.get_file_list().remove(table_name.lower())
 
-            # loop thru file list
-            for file_list_table in location.get_file_list():
-                # table timing
-                table_timer = Timer()
-
-                table_name = file_list_table.split('.')[0]
-                if normal_fox_pro_operation:
-                    print(f'  {table_name} completed in: ', end='', flush=True)
+            # incremental - removes files unchanged since their last load
+            if incremental:
+                self.__incremental_file_list(path, location.get_file_list(), data_schema)
 
-                # queue drop table statements
-                sql_drop = self.__drop_table_statements(data_schema, table_name, normal_fox_pro_operation)
+            # only when multiple files and not a wt_schema - tables are created with their first row,
+            #   0 record tables never are
+            self.__lazy_create = (
+                remove_empty_tables and normal_fox_pro_operation and len(location.get_file_list()) > 1
+            )
 
-                # open table
-                dbf_cursor = dbfread.DBF(
-                    filename=os.path.join(path, file_list_table),
-                    encoding=default_encoding,
-                    lowernames=True,
-                    load=True,
+            # process pool - each worker process has its own pg connection & sql queue
+            if workers > 1 and len(location.get_file_list()) > 1:
+                results = self.__etl_table_pool(
+                    'fox_pro',
+                    [
+                        (path, file_list_table, data_schema, normal_fox_pro_operation, streaming)
+                        for file_list_table in location.get_file_list()
+                    ],
+                    workers,
+                    normal_fox_pro_operation,
                 )
 
-                # create table string - data schema
-                sql_create = f'create table if not exists {data_schema}.{table_name}('
-
-                table_fields = ArrayList()
-
-                # get field definitions
-                for field in dbf_cursor.fields:
-                    if field.type in ('C', 'V'):
-                        sql_create += f'"{self.__modify_column_name(field.name)}" '
-                        sql_create += f'varchar({field.length})' + " not NULL default '', "
-                        table_fields.append('string')
-                    elif field.type == 'L':
-                        sql_create += f'"{self.__modify_column_name(field.name)}" boolean not NULL default false, '
-                        table_fields.append('boolean')
-                    elif field.type == 'D':
-                        sql_create += f'"{self.__modify_column_name(field.name)}" date NULL, '
-                        table_fields.append('date')
-                    elif field.type in ('T', '@'):
-                        sql_create += f'"{self.__modify_column_name(field.name)}" timestamp NULL, '
-                        table_fields.append('date')
-                    elif field.type in ('I', '+'):
-                        sql_create += f'"{self.__modify_column_name(field.name)}" integer not NULL default 0, '
-                        table_fields.append('number')
-                    elif field.type == 'N':
-                        sql_create += f'"{self.__modify_column_name(field.name)}" '
-                        sql_create += f'numeric({field.length},{field.decimal_count}) not NULL default 0, '
-                        table_fields.append('decimal')
-                    elif field.type == 'F':
-                        sql_create += f'"{self.__modify_column_name(field.name)}" float4 not NULL default 0, '
-                        table_fields.append('number')
-                    elif field.type == 'B':
-                        sql_create += f'"{self.__modify_column_name(field.name)}" float8 not NULL default 0, '
-                        table_fields.append('number')
-                    elif field.type == 'Y':
-                        sql_create += f'"{self.__modify_column_name(field.name)}" '
-                        sql_create += f'decimal({field.length + field.decimal_count},{field.decimal_count}) '
-                        sql_create += 'not NULL default 0, '
-                        table_fields.append('decimal')
-                    elif field.type == 'M':
-                        sql_create += f'"{self.__modify_column_name(field.name)}" ' + "text not NULL default '', "
-                        table_fields.append('string')
-                    else:
-                        table_fields.append('invalid')
-                # special exception - creating record_number column
-                if file_list_table == 'fields.dbf':
-                    sql_create += '"record_number" bigint);'
-                    table_fields.append('number')
-                else:
-                    # remove last comma and space and replace with );
-                    sql_create = sql_create.rstrip(', ') + ');'
-                # queue create table statements
-                self.__create_table_statements(data_schema, table_name, sql_create, normal_fox_pro_operation)
-
-                # write drop & create statments after sql_[data_type].table is setup
-                if normal_fox_pro_operation:
-                    self.__sql_table_setup(data_schema, table_name, sql_drop, sql_create)
-
-                record_number = 1
-
-                # loop thru data rows
-                for row in dbf_cursor.records:
-                    sql_row = ''
-
-                    column_count = 0
-                    # loop thru each column
-                    for column in ArrayList(row.items()):
-                        if table_fields[column_count] != 'invalid':
-                            # boolean
-                            if table_fields[column_count] == 'boolean':
-                                if str(column[1]) == 'True':
-                                    sql_row += f'{"true"}, '
-                                else:
-                                    sql_row += f'{"false"}, '
-                            # int / float
-                            elif table_fields[column_count] == 'number':
-                                if column[1] is not None:
-                                    sql_row += f'{str(column[1]).strip()}, '
-                                else:
-                                    sql_row += f'{str(0)}, '
-                            # numeric / decimal
-                            elif table_fields[column_count] == 'decimal':
-                                if column[1] is None:
-                                    sql_row += f"{0}, "
-                                # vfp can do 1,000,000.000 is valid in numeric(10, 4)
-                                #   but pgsql can only have 999,999.9999
-                                elif (
-                                    len(str(column[1]).split('.', maxsplit=1)[0])
-                                    > dbf_cursor.fields[column_count].length
-                                    - dbf_cursor.fields[column_count].decimal_count
-                                ):
-                                    sql_row += f"""
-                                            {float('9' * (dbf_cursor.fields[column_count].length
-                                                - dbf_cursor.fields[column_count].decimal_count)
-                                            + '.' + '9' * dbf_cursor.fields[column_count].decimal_count)}, """
-                                else:
-                                    sql_row += f"""
-                                            {str(column[1]).strip()[0 : dbf_cursor.fields[column_count].length]}, """
-                            # string
-                            elif table_fields[column_count] == 'string':
-                                if column[1] is not None:
-                                    sql_row += f"E'{self.__transform_string_data(str(column[1]))}', "
-                                else:
-                                    sql_row += "'', "
-                            # nulls
-                            elif column[1] is None:
-                                sql_row += 'null, '
-                            # date / time
-                            elif table_fields[column_count] == 'date':
-                                sql_row += f"'{column[1]}', "
-                        column_count += 1
-                    # special exception - adding record_number to the end of sql_row
-                    if file_list_table == 'fields.dbf':
-                        sql_row += f'{record_number}'
-                        record_number += 1
-                    else:
-                        # remove last comma and space
-                        sql_row = sql_row.rstrip(', ')
-                    # queue insert into statements
-                    self.__insert_into_statements(data_schema, table_name, sql_row, normal_fox_pro_operation)
-
-                # execute anything left in the queue
-                self.sql_queue_exec(execute=True)
+                if incremental:
+                    for result in results:
+                        self.__source_loaded(path, result['file'], data_schema)
+            else:
+                fox_pro_reader = FoxProReader(path, streaming, self.__source_batch_size)
+
+                # pipelined - a producer thread reads & transforms the files in order, ahead of the pg load
+                prefetch = None
+                if pipelined:
+                    prefetch = PrefetchQueue(
+                        [
+                            (
+                                file_list_table,
+                                lambda file_list_table=file_list_table: fox_pro_reader.batches(file_list_table),
+                            )
+                            for file_list_table in location.get_file_list()
+                        ],
+                        self.__prefetch_batches,
+                    )
+
+                try:
+                    # loop thru file list
+                    for file_list_table in location.get_file_list():
+                        # table timing & peak memory
+                        table_timer = Timer()
+                        memory_usage = MemoryUsage()
+
+                        if normal_fox_pro_operation:
+                            print(f"  {file_list_table.split('.')[0]} completed in: ", end='', flush=True)
+
+                        self.__etl_fox_pro_table(
+                            path,
+                            file_list_table,
+                            data_schema,
+                            normal_fox_pro_operation,
+                            streaming,
+                            prefetch.batches(file_list_table)
+                            if prefetch is not None
+                            else fox_pro_reader.batches(file_list_table),
+                        )
 
-                # close table
-                dbf_cursor = ""
+                        if incremental:
+                            self.__source_loaded(path, file_list_table, data_schema)
 
-                # print table timer
-                if normal_fox_pro_operation:
-                    table_timer.print_time()
+                        # print table timer & peak rss when streaming
+                        if normal_fox_pro_operation and streaming:
+                            print(f"{table_timer.return_time()} ({memory_usage.return_peak('peak rss')})")
+                        elif normal_fox_pro_operation:
+                            table_timer.print_time()
+                finally:
+                    if prefetch is not None:
+                        prefetch.close()
 
-            # vacuums
+            # vacuums - only the loaded tables
             if normal_fox_pro_operation:
-                self.sql_vacuum()
-            # only run when multiple files and not a wt_schema
-            if normal_fox_pro_operation and len(location.get_file_list()) > 1:
-                # removes 0 record tables
-                self.sql_remove_empty_tables(data_schema, remove_empty_tables)
+                self.__vacuum_loaded_tables()
+                self.print_queue_stats()
+                self.__print_bulk_stats()
+            # 0 record tables were never created
+            if normal_fox_pro_operation:
+                self.__print_empty_tables()
+
+            # staging - every table is loaded, swaps the schema in
+            if staging:
+                self.swap_schema(data_schema, live_schema, keep_previous)
 
             # print total timer
             if normal_fox_pro_operation and len(location.get_file_list()) > 1:
@@ -365,48 +393,46 @@ class DataPipeline(PgSql):
         data_schema: str = 'mysql',
         remove_empty_tables: bool = True,
         exclude_tables: ArrayList = ArrayList(),
+        load_mode: str = 'insert',
+        journal_mode: str = 'sql',
+        fetch_size: int = 10000,
+        incremental: bool = False,
+        watermark_columns: dict = None,
+        pipelined: bool = False,
+        split_ranges: int = 1,
+        split_columns: dict = None,
+        staging: bool = False,
+        keep_previous: bool = True,
     ):
         """ Processing mysql data """
 
+        # load mode (insert, copy or copy_binary) & journal mode (sql, compressed or none)
+        self.__set_load_options(load_mode, journal_mode)
+
+        prefetch = None
+
         try:
             # total timing
             total_timer = Timer()
 
+            # staging - loads into stage_[data_schema], swapped in for data_schema once every table is loaded
+            live_schema = data_schema
+            data_schema = self.__staging_schema(data_schema, staging, incremental or table != '')
+
             print("Extracting, transforming & loading mysql data...")
 
             # sql_[data_type] schema
-            self.create_schema(self._sql_schema + data_schema)
+            if journal_mode == 'sql':
+                self.create_schema(self._sql_schema + data_schema)
             # mysql schema
             self.create_schema(data_schema)
 
             # open database
-            mysql_connection = pymysql.connect(
-                host=self._login_info["local_mysql"]["host"],
-                database=my_database,
-                user=self._login_info["local_mysql"]["user"],
-                password=self._login_info["local_mysql"]["password"],
-            )
-            mysql_cursor = mysql_connection.cursor()
+            source_reader = MySqlReader(my_database, self._login_info["local_mysql"], fetch_size)
+            mysql_cursor = source_reader.cursor()
 
-            # get all tables from mssql
-            tables_sql_statement = f"""
-                select
-                    lower(table_schema) as table_schema,
-                    lower(table_name) as table_name,
-                    table_rows
-                from
-                    information_schema.tables
-                where
-                    table_schema = '{my_database}' /*and table_type = 'BASE TABLE'*/
-                order by
-                    lower(table_schema),
-                    lower(table_name);"""
-            mysql_cursor.execute(tables_sql_statement)
-
-            # add to my_tables from mysql
-            my_tables = ArrayList()
-            for my_table in mysql_cursor:
-                my_tables.append(f"{my_table[0]}.{my_table[1]}")
+            # get all tables from mysql
+            my_tables = ArrayList(source_reader.tables())
 
             # removes any tables from tables list
             for table_name in exclude_tables:
@@ -420,8 +446,26 @@ class DataPipeline(PgSql):
                 else:
                     print(f"Table doesn't exist in database: {table}")
 
+            # only when multiple tables - tables are created with their first row, 0 record tables never are
+            self.__lazy_create = remove_empty_tables and len(my_tables) > 1
+
+            # pipelined - a producer thread on its own connection reads the tables in order, ahead of the pg load
+            #   incremental & key range loads choose how each table is read in the loop
+            if pipelined and not incremental and split_ranges == 1:
+                producer_reader = MySqlReader(my_database, self._login_info["local_mysql"], fetch_size)
+                prefetch = PrefetchQueue(
+                    [
+                        (table_name, lambda table_name=table_name: producer_reader.batches(table_name))
+                        for table_name in my_tables
+                    ],
+                    self.__prefetch_batches,
+                )
+
             # loop thru table list
             for table_name in my_tables:
+                # prefetch source name
+                source_name = table_name
+
                 # table timing
                 table_timer = Timer()
 
@@ -432,100 +476,112 @@ class DataPipeline(PgSql):
 
                 print(f"  {table_name} completed in: ", end="", flush=True)
 
-                # queue drop table statements
-                sql_drop = self.__drop_table_statements(data_schema, table_name)
-
-                # get table schema
-                mysql_cursor.execute(
-                    f"""
-                        SELECT
-                            ordinal_position,
-                        lower(column_name) as column_name,
-                            case
-                                when data_type = 'bool' then 'boolean'
-                                when data_type = 'tinyint' then 'smallint'
-                                when data_type = 'mediumint' then 'int'
-                                when data_type = 'float' then 'real'
-                                when data_type = 'double' then 'double precision'
-                                when data_type = 'time' then 'interval hour to second'
-                                when data_type = 'datetime' then 'timestamp without time zone'
-                                when data_type = 'timestamp' then 'timestamp with time zone'
-                                when data_type = 'tinytext' then 'varchar(255)'
-                                when left(data_type, 6) = 'binary' or left(data_type, 9) = 'varbinary' then 'bytea'
-                                else data_type end as data_type,
-                            case when is_nullable = 'YES' then 'True' else 'False' end as is_nullable
-                        from
-                            information_schema.columns
-                        where
-                            table_schema = '{schema_name}' and table_name = '{table_name}'
-                        order by
-                            lower(table_name), ordinal_position;"""
-                )
-
-                # create table string - data schema
-                sql_create = f"create table if not exists {data_schema}.{table_name}("
-
-                # columns (ordinal_position, column_name, data_type, is_nullable)
-                for column in mysql_cursor:
-                    sql_create += f"""{self.__modify_column_name(column[1])}
-                                        {column[2]}{"" if column[3] == "True" else " NOT NULL"}, """
-                # remove last comma and space and replace with );
-                sql_create = sql_create.rstrip(", ") + ");"
-                # queue create table statements
-                self.__create_table_statements(data_schema, table_name, sql_create)
-
-                # write drop & create statments after sql_[data_type].table is setup
-                self.__sql_table_setup(data_schema, table_name, sql_drop, sql_create)
-
-                # get data from table_name
-                mysql_cursor.execute(f"select * from {schema_name}.{table_name};")
-
-                # row from mssql connection
-                for row in mysql_cursor:
-                    sql_row = ""
-                    # column from each row
-                    for column in row:
-                        # nulls
-                        if column is None:
-                            sql_row += "null, "
-                        # numbers & boolean
-                        elif isinstance(column, (bool, int, float, decimal.Decimal)):  #
-                            sql_row += f"{column}, "
-                        # bytes
-                        elif isinstance(column, bytes):
-                            sql_row += f"{self.__transform_byte_data(column)}, "
-                        # strings & dates
-                        else:
-                            sql_row += f"E'{self.__transform_string_data(str(column))}', "
-                    # remove last comma and space
-                    sql_row = sql_row.rstrip(", ")
-                    # queue insert into statements
-                    self.__insert_into_statements(data_schema, table_name, sql_row)
+                # incremental - primary key, watermark column & the last loaded watermark
+                watermark = None
+                if incremental:
+                    watermark = self.__watermark_setup(
+                        'mysql', mysql_cursor, schema_name, table_name, data_schema, watermark_columns
+                    )
+
+                    # loaded before - upsert only the rows past the last watermark
+                    if watermark['last'] is not None:
+                        data_cursor = source_reader.cursor(unbuffered=True)
+                        row_count = self.__etl_watermark_delta(
+                            data_cursor, schema_name, table_name, data_schema, watermark, fetch_size
+                        )
+                        data_cursor.close()
+
+                        print(f"{table_timer.return_time()} ({row_count:,} rows upserted)")
+                        continue
+
+                # incremental - tables are created with the source primary key
+                primary_key = self.__primary_key_clause(watermark)
+
+                # key ranges - a large table split over worker processes, each with its own source & pg connection
+                key_ranges = []
+                if split_ranges > 1:
+                    key_ranges = self.__key_ranges(
+                        'mysql', mysql_cursor, schema_name, table_name, split_ranges, split_columns
+                    )
+
+                # the ranges start their snapshots while source_reader holds the table read locked, without the lock
+                #   they'd read different points in time so the table loads as a single range
+                if len(key_ranges) > 1:
+                    try:
+                        source_reader.lock_table(source_name)
+                    except Exception as error:
+                        lock_warning = (
+                            f'{source_name} lock tables failed, split_ranges {split_ranges} loads as a single range: '
+                            f'{error}'
+                        )
+                        self.__error_log.warning(lock_warning)
+                        print(f"{lock_warning}\n  {table_name} completed in: ", end="", flush=True)
+                        key_ranges = []
+
+                if len(key_ranges) > 1:
+                    try:
+                        self.__source_table_setup(
+                            data_schema, table_name, source_reader.columns(source_name), primary_key=primary_key
+                        )
+                    except Exception as error:
+                        source_reader.unlock_tables()
+                        raise error
+
+                    row_count = self.__etl_key_range_pool(
+                        'mysql',
+                        my_database,
+                        schema_name,
+                        table_name,
+                        data_schema,
+                        key_ranges,
+                        fetch_size,
+                        source_reader,
+                    )
+                    # bulk load - primary key & set logged once every range is loaded
+                    self.__end_table_rows(data_schema, table_name)
+                else:
+                    # the columns then rows in fetch_size batches, the table is closed once read
+                    if prefetch is not None:
+                        table_source = prefetch.batches(source_name)
+                    else:
+                        table_source = source_reader.batches(source_name)
 
-                # execute anything left in the queue
-                self.sql_queue_exec(execute=True)
+                    row_count = self.__etl_source_table(table_source, data_schema, table_name, primary_key=primary_key)
 
-                # close table
-                mysql_cursor.close()
+                # incremental - the next run starts from this load's watermark
+                if watermark is not None:
+                    self.__watermark_loaded(data_schema, table_name, watermark)
 
                 # print table timer
-                table_timer.print_time()
+                if len(key_ranges) > 1:
+                    print(f"{table_timer.return_time()} ({row_count:,} rows over {len(key_ranges)} key ranges)")
+                else:
+                    table_timer.print_time()
 
-            # vacuums
-            self.sql_vacuum()
-            if len(my_tables) > 1:
-                # removes 0 record tables
-                self.sql_remove_empty_tables(data_schema, remove_empty_tables)
+            # vacuums - only the loaded tables
+            self.__vacuum_loaded_tables()
+            self.print_queue_stats()
+            self.__print_bulk_stats()
+            # 0 record tables were never created
+            self.__print_empty_tables()
+
+            # staging - every table is loaded, swaps the schema in
+            if staging:
+                self.swap_schema(data_schema, live_schema, keep_previous)
 
             # close cursor & connection
             mysql_cursor.close()
-            mysql_connection.close()
+            source_reader.close()
 
             if len(my_tables) > 1:
                 # print total timer
                 total_timer.print_time("Total conversion of mysql data completed in: ")
         except Exception as error:
             raise error
+        finally:
+            if prefetch is not None:
+                prefetch.close()
+                producer_reader.close()
 
     def etl_spreadsheet_data(
         self,
@@ -539,17 +595,34 @@ class DataPipeline(PgSql):
         delimiter_char=',',
         ignore_files: ArrayList = ArrayList(),
         exclude_tables: ArrayList = ArrayList(),
+        load_mode: str = 'insert',
+        journal_mode: str = 'sql',
+        incremental: bool = False,
+        pipelined: bool = False,
+        staging: bool = False,
+        keep_previous: bool = True,
+        type_sample_rows: int = 1000,
+        csv_workers: int = 0,
+        workers: int = 1,
     ):
         """ Processing spreadsheet data """
 
+        # load mode (insert, copy or copy_binary) & journal mode (sql, compressed or none)
+        self.__set_load_options(load_mode, journal_mode)
+
         try:
             # total timing
             total_timer = Timer()
 
+            # staging - loads into stage_[data_schema], swapped in for data_schema once every table is loaded
+            live_schema = data_schema
+            data_schema = self.__staging_schema(data_schema, staging, incremental or file_name != '')
+
             print("Extracting, transforming & loading spreadsheet data...")
 
             # sql_[data_type] schema
-            self.create_schema(self._sql_schema + data_schema)
+            if journal_mode == 'sql':
+                self.create_schema(self._sql_schema + data_schema)
             # spreadsheet schema
             self.create_schema(data_schema)
 
@@ -560,226 +633,107 @@ class DataPipeline(PgSql):
             for ignore_file_name in ignore_files:
                 location.get_file_list().remove(ignore_file_name.lower())
 
-            # loop thru file list
-            for file_list_table in location.get_file_list():
-                # table timing
-                table_timer = Timer()
-
-                # removing file extension from table name
-                #new_table_name = "\\." + file_list_table.split(".")[-1] + "$"
-                file_extension = "\\." + file_list_table.split(".")[-1] + "$"
-                # remove file extension and replace non-letters and digits with underscores
-                new_table_name = re.sub("\\W+", "_", re.sub(file_extension, "", file_list_table.lower()))
-
-                print(f"  {new_table_name} completed in: ", end="", flush=True)
+            # incremental - removes files unchanged since their last load
+            if incremental:
+                self.__incremental_file_list(path, location.get_file_list(), data_schema)
 
-                # open file
-                spreadsheet_cursor = pyexcel.get_book(
-                    file_name=os.path.join(path, file_list_table),
-                    encoding=self.__encoding,
-                    delimiter=delimiter_char,
+            # every sheet's table name, sheets that would load into the same table stop the load before it starts
+            work_sheets = self.__spreadsheet_work_sheets(
+                path, location.get_file_list(), file_table_name, sheet_table_name, delimiter_char, exclude_tables
+            )
+            table_count = sum(len(file_sheets) for file_sheets in work_sheets.values())
+
+            # process pool - sheets load across the workers, the largest files start first,
+            #   each worker with its own pg connection
+            if workers > 1 and table_count > 1:
+                results = self.__etl_table_pool(
+                    'spreadsheet',
+                    [
+                        (
+                            path,
+                            table_name,
+                            data_schema,
+                            file_list_table,
+                            work_sheet,
+                            header_line,
+                            bottom_lines_skipped,
+                            delimiter_char,
+                            type_sample_rows,
+                        )
+                        for file_list_table in sorted(
+                            work_sheets,
+                            key=lambda file_list_table: os.path.getsize(os.path.join(path, file_list_table)),
+                            reverse=True,
+                        )
+                        for work_sheet, table_name in work_sheets[file_list_table]
+                    ],
+                    workers,
+                    False,
                 )
+                row_count = sum(result['rows'] for result in results)
+                table_seconds = sum(result['seconds'] for result in results)
 
-                # get list of work_sheets and remove any from exclude_tables
-                work_sheets = ArrayList(spreadsheet_cursor.sheet_names())
-
-                if isinstance(exclude_tables, list):
-                    for table_name in exclude_tables:
-                        work_sheets.remove(table_name)
-                else:
-                    work_sheets.remove(exclude_tables)
-
-                # loop thru file (ie workbook)
-                for work_sheet in work_sheets:
-                    number_of_columns = spreadsheet_cursor[work_sheet].number_of_columns()
-                    number_of_rows = spreadsheet_cursor[work_sheet].number_of_rows()
-
-                    # get table_name from file and/or sheet
-                    table_name = ""
-                    if file_table_name:
-                        table_name = re.sub(
-                            "\\W+",
-                            "_",
-                            os.path.splitext(file_list_table)[0].lower() + f"{'_' if sheet_table_name else ''}",
-                        )
-                    # set table_name from sheet_name regardless
-                    else:
-                        table_name = re.sub("\\W+", "_", work_sheet.lower())
-
-                    # get column names in work_sheet
-                    column_names = ArrayList()
-                    for column_index in range(number_of_columns):
-                        # uses column_# for names if no header_line used
-                        if header_line == 0:
-                            column_names.append("column_" + str(column_index + 1))
-                        else:
-                            # trims column names and replace whitespace characters with underscore
-                            new_column_name = re.sub(
-                                "\\W+",
-                                "_",
-                                str(spreadsheet_cursor[work_sheet].cell_value(header_line - 1, column_index))
-                                .strip()
-                                .lower(),
+                if incremental:
+                    for file_list_table in work_sheets:
+                        self.__source_loaded(path, file_list_table, data_schema)
+            else:
+                row_count = 0
+                # the table times only show the parallel speed up
+                table_seconds = 0.0
+
+                # loop thru file list
+                for file_list_table, file_sheets in work_sheets.items():
+                    # open file - sheets are streamed a row at a time, never loaded whole
+                    with self.__spreadsheet_reader(
+                        path, file_list_table, delimiter_char, header_line, bottom_lines_skipped, type_sample_rows
+                    ) as spreadsheet_reader:
+                        # loop thru file (ie workbook)
+                        for work_sheet, table_name in file_sheets:
+                            print(f"  {table_name} completed in: ", end="", flush=True)
+
+                            row_count += self.__etl_spreadsheet_table(
+                                path,
+                                table_name,
+                                data_schema,
+                                file_list_table,
+                                work_sheet,
+                                header_line,
+                                bottom_lines_skipped,
+                                delimiter_char,
+                                type_sample_rows,
+                                csv_workers,
+                                pipelined,
+                                True,
+                                spreadsheet_reader,
                             )
-                            # uses column_# if empty column name
-                            if new_column_name == "":
-                                column_names.append("column_" + str(column_index + 1))
-                            # uses column name plus _# if column name is already used once
-                            elif column_names.exists(new_column_name):
-                                column_names.append(new_column_name + "_" + str(column_index + 1))
-                            # uses column name in spreadsheet
-                            else:
-                                column_names.append(new_column_name)
-
-                    # setup blank ArrayLists
-                    column_types = ArrayList([""] * number_of_columns)
-                    column_sizes = ArrayList([0] * number_of_columns)
-
-                    # column types & sizes checking
-                    for row_index in range(header_line, number_of_rows - bottom_lines_skipped):
-                        # column specifications
-                        for column_index in range(number_of_columns):
-                            testing_value = spreadsheet_cursor[work_sheet].cell_value(row_index, column_index)
-
-                            # boolean
-                            if (
-                                isinstance(testing_value, bool)
-                                or str(testing_value).lower() == "false"
-                                or str(testing_value).lower() == "true"
-                            ):
-                                column_types[column_index] = "boolean"
-                            # date
-                            elif isinstance(testing_value, date) and column_types[column_index] != "boolean":
-                                column_types[column_index] = "date"
-                            # string
-                            elif (
-                                isinstance(testing_value, str)
-                                and column_types[column_index] not in ("boolean", "date")
-                                and testing_value != ''
-                            ):
-                                column_types[column_index] = "varchar"
-                            # numeric
-                            elif (
-                                isinstance(testing_value, float)
-                                and column_types[column_index] not in ("boolean", "date", "varchar")
-                            ):
-                                column_types[column_index] = "numeric"
-                            # integer or bigint
-                            elif (
-                                isinstance(testing_value, int)
-                                and column_types[column_index] not in ("boolean", "date", "varchar", "numeric")
-                            ):
-                                if abs(int(testing_value)) <= 2147483647 and column_types[column_index] != "bigint":
-                                    column_types[column_index] = "integer"
-                                else:
-                                    column_types[column_index] = "bigint"
-                            else:
-                                column_types[column_index] = "varchar"
-
-                            # set the maximum length size for each column
-                            if column_sizes[column_index] < len(str(testing_value)):
-                                column_sizes[column_index] = len(str(testing_value))
-
-                    # check for empty file
-                    if number_of_rows - bottom_lines_skipped - header_line > 0:
-                        # queue drop table statements
-                        sql_drop = self.__drop_table_statements(data_schema, table_name)
-
-                        # create table string - data schema
-                        sql_create = f"create table if not exists {data_schema}.{table_name}("
-
-                        # column statements for table creation
-                        for column_index in range(number_of_columns):
-                            # column name
-                            sql_create += f'"{column_names[column_index]}" '
-
-                            # column types & size
-                            # string
-                            if column_types[column_index] == "varchar":
-                                # can't have a varchar(0)
-                                if column_sizes[column_index] == 0:
-                                    column_sizes[column_index] += 1
-                                sql_create += f"varchar({column_sizes[column_index]}) default ''"
-                            # integer or bigint
-                            elif column_types[column_index] == "integer" or column_types[column_index] == "bigint":
-                                sql_create += f"{column_types[column_index]} default 0"
-                            # numeric
-                            elif column_types[column_index] == "numeric":
-                                sql_create += "float default 0"
-                            # boolean
-                            elif column_types[column_index] == "boolean":
-                                sql_create += "boolean default 'false'"
-                            # date
-                            elif column_types[column_index] == "date":
-                                sql_create += "timestamp"
-
-                            # separator or ending
-                            if column_index + 1 != number_of_columns:
-                                sql_create += ", "
-                            else:
-                                sql_create += ");"
-
-                                                # queue create table statements
-                        self.__create_table_statements(data_schema, table_name, sql_create)
-
-                        # write drop & create statments after sql_[data_type].table is setup
-                        self.__sql_table_setup(data_schema, table_name, sql_drop, sql_create)
-
-                        # process data rows
-                        for row_index in range(header_line, number_of_rows - bottom_lines_skipped):
-                            sql_row = ""
-
-                            # column from each row
-                            for column_index in range(number_of_columns):
-                                cell_value = spreadsheet_cursor[work_sheet].cell_value(row_index, column_index)
-
-                                # boolean
-                                if column_types[column_index] == "boolean":
-                                    if str(cell_value).lower() == "true":
-                                        sql_row += str(True) + ", "
-                                    else:
-                                        sql_row += str(False) + ", "
-                                # integer, bigint & numeric
-                                elif (
-                                    column_types[column_index] == "integer"
-                                    or column_types[column_index] == "bigint"
-                                    or column_types[column_index] == "numeric"
-                                ):
-                                    if str(cell_value) == "":
-                                        sql_row += str(0) + ", "
-                                    else:
-                                        sql_row += str(cell_value) + ", "
-                                # dates
-                                elif column_types[column_index] == "date":
-                                    if str(cell_value).strip() == "":
-                                        sql_row += "null, "
-                                    else:
-                                        sql_row += f"'{str(cell_value).strip()}', "
-                                # strings
-                                elif column_types[column_index] == "varchar":
-                                    sql_row += f"E'{self.__transform_string_data(str(cell_value))}', "
-                            # remove last comma and space
-                            sql_row = sql_row.rstrip(", ")
-                            # queue insert into statements
-                            self.__insert_into_statements(data_schema, table_name, sql_row)
-                            # self.__insert_into_statements(data_schema, new_table_name, sql_row)
-
-                        # execute anything left in the queue
-                        self.sql_queue_exec(execute=True)
-
-                        # print table timer
-                        table_timer.print_time()
 
-                    else:
-                        print("skipping empty table")
+                    if incremental:
+                        self.__source_loaded(path, file_list_table, data_schema)
+
+            # one summary for the run - tables, rows & throughput of the load
+            self.__print_spreadsheet_summary(
+                work_sheets,
+                path,
+                table_count,
+                row_count,
+                total_timer.get_seconds(),
+                table_seconds,
+                workers if workers > 1 and table_count > 1 else 1,
+            )
 
-            # vacuums
-            self.sql_vacuum()
+            # vacuums - only the loaded tables
+            self.__vacuum_loaded_tables()
+            self.print_queue_stats()
+            self.__print_bulk_stats()
+            self.__print_empty_tables()
+
+            # staging - every table is loaded, swaps the schema in
+            if staging:
+                self.swap_schema(data_schema, live_schema, keep_previous)
 
             # print total timer
             total_timer.print_time("Total conversion of spreadsheet data completed in: ")
         except Exception as error:
-            print(column_types)
             raise error
 
     def etl_sql_server_data(
@@ -789,9 +743,25 @@ class DataPipeline(PgSql):
         data_schema: str = 'mssql',
         remove_empty_tables: bool = True,
         exclude_tables: ArrayList = ArrayList(),
+        load_mode: str = 'insert',
+        journal_mode: str = 'sql',
+        fetch_size: int = 10000,
+        incremental: bool = False,
+        watermark_columns: dict = None,
+        pipelined: bool = False,
+        split_ranges: int = 1,
+        split_columns: dict = None,
+        staging: bool = False,
+        keep_previous: bool = True,
     ):
         """ Processing sql server data """
 
+        # load mode (insert, copy or copy_binary) & journal mode (sql, compressed or none)
+        self.__set_load_options(load_mode, journal_mode)
+
+        prefetch = None
+        snapshot_database = ''
+
         try:
             # constants
             # default_encoding = "utf-16"
@@ -799,49 +769,38 @@ class DataPipeline(PgSql):
             # total timing
             total_timer = Timer()
 
+            # staging - loads into stage_[data_schema], swapped in for data_schema once every table is loaded
+            live_schema = data_schema
+            data_schema = self.__staging_schema(data_schema, staging, incremental or table != '')
+
             print("Extracting, transforming & loading sql server data...")
 
             # sql_[data_type] schema
-            self.create_schema(self._sql_schema + data_schema)
+            if journal_mode == 'sql':
+                self.create_schema(self._sql_schema + data_schema)
             # sql server schema
             self.create_schema(data_schema)
 
             # open database
-            mssql_connection = pymssql.connect(
-                host=self._login_info["local_mssql"]["host"],
-                server=self._login_info["local_mssql"]["server"],
-                database=ms_database,
-                user=self._login_info["local_mssql"]["user"],
-                password=self._login_info["local_mssql"]["password"],
-                # autocommit = True,
-                as_dict=False,
-            )
-            mssql_cursor = mssql_connection.cursor()
+            source_reader = SqlServerReader(ms_database, self._login_info["local_mssql"], fetch_size)
+            mssql_cursor = source_reader.cursor()
+
+            # key ranges all read from one database snapshot, without it the ranges would read different points in
+            #   time so the tables load as a single range
+            if split_ranges > 1:
+                try:
+                    snapshot_database = source_reader.create_snapshot()
+                except Exception as error:
+                    snapshot_warning = (
+                        f'{ms_database} database snapshot failed, split_ranges {split_ranges} loads as a single '
+                        f'range: {error}'
+                    )
+                    self.__error_log.warning(snapshot_warning)
+                    print(snapshot_warning)
+                    split_ranges = 1
 
             # get all tables from mssql
-            tables_sql_statement = """
-                select
-                    schema_name(tables.schema_id) as schema_name,
-                    lower(tables.[name]) as table_name,
-                    sum(partitions.rows) as row_count
-                from
-                    sys.tables
-                        left outer join sys.partitions on tables.object_id = partitions.object_id
-                group by
-                    tables.schema_id, lower(tables.[name])
-                --having
-                    --sum(partitions.rows) != 0
-                order by
-                    tables.schema_id, lower(tables.[name]);"""
-            mssql_cursor.execute(tables_sql_statement)
-
-            # add to ms_tables from mssql
-            ms_tables = ArrayList()
-            for ms_table in mssql_cursor:
-                if ms_table[0] == "dbo":
-                    ms_tables.append(ms_table[1])
-                else:
-                    ms_tables.append(f"{ms_table[0]}.{ms_table[1]}")
+            ms_tables = ArrayList(source_reader.tables())
 
             # removes any tables from tables list
             for table_name in exclude_tables:
@@ -855,8 +814,26 @@ class DataPipeline(PgSql):
                 else:
                     print(f"Table doesn't exist in database: {table}")
 
+            # only when multiple tables - tables are created with their first row, 0 record tables never are
+            self.__lazy_create = remove_empty_tables and len(ms_tables) > 1
+
+            # pipelined - a producer thread on its own connection reads the tables in order, ahead of the pg load
+            #   incremental & key range loads choose how each table is read in the loop
+            if pipelined and not incremental and split_ranges == 1:
+                producer_reader = SqlServerReader(ms_database, self._login_info["local_mssql"], fetch_size)
+                prefetch = PrefetchQueue(
+                    [
+                        (table_name, lambda table_name=table_name: producer_reader.batches(table_name))
+                        for table_name in ms_tables
+                    ],
+                    self.__prefetch_batches,
+                )
+
             # loop thru table list
             for table_name in ms_tables:
+                # prefetch source name
+                source_name = table_name
+
                 # table timing
                 table_timer = Timer()
 
@@ -869,109 +846,89 @@ class DataPipeline(PgSql):
 
                 print(f"  {table_name} completed in: ", end="", flush=True)
 
-                # queue drop table statements
-                sql_drop = self.__drop_table_statements(data_schema, table_name)
-
-                # get table schema
-                mssql_cursor.execute(
-                    f"""
-                        select
-                            --lower(tables.[name]) as table_name,
-                            columns.column_id,
-                            lower(columns.[name]) as column_name,
-                            case
-                                when lower(types.[name]) in ('binary', 'image', 'rowversion', 'timestamp', 'varbinary') then 'bytea'
-                                when lower(types.[name]) = 'bit' then 'boolean'
-                                when lower(types.[name]) = 'datetime' then 'timestamp(3) without time zone'
-                                when lower(types.[name]) = 'datetime2' then 'timestamp without time zone'
-                                when lower(types.[name]) = 'datetimeoffset' then 'timestamp'
-                                when lower(types.[name]) = 'decimal' then 'decimal(' + cast(columns.precision as varchar) + ',' + cast(columns.scale as varchar) + ')'
-                                when lower(types.[name]) = 'float' then 'float8'
-                                when lower(types.[name]) in ('nchar', 'char') then 'varchar' + case when columns.max_length is not null then '(' + cast(columns.max_length as varchar) + ')' else '' end
-                                when lower(types.[name]) in ('ntext', 'text') or lower(types.[name]) in ('nvarchar', 'varchar') and columns.max_length = -1 then 'text'
-                                when lower(types.[name]) in ('nvarchar', 'varchar') then 'varchar' + case when columns.max_length is not null then '(' + cast(columns.max_length as varchar) + ')' else '' end
-                                when lower(types.[name]) = 'smalldatetime' then 'timestamp(0) without time zone'
-                                when lower(types.[name]) = 'smallmoney' then 'money'
-                                when lower(types.[name]) = 'time' then 'time without time zone'
-                                when lower(types.[name]) = 'tinyint' then 'smallint'
-                                when lower(types.[name]) = 'uniqueidentifier' then 'uuid'
-                                when lower(types.[name]) in ('cursor', 'hiearchyid', 'sql_variant', 'table') then ''
-                                else lower(types.[name]) end as data_type,
-                            case when columns.is_nullable = 1 then 'True' else 'False' end as is_nullable
-                        from
-                            sys.tables
-                                inner join sys.columns on tables.object_id = columns.object_id
-                                inner join sys.types on columns.system_type_id = types.system_type_id and lower(types.[name]) != 'sysname'
-                        where
-                            tables.[name] = '{table_name}'
-                        order by
-                            tables.[name], columns.column_id;"""
-                )
-
-                # create table string - data schema
-                sql_create = f"create table if not exists {data_schema}.{table_name}("
-
-                # columns (column_id, column_name, data_type, is_nullable)
-                for column in mssql_cursor:
-                    sql_create += f"{self.__modify_column_name(column[1])} {column[2]}"
-                    if column[3] == "True":
-                        sql_create += ", "
+                # incremental - primary key, watermark column & the last loaded watermark
+                watermark = None
+                if incremental:
+                    watermark = self.__watermark_setup(
+                        'mssql', mssql_cursor, schema_name, table_name, data_schema, watermark_columns
+                    )
+
+                    # loaded before - upsert only the rows past the last watermark
+                    if watermark['last'] is not None:
+                        data_cursor = source_reader.cursor()
+                        row_count = self.__etl_watermark_delta(
+                            data_cursor, schema_name, table_name, data_schema, watermark, fetch_size
+                        )
+                        data_cursor.close()
+
+                        print(f"{table_timer.return_time()} ({row_count:,} rows upserted)")
+                        continue
+
+                # incremental - tables are created with the source primary key
+                primary_key = self.__primary_key_clause(watermark)
+
+                # key ranges - a large table split over worker processes, each with its own source & pg connection
+                key_ranges = []
+                if split_ranges > 1:
+                    key_ranges = self.__key_ranges(
+                        'mssql', mssql_cursor, schema_name, table_name, split_ranges, split_columns
+                    )
+
+                if len(key_ranges) > 1:
+                    self.__source_table_setup(
+                        data_schema, table_name, source_reader.columns(source_name), primary_key=primary_key
+                    )
+                    row_count = self.__etl_key_range_pool(
+                        'mssql', snapshot_database, schema_name, table_name, data_schema, key_ranges, fetch_size
+                    )
+                    # bulk load - primary key & set logged once every range is loaded
+                    self.__end_table_rows(data_schema, table_name)
+                else:
+                    # the columns then rows in fetch_size batches, fetchmany keeps only fetch_size rows in python
+                    #   at a time, the table is closed once read
+                    if prefetch is not None:
+                        table_source = prefetch.batches(source_name)
                     else:
-                        sql_create += " NOT NULL, "
-                # remove last comma and space and replace with );
-                sql_create = sql_create.rstrip(", ") + ");"
-                # queue create table statements
-                self.__create_table_statements(data_schema, table_name, sql_create)
-
-                # write drop & create statments after sql_[data_type].table is setup
-                self.__sql_table_setup(data_schema, table_name, sql_drop, sql_create)
-
-                # get data from table_name
-                mssql_cursor.execute(f"select * from {schema_name}.{table_name};")
-
-                # row from mssql connection
-                for row in mssql_cursor:
-                    sql_row = ""
-                    # column from each row
-                    for column in row:
-                        # nulls
-                        if column is None:
-                            sql_row += "null, "
-                        # numbers & boolean
-                        elif isinstance(column, (bool, int, float, decimal.Decimal)):
-                            sql_row += f"{column}, "
-                        # bytes
-                        elif isinstance(column, bytes):
-                            sql_row += f"{self.__transform_byte_data(column)}, "
-                        # strings & dates
-                        else:
-                            sql_row += f"E'{self.__transform_string_data(str(column))}', "
-                    # remove last comma and space
-                    sql_row = sql_row.rstrip(", ")
-                    # queue insert into statements
-                    self.__insert_into_statements(data_schema, table_name, sql_row)
+                        table_source = source_reader.batches(source_name)
 
-                # execute anything left in the queue
-                self.sql_queue_exec(execute=True)
+                    row_count = self.__etl_source_table(table_source, data_schema, table_name, primary_key=primary_key)
+
+                # incremental - the next run starts from this load's watermark
+                if watermark is not None:
+                    self.__watermark_loaded(data_schema, table_name, watermark)
 
                 # print table timer
-                table_timer.print_time()
+                if len(key_ranges) > 1:
+                    print(f"{table_timer.return_time()} ({row_count:,} rows over {len(key_ranges)} key ranges)")
+                else:
+                    table_timer.print_time()
 
-            # vacuums
-            self.sql_vacuum()
-            if len(ms_tables) > 1:
-                # removes 0 record tables
-                self.sql_remove_empty_tables(data_schema, remove_empty_tables)
+            # vacuums - only the loaded tables
+            self.__vacuum_loaded_tables()
+            self.print_queue_stats()
+            self.__print_bulk_stats()
+            # 0 record tables were never created
+            self.__print_empty_tables()
+
+            # staging - every table is loaded, swaps the schema in
+            if staging:
+                self.swap_schema(data_schema, live_schema, keep_previous)
 
             # close cursor & connection
             mssql_cursor.close()
-            mssql_connection.close()
+            source_reader.close()
 
             if len(ms_tables) > 1:
                 # print total timer
                 total_timer.print_time("Total conversion of sql server data completed in: ")
         except Exception as error:
             raise error
+        finally:
+            if prefetch is not None:
+                prefetch.close()
+                producer_reader.close()
+            if snapshot_database != '':
+                source_reader.drop_snapshot(snapshot_database)
 
     def read_sql_file(self, path: str, file_name: str = '', exclude_tables: ArrayList = ArrayList()):
         """ Read sql file data """
@@ -1029,42 +986,872 @@ class DataPipeline(PgSql):
         if read_sql_files_normal_operation and len(location.get_file_list()) > 1:
             total_timer.print_time('SQL files completed in: ')
 
+    # Protected
+    def _etl_table(
+        self,
+        source_type: str,
+        load_mode: str,
+        journal_mode: str,
+        lazy_create: bool,
+        staging: bool,
+        table_arguments: tuple,
+    ) -> dict:
+        """ Loads a single table for a process pool worker, returns the table, row count & timing """
+
+        # table timing & peak memory
+        table_timer = Timer()
+        memory_usage = MemoryUsage()
+
+        self.__set_load_options(load_mode, journal_mode)
+        self.__lazy_create = lazy_create
+        self.__staging = staging
+
+        # csv chunks - the overflow table & types of the rows the sampled types didn't fit
+        overflow = None
+
+        if source_type == 'csv_chunk':
+            row_count, overflow = self.__etl_csv_chunk(*table_arguments)
+        elif source_type == 'dataflex':
+            row_count = self.__etl_dataflex_table(*table_arguments)
+        elif source_type == 'fox_pro':
+            row_count = self.__etl_fox_pro_table(*table_arguments)
+        elif source_type == 'spreadsheet':
+            row_count = self.__etl_spreadsheet_table(*table_arguments)
+        elif source_type in ('mysql_range', 'mssql_range'):
+            row_count = self.__etl_key_range(source_type.split('_')[0], *table_arguments)
+        else:
+            raise ValueError(f'source_type has no table loader: {source_type}')
+
+        # bulk load timings go back to the parent, the worker's next table starts from 0
+        bulk_stats = self.__bulk_stats
+        self.__bulk_stats = {'tables': 0, 'unlogged_seconds': 0.0, 'logged_seconds': 0.0}
+        # tables the worker created, vacuumed by the parent
+        loaded_tables = ArrayList(self.__loaded_tables)
+        self.__loaded_tables.clear()
+        empty_tables = ArrayList(self.__empty_tables)
+        self.__empty_tables.clear()
+
+        return {
+            'table': table_arguments[1].split('.')[0],
+            'file': table_arguments[1],
+            'rows': row_count,
+            'seconds': table_timer.get_seconds(),
+            'time': table_timer.return_time(),
+            'peak_rss': memory_usage.get_peak(),
+            'batch_size': self.sql_queue_stats()['batch_size'],
+            'bulk_stats': bulk_stats,
+            'loaded_tables': loaded_tables,
+            'empty_tables': empty_tables,
+            'overflow': overflow,
+        }
+
     # Private
+    def __bulk_table_finish(self, data_schema: str, table_name: str):
+        """ Adds the deferred primary key & sets the loaded unlogged table logged, recording both timings """
+
+        unlogged_seconds = self.__bulk_timer.get_seconds()
+        logged_timer = Timer()
+
+        for sql_statement in self.__deferred_statements:
+            self.sql_queue_exec(sql_statement)
+        self.sql_queue_exec(f'alter table {data_schema}.{table_name} set logged;')
+
+        # pooled connections go back with the default settings
+        for setting in self.__bulk_settings:
+            self.sql_queue_exec(f'reset {setting};')
+
+        self.sql_queue_exec(execute=True)
+
+        self.__bulk_stats['tables'] += 1
+        self.__bulk_stats['unlogged_seconds'] += unlogged_seconds
+        self.__bulk_stats['logged_seconds'] += logged_timer.get_seconds()
+
+        self.__deferred_statements.clear()
+        self.__bulk_timer = None
+
+    def __copy_rows_flush(self, data_schema: str, table_name: str, create_sql_schema: bool = True):
+        """ Loads the batched rows with copy from stdin """
+
+        if len(self.__copy_rows) == 0:
+            return
+
+        # pick the encoder once per table from the created table's column types
+        if self.__copy_encoder is None:
+            column_types = self.sql_column_types(data_schema, table_name)
+            if self.__load_mode == 'copy_binary' and CopyBinaryEncoder.supports(column_types):
+                self.__copy_encoder = CopyBinaryEncoder(column_types, self.__encoding, self.__clean_sanitizer)
+            # text format for copy or when a column type has no binary encoder
+            else:
+                self.__copy_encoder = CopyTextEncoder(self.__encoding, self.__copy_sanitizer)
+
+        # sql_[data_type] schema - insert into statements for sql_refresh_data
+        if create_sql_schema and self.__journal_mode == 'sql':
+            journal_schema = self.__journal_schema(data_schema)
+            sql_rows = [
+                (3, f'insert into {journal_schema}.{table_name} values ({self.__sql_row_values(row)});')
+                for row in self.__copy_rows
+            ]
+            self.sql_copy_from(
+                self._sql_schema + data_schema,
+                table_name,
+                CopyTextEncoder(self.__encoding).encode_rows(sql_rows),
+                columns='sorting, data',
+            )
+
+        # data schema - strings are cleaned & escaped by the encoder's sanitizer
+        copy_data = self.__copy_encoder.encode_rows(self.__copy_rows)
+        copy_binary = isinstance(self.__copy_encoder, CopyBinaryEncoder)
+        self.sql_copy_from(data_schema, table_name, copy_data, 'binary' if copy_binary else 'text')
+
+        # compressed journal - the copy text payload is reused as the journal block, copy_binary journals its rows as
+        # they're queued whichever encoder the table got
+        if create_sql_schema and self.__journal_mode == 'compressed' and self.__load_mode == 'copy':
+            self.__journal_sequence += 1
+            self.sql_journal_block(data_schema, table_name, self.__journal_sequence, 'copy', len(self.__copy_rows), copy_data)
+
+        self.__copy_rows.clear()
+
     def __create_table_statements(
-        self, data_schema: str, table_name: str, sql_create: str, create_sql_schema: bool = True
+        self, data_schema: str, table_name: str, sql_create: str, create_sql_schema: bool = True, primary_key: str = ''
     ):
         """ Makes create table statements """
 
         # sql_[data_type] schema
-        if create_sql_schema:
+        if create_sql_schema and self.__journal_mode == 'sql':
             self.sql_queue_exec(self.__sql_schema_create(data_schema, table_name))
 
+        # bulk load - unlogged table without its primary key, both are put back by __bulk_table_finish
+        if self.__bulk_load:
+            for setting, value in self.__bulk_settings.items():
+                self.sql_queue_exec(f'set {setting} = {value};')
+
+            if primary_key != '':
+                sql_create = sql_create.replace(primary_key, '')
+                self.__deferred_statements.append(
+                    f"alter table {data_schema}.{table_name} add {primary_key.lstrip(', ')};"
+                )
+
+            sql_create = sql_create.replace('create table', 'create unlogged table', 1)
+            self.__bulk_timer = Timer()
+
         # data schema
         self.sql_queue_exec(sql_create)
+        self.__table_loaded(data_schema, table_name)
+
+    @staticmethod
+    def __csv_overflow_table(table_name: str, chunk_index: int) -> str:
+        """ Returns the name of a csv chunk's overflow table """
+
+        return f'{table_name}_overflow_{chunk_index + 1}'
+
+    def __csv_chunk_overflow(self, table_source, data_schema: str, overflow_table: str, overflow_types: TypeInference):
+        """ Yields the batches of a csv chunk, copying its OverflowRows into the overflow table as json arrays
+            & widening overflow_types to hold them
+        """
+
+        row_id = 0
+
+        for row_batch in table_source:
+            if not isinstance(row_batch, OverflowRows):
+                yield row_batch
+                continue
+
+            # unlogged, it only lives until the parent loads its rows
+            if row_id == 0:
+                self.sql_queue_exec(
+                    f'create unlogged table {data_schema}.{overflow_table} '
+                    '(row_id bigint primary key, row_values jsonb);'
+                )
+
+            overflow_types.widen(row_batch)
+
+            # dates are kept as their iso text, which is how they're loaded into a date or varchar column
+            self.sql_copy_from(
+                data_schema,
+                overflow_table,
+                CopyTextEncoder(self.__encoding).encode_rows(
+                    [(row_id + row_index, json.dumps(row, default=str)) for row_index, row in enumerate(row_batch)]
+                ),
+                columns='row_id, row_values',
+            )
+            row_id += len(row_batch)
+
+    def __dataflex_reader(self, path: str, fetch_size: int) -> DataFlexReader:
+        """ Returns the directory's dataflex reader, every vld file in it is read over one odbc connection """
+
+        if path not in self.__dataflex_readers:
+            self.__dataflex_readers[path] = DataFlexReader(path, fetch_size)
+
+        return self.__dataflex_readers[path]
+
+    def __dataflex_readers_close(self):
+        """ Closes the dataflex readers & their odbc connections """
+
+        for dataflex_reader in self.__dataflex_readers.values():
+            dataflex_reader.close()
+
+        self.__dataflex_readers.clear()
 
     def __drop_table_statements(self, data_schema: str, table_name: str, create_sql_schema: bool = True) -> str:
         """ Makes drop table statements """
 
-        # sql_[data_type] schema
+        # sql_[data_type] schema - dropped in every journal mode so refresh never replays a stale load
         if create_sql_schema:
             self.sql_queue_exec(f'drop table if exists {self._sql_schema + data_schema}.{table_name} cascade;')
 
+            # compressed journal - sequence 1 replaces the blocks instead
+            if self.__journal_mode != 'compressed':
+                self.sql_journal_delete(data_schema, table_name)
+
         # data schema
         sql_drop = f'drop table if exists {data_schema}.{table_name} cascade;'
         self.sql_queue_exec(sql_drop)
 
         return sql_drop
 
-    def __insert_into_statements(self, data_schema: str, table_name: str, sql_row: str, create_sql_schema: bool = True):
-        """ Makes insert into statements """
+    def __empty_table(self, data_schema: str, table_name: str, create_sql_schema: bool = True):
+        """ Records a 0 record table that was never created """
+
+        self.__pending_table = None
+        self.__empty_tables.append(table_name)
+
+        # compressed journal - no sequence 1 block replaced the previous load's blocks
+        if create_sql_schema and self.__journal_mode == 'compressed':
+            self.sql_journal_delete(data_schema, table_name)
+
+    def __end_table_rows(self, data_schema: str, table_name: str, create_sql_schema: bool = True) -> int:
+        """ Loads the last copy batch & executes anything left in the queue, returns the table row count """
+
+        # no rows - the table was never created, only the old one is dropped
+        if self.__pending_table is not None:
+            self.__empty_table(*self.__pending_table[0:2], self.__pending_table[4])
+
+        self.__copy_rows_flush(data_schema, table_name, create_sql_schema)
+        self.__journal_rows_flush(data_schema, table_name)
+        self.__copy_encoder = None
+
+        # execute anything left in the queue
+        self.sql_queue_exec(execute=True)
+
+        # bulk load - the unlogged table is complete
+        if self.__bulk_timer is not None:
+            self.__bulk_table_finish(data_schema, table_name)
+
+        # returns & resets the table row count
+        row_count = self.__row_count
+        self.__row_count = 0
+
+        return row_count
+
+    def __etl_csv_chunk(
+        self,
+        file_path: str,
+        table_name: str,
+        data_schema: str,
+        delimiter: str,
+        chunk_start: int,
+        chunk_end: int,
+        bottom_lines_skipped: int,
+        type_inference: TypeInference,
+        journal_sequence: int,
+        overflow_table: str,
+    ) -> tuple:
+        """ Extract, transform & load one chunk of a csv file, returns the row count & the overflow table with the
+            types of its rows, None when every row fit
+        """
+
+        # compressed journal - each chunk writes its blocks from its own sequence
+        self.__journal_sequence = journal_sequence
+
+        # chunks always load with copy (copy_binary when chosen), never as per row inserts
+        if self.__load_mode == 'insert':
+            self.__load_mode = 'copy'
+
+        # rows the sampled column types don't fit are kept in the overflow table, their types widened from none
+        overflow_types = TypeInference()
+        self.sql_queue_exec(f'drop table if exists {data_schema}.{overflow_table};')
+
+        with CsvReader(file_path, self.__encoding, delimiter, fetch_size=self.__source_batch_size) as csv_reader:
+            table_source = csv_reader.chunk_batches(chunk_start, chunk_end, bottom_lines_skipped, type_inference)
+            # the table is created by the parent
+            next(table_source)
+
+            row_count = self.__load_source_rows(
+                self.__csv_chunk_overflow(table_source, data_schema, overflow_table, overflow_types),
+                data_schema,
+                table_name,
+            )
+
+        if len(overflow_types.get_types()) == 0:
+            return row_count, None
+
+        return row_count, (overflow_table, overflow_types)
+
+    def __etl_csv_chunk_pool(
+        self,
+        file_path: str,
+        table_name: str,
+        data_schema: str,
+        delimiter: str,
+        csv_chunks: list,
+        bottom_lines_skipped: int,
+        type_inference: TypeInference,
+        workers: int,
+    ) -> tuple:
+        """ Loads the chunks of a csv file into a created table across a process pool, returns the row count & the
+            (overflow table, types) of the chunks with rows the sampled types didn't fit, in chunk order
+        """
+
+        # the workers load into the table so its drop & create must be executed first
+        if self.__pending_table is not None:
+            self.__table_create_pending()
+        self.sql_queue_exec(execute=True)
+
+        overflow_tables = [self.__csv_overflow_table(table_name, chunk_index) for chunk_index in range(len(csv_chunks))]
+
+        results = self.__etl_table_pool(
+            'csv_chunk',
+            [
+                (
+                    file_path,
+                    table_name,
+                    data_schema,
+                    delimiter,
+                    chunk_start,
+                    chunk_end,
+                    bottom_lines_skipped if chunk_index == len(csv_chunks) - 1 else 0,
+                    type_inference,
+                    # sequence 1 is the drop & create block
+                    chunk_index * 10000000 + 1,
+                    overflow_tables[chunk_index],
+                )
+                for chunk_index, (chunk_start, chunk_end) in enumerate(csv_chunks)
+            ],
+            workers,
+            False,
+        )
+
+        overflows = sorted(
+            (result['overflow'] for result in results if result['overflow'] is not None),
+            key=lambda overflow: overflow_tables.index(overflow[0]),
+        )
+
+        return sum(result['rows'] for result in results), overflows
+
+    def __etl_csv_overflow(
+        self,
+        csv_reader: CsvReader,
+        table_name: str,
+        data_schema: str,
+        column_names: list,
+        type_inference: TypeInference,
+        overflows: list,
+        chunk_count: int,
+    ) -> int:
+        """ Widens the table once to hold every chunk's overflow rows, loads them from the overflow tables & drops
+            them, returns the row count
+        """
+
+        # compressed journal - the alter & rows are replayed after every chunk's blocks
+        self.__journal_sequence = chunk_count * 10000000 + 1
+
+        # the chunks' rows are loaded with copy, their overflow rows are too
+        load_mode = self.__load_mode
+        if load_mode == 'insert':
+            self.__load_mode = 'copy'
+
+        try:
+            table_source = csv_reader.overflow_batches(
+                self.__overflow_rows(data_schema, [overflow_table for overflow_table, _ in overflows]),
+                column_names,
+                type_inference,
+                [overflow_types for _, overflow_types in overflows],
+            )
+            row_count = self.__load_source_rows(table_source, data_schema, table_name)
+        finally:
+            self.__load_mode = load_mode
+
+        for overflow_table, _ in overflows:
+            self.sql_queue_exec(f'drop table if exists {data_schema}.{overflow_table};')
+        self.sql_queue_exec(execute=True)
+
+        return row_count
+
+    def __etl_dataflex_table(
+        self, path: str, file_list_table: str, data_schema: str, fetch_size: int = 10000, table_source=None
+    ) -> int:
+        """ Extract, transform & load a single vld file, returns the row count """
+
+        # open table - the columns then row batches, read ahead by a prefetch queue when pipelined
+        if table_source is None:
+            table_source = self.__dataflex_reader(path, fetch_size).batches(file_list_table)
+
+        return self.__etl_source_table(table_source, data_schema, file_list_table.split('.')[0])
+
+    def __etl_key_range(
+        self,
+        source_type: str,
+        source_database: str,
+        table_name: str,
+        data_schema: str,
+        schema_name: str,
+        range_where: str,
+        range_parameters: tuple,
+        journal_sequence: int,
+        fetch_size: int,
+        snapshot_queue=None,
+    ) -> int:
+        """ Extract, transform & load one key range of a mysql or sql server table, returns the row count """
+
+        # compressed journal - each range writes its blocks from its own sequence
+        self.__journal_sequence = journal_sequence
+
+        # mysql - each range starts a consistent snapshot while the parent holds the table read locked, then tells
+        #   the parent through snapshot_queue, sql server - the source database is the parent's database snapshot
+        if source_type == 'mysql':
+            source_reader = MySqlReader(source_database, self._login_info["local_mysql"], fetch_size, snapshot=True)
+            source_reader.cursor().close()
+            snapshot_queue.put(journal_sequence)
+        else:
+            source_reader = SqlServerReader(source_database, self._login_info["local_mssql"], fetch_size)
+
+        with source_reader:
+            table_source = source_reader.batches(f'{schema_name}.{table_name}', range_where, range_parameters)
+            # the table is created by the parent
+            next(table_source)
+
+            return self.__load_source_rows(table_source, data_schema, table_name)
+
+    def __etl_key_range_pool(
+        self,
+        source_type: str,
+        source_database: str,
+        schema_name: str,
+        table_name: str,
+        data_schema: str,
+        key_ranges: list,
+        fetch_size: int,
+        lock_reader: MySqlReader = None,
+    ) -> int:
+        """ Loads the key ranges of a created table across a process pool, returns the row count
+
+            lock_reader - mysql, the reader holding the table read locked, unlocked once every range's snapshot started
+        """
+
+        # the workers load into the table so its drop & create must be executed first
+        if self.__pending_table is not None:
+            self.__table_create_pending()
+        self.sql_queue_exec(execute=True)
+
+        if lock_reader is None:
+            results = self.__etl_table_pool(
+                f'{source_type}_range',
+                self.__key_range_arguments(
+                    source_database, schema_name, table_name, data_schema, key_ranges, fetch_size
+                ),
+                len(key_ranges),
+                False,
+            )
+
+            return sum(result['rows'] for result in results)
+
+        # mysql - writes to the table are blocked until every range has started its snapshot, so they all read the
+        #   same data
+        try:
+            with multiprocessing.get_context('spawn').Manager() as snapshot_manager:
+                snapshot_queue = snapshot_manager.Queue()
+
+                results = self.__etl_table_pool(
+                    f'{source_type}_range',
+                    self.__key_range_arguments(
+                        source_database, schema_name, table_name, data_schema, key_ranges, fetch_size, snapshot_queue
+                    ),
+                    len(key_ranges),
+                    False,
+                    lambda futures: self.__key_range_snapshots(lock_reader, snapshot_queue, futures),
+                )
+        finally:
+            # unlocking twice is harmless, the lock is normally released once the snapshots start
+            lock_reader.unlock_tables()
+
+        return sum(result['rows'] for result in results)
+
+    def __etl_source_table(
+        self,
+        table_source,
+        data_schema: str,
+        table_name: str,
+        create_sql_schema: bool = True,
+        primary_key: str = '',
+        modify_names: bool = True,
+    ) -> int:
+        """ Extract, transform & load a table from a source reader's batches, returns the row count """
+
+        columns = next(table_source)
+
+        # nothing to load - no table is created, a prefetched source is still read to its end
+        if len(columns) == 0:
+            for _ in table_source:
+                pass
+
+            self.__empty_tables.append(table_name)
+            return 0
+
+        # queue drop & create table statements
+        self.__source_table_setup(data_schema, table_name, columns, create_sql_schema, primary_key, modify_names)
+
+        return self.__load_source_rows(table_source, data_schema, table_name, create_sql_schema)
+
+    def __etl_spreadsheet_table(
+        self,
+        path: str,
+        table_name: str,
+        data_schema: str,
+        file_list_table: str,
+        work_sheet: str,
+        header_line: int,
+        bottom_lines_skipped: int,
+        delimiter_char: str,
+        type_sample_rows: int,
+        csv_workers: int = 0,
+        pipelined: bool = False,
+        printing: bool = False,
+        spreadsheet_reader: SpreadsheetReader = None,
+    ) -> int:
+        """ Extract, transform & load a single work sheet, returns the row count """
+
+        # process pool workers open the workbook of their sheet
+        if spreadsheet_reader is None:
+            with self.__spreadsheet_reader(
+                path, file_list_table, delimiter_char, header_line, bottom_lines_skipped, type_sample_rows
+            ) as spreadsheet_reader:
+                return self.__etl_spreadsheet_table(
+                    path,
+                    table_name,
+                    data_schema,
+                    file_list_table,
+                    work_sheet,
+                    header_line,
+                    bottom_lines_skipped,
+                    delimiter_char,
+                    type_sample_rows,
+                    csv_workers,
+                    pipelined,
+                    printing,
+                    spreadsheet_reader,
+                )
+
+        # table timing
+        table_timer = Timer()
+
+        # csv fast path - files larger than a chunk are split into record aligned chunks for the workers
+        csv_chunks = []
+        if csv_workers > 0 and isinstance(spreadsheet_reader, CsvReader):
+            csv_chunks = spreadsheet_reader.chunks(self.__csv_chunk_size)
+
+        # csv fast path - the table is created with the sampled types & each worker parses its chunk once, the rows
+        #   the types don't fit are kept in an overflow table per chunk
+        if len(csv_chunks) > 1:
+            type_inference = spreadsheet_reader.sample_types(work_sheet)
+            columns = spreadsheet_reader.columns(work_sheet, type_inference)
+            self.__source_table_setup(data_schema, table_name, columns, modify_names=False)
+
+            try:
+                row_count, overflows = self.__etl_csv_chunk_pool(
+                    os.path.join(path, file_list_table),
+                    table_name,
+                    data_schema,
+                    delimiter_char,
+                    csv_chunks,
+                    bottom_lines_skipped,
+                    type_inference,
+                    csv_workers,
+                )
+            except csv.Error:
+                # a quote inside an unquoted field (12" ruler) threw the chunk boundaries off, the table is created
+                #   again & loaded line by line
+                if printing:
+                    print("(misaligned csv chunks, reading line by line) ", end="", flush=True)
+
+                for chunk_index in range(len(csv_chunks)):
+                    self.sql_queue_exec(
+                        f'drop table if exists {data_schema}.{self.__csv_overflow_table(table_name, chunk_index)};'
+                    )
+                csv_chunks = []
+
+        if len(csv_chunks) > 1:
+            # overflow - the table is widened once for every chunk's overflow rows, then they're loaded
+            if len(overflows) > 0:
+                row_count += self.__etl_csv_overflow(
+                    spreadsheet_reader,
+                    table_name,
+                    data_schema,
+                    [column_name for column_name, _ in columns],
+                    type_inference,
+                    overflows,
+                    len(csv_chunks),
+                )
+            # bulk load - primary key & set logged once every chunk is loaded
+            else:
+                self.__end_table_rows(data_schema, table_name)
+
+            if printing:
+                print(f"{table_timer.return_time()} ({row_count:,} rows over {len(csv_chunks)} chunks)")
+
+            return row_count
+
+        # columns & rows - transformed on a producer thread when pipelined
+        table_source = spreadsheet_reader.batches(work_sheet)
+        prefetch = None
+        if pipelined:
+            prefetch = PrefetchQueue(
+                [(table_name, lambda sheet_source=table_source: sheet_source)], self.__prefetch_batches
+            )
+            table_source = prefetch.batches(table_name)
+
+        try:
+            # spreadsheet column names are already valid, reserved keywords are kept quoted
+            row_count = self.__etl_source_table(table_source, data_schema, table_name, modify_names=False)
+        finally:
+            if prefetch is not None:
+                prefetch.close()
+
+        # print table timer, empty sheets have no table
+        if printing and self.__empty_tables.exists(table_name):
+            print("skipping empty table")
+        elif printing:
+            table_timer.print_time()
+
+        return row_count
+
+    def __etl_table_pool(
+        self,
+        source_type: str,
+        table_arguments_list: list,
+        workers: int,
+        printing: bool = True,
+        submitted: callable = None,
+    ) -> ArrayList:
+        """ Loads tables across a process pool, returns each table's row count & timing, submitted is called with
+            the futures before the results are gathered
+        """
+
+        results = ArrayList()
+
+        if len(table_arguments_list) == 0:
+            return results
+
+        # spawn so workers never share the parent's pg connections
+        mp_context = multiprocessing.get_context('spawn')
+        workers = min(workers, len(table_arguments_list))
+        # each worker's close task waits on it, so no worker takes two of them
+        close_barrier = mp_context.Barrier(workers)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context,
+            initializer=_init_table_worker,
+            initargs=(*self.__init_arguments, close_barrier),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _run_table_worker,
+                    source_type,
+                    self.__load_mode,
+                    self.__journal_mode,
+                    self.__lazy_create,
+                    self.__staging,
+                    table_arguments,
+                )
+                for table_arguments in table_arguments_list
+            ]
+
+            try:
+                if submitted is not None:
+                    submitted(futures)
+
+                # gather results as tables complete
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+
+                    # bulk load timings of the worker's tables
+                    for stat, value in result['bulk_stats'].items():
+                        self.__bulk_stats[stat] += value
+
+                    for loaded_table in result['loaded_tables']:
+                        self.__table_loaded(*loaded_table.split('.'))
+                    self.__empty_tables.extend(result['empty_tables'])
+
+                    if printing:
+                        print(
+                            f"  {result['table']} completed in: {result['time']} "
+                            f"({result['rows']:,} rows, peak rss {result['peak_rss'] / 1048576:,.1f} MB, "
+                            f"batch size {result['batch_size']:,})"
+                        )
+
+            # the worker connections are closed as the pool shuts down, whether or not every table loaded
+            finally:
+                try:
+                    wait([pool.submit(_close_table_worker) for _ in range(workers)])
+                # a worker process died, the pool has already terminated the others
+                except BrokenProcessPool:
+                    pass
+
+        return results
+
+    def __etl_watermark_delta(
+        self, data_cursor, schema_name: str, table_name: str, data_schema: str, watermark: dict, fetch_size: int
+    ) -> int:
+        """ Upserts the source rows past the last watermark on the primary key, returns the row count """
+
+        data_cursor.execute(
+            f"select * from {schema_name}.{table_name} where {watermark['column']} > %s;", (watermark['last'],)
+        )
+
+        # on conflict clause - every non key column is updated from the new row
+        column_names = [self.__modify_column_name(str(column[0]).lower()) for column in data_cursor.description]
+        update_columns = [column for column in column_names if not watermark['primary_key'].exists(column)]
+        conflict = f" on conflict ({', '.join(watermark['primary_key'])}) do " + (
+            'update set ' + ', '.join(f'{column} = excluded.{column}' for column in update_columns)
+            if update_columns
+            else 'nothing'
+        )
+
+        # compressed journal - each batch is appended to the table's blocks as upsert statements
+        if self.__journal_mode == 'compressed':
+            self.__journal_sequence = self.sql_journal_sequence(data_schema, table_name)
+
+        self.__table_loaded(data_schema, table_name)
+
+        # copy & copy_binary - the delta is copied into a temp table, then upserted with one insert into select
+        copy_encoder = None
+        delta_table = f'{table_name}_delta'
+        if self.__load_mode != 'insert':
+            self.sql_queue_exec(
+                f'drop table if exists pg_temp.{delta_table};'
+                f'create temp table {delta_table} (like {data_schema}.{table_name} including defaults);'
+            )
+
+            column_types = self.sql_column_types(data_schema, table_name)
+            if self.__load_mode == 'copy_binary' and CopyBinaryEncoder.supports(column_types):
+                copy_encoder = CopyBinaryEncoder(column_types, self.__encoding, self.__clean_sanitizer)
+            # text format for copy or when a column type has no binary encoder
+            else:
+                copy_encoder = CopyTextEncoder(self.__encoding, self.__copy_sanitizer)
+
+        row_count = 0
+        row_batch = data_cursor.fetchmany(fetch_size)
+        while row_batch:
+            # upsert statements - executed per row with insert, only journaled with copy
+            sql_upserts = ArrayList()
+            if copy_encoder is None or self.__journal_mode != 'none':
+                for row in row_batch:
+                    sql_row = self.__sql_row_values(list(row))
+                    if copy_encoder is None:
+                        self.__insert_into_statements(data_schema, table_name, sql_row, conflict=conflict)
+                    sql_upserts.append(f'insert into {data_schema}.{table_name} values ({sql_row}){conflict};')
+
+            if copy_encoder is not None:
+                # sql_[data_type] schema - the upserts for sql_refresh_data
+                if self.__journal_mode == 'sql':
+                    self.sql_copy_from(
+                        self._sql_schema + data_schema,
+                        table_name,
+                        CopyTextEncoder(self.__encoding).encode_rows([(3, sql_upsert) for sql_upsert in sql_upserts]),
+                        columns='sorting, data',
+                    )
+
+                copy_binary = isinstance(copy_encoder, CopyBinaryEncoder)
+                self.sql_copy_from(
+                    'pg_temp', delta_table, copy_encoder.encode_rows(row_batch), 'binary' if copy_binary else 'text'
+                )
+
+            if self.__journal_mode == 'compressed':
+                self.__journal_sequence += 1
+                self.sql_journal_block(
+                    data_schema,
+                    table_name,
+                    self.__journal_sequence,
+                    'sql',
+                    len(row_batch),
+                    '\n'.join(sql_upserts).encode(self.__encoding),
+                )
+
+            row_count += len(row_batch)
+            row_batch = data_cursor.fetchmany(fetch_size)
+
+        if copy_encoder is not None:
+            self.sql_queue_exec(
+                f'insert into {data_schema}.{table_name} select * from pg_temp.{delta_table}{conflict};'
+                f'drop table pg_temp.{delta_table};'
+            )
+
+        # execute anything left in the queue
+        self.sql_queue_exec(execute=True)
+
+        self.__watermark_loaded(data_schema, table_name, watermark)
+
+        return row_count
+
+    def __etl_fox_pro_table(
+        self,
+        path: str,
+        file_list_table: str,
+        data_schema: str,
+        create_sql_schema: bool = True,
+        streaming: bool = False,
+        table_source=None,
+    ) -> int:
+        """ Extract, transform & load a single dbf file, returns the row count """
+
+        # open table - the columns then transformed row batches, read ahead by a prefetch queue when pipelined
+        if table_source is None:
+            table_source = FoxProReader(path, streaming, self.__source_batch_size).batches(file_list_table)
+
+        return self.__etl_source_table(table_source, data_schema, file_list_table.split('.')[0], create_sql_schema)
+
+    def __incremental_file_list(self, path: str, file_list: ArrayList, data_schema: str):
+        """ Removes the files whose size, modified time & hash match sys.manifest from the file list """
+
+        skipped_files = 0
+
+        for file_list_table in ArrayList(file_list):
+            source_path = os.path.join(path, file_list_table)
+            signature = FileSignature(source_path)
+            manifest = self.sql_manifest_get(data_schema, source_path)
+
+            if manifest is not None and signature.matches(*manifest):
+                # touched but the same contents - record the new mtime so it isn't hashed again
+                if manifest[1] != signature.get_mtime():
+                    self.sql_manifest_update(
+                        data_schema, source_path, signature.get_size(), signature.get_mtime(), signature.get_hash()
+                    )
+
+                file_list.remove(file_list_table)
+                skipped_files += 1
+            else:
+                # hash before loading so a file changed mid load is caught on the next run
+                signature.get_hash()
+                self.__source_signatures[source_path] = signature
+
+        if skipped_files > 0:
+            print(f'  {skipped_files:,} unchanged file{"" if skipped_files == 1 else "s"} skipped')
+
+    def __insert_into_statements(
+        self, data_schema: str, table_name: str, sql_row: str, create_sql_schema: bool = True, conflict: str = ''
+    ):
+        """ Makes insert into statements, conflict is an optional on conflict clause """
 
         try:
             # sql_[data_type] schema
-            sql_insert = f'insert into {data_schema}.{table_name} values ({sql_row});'
-            if create_sql_schema:
+            sql_insert = f'insert into {data_schema}.{table_name} values ({sql_row}){conflict};'
+            if create_sql_schema and self.__journal_mode == 'sql':
+                journal_table = f'{self.__journal_schema(data_schema)}.{table_name}'
+                sql_data = f'insert into {journal_table} values ({sql_row}){conflict};'.replace("'", "''")
                 self.sql_queue_exec(
                     f"""insert into {self._sql_schema + data_schema}.{table_name}
-                        (sorting, data) VALUES (3, {0});""".format(sql_insert.replace("'", "''"))
+                        (sorting, data) VALUES (3, '{sql_data}');"""
                 )
 
             # data schema
@@ -1075,6 +1862,252 @@ class DataPipeline(PgSql):
             self.__error_log.error(sql_insert)
             raise error
 
+    def __journal_schema(self, data_schema: str) -> str:
+        """ Schema named in journal statements, a staging load journals the schema it's swapped in as """
+
+        if self.__staging:
+            return data_schema[len(self._stage_schema) :]
+
+        return data_schema
+
+    def __journal_rows_flush(self, data_schema: str, table_name: str):
+        """ Writes the batched journal rows as a compressed copy text block """
+
+        if len(self.__journal_rows) == 0:
+            return
+
+        self.__journal_sequence += 1
+        self.sql_journal_block(
+            data_schema,
+            table_name,
+            self.__journal_sequence,
+            'copy',
+            len(self.__journal_rows),
+            CopyTextEncoder(self.__encoding, self.__copy_sanitizer).encode_rows(self.__journal_rows),
+        )
+
+        self.__journal_rows.clear()
+
+    def __key_range_arguments(
+        self,
+        source_database: str,
+        schema_name: str,
+        table_name: str,
+        data_schema: str,
+        key_ranges: list,
+        fetch_size: int,
+        snapshot_queue=None,
+    ) -> list:
+        """ Returns the __etl_key_range arguments of each key range """
+
+        return [
+            (
+                source_database,
+                table_name,
+                data_schema,
+                schema_name,
+                range_where,
+                range_parameters,
+                # sequence 1 is the drop & create block
+                range_index * 10000000 + 1,
+                fetch_size,
+                snapshot_queue,
+            )
+            for range_index, (range_where, range_parameters) in enumerate(key_ranges)
+        ]
+
+    def __key_ranges(
+        self,
+        source_type: str,
+        source_cursor,
+        schema_name: str,
+        table_name: str,
+        split_ranges: int,
+        split_columns: dict = None,
+    ) -> list:
+        """ Returns the (where, parameters) of each key range of a source table, empty when it can't be split
+
+            split_columns - {table_name: column} overrides the single column numeric or date primary key
+        """
+
+        # primary key columns & their split type
+        if source_type == 'mysql':
+            source_cursor.execute(
+                f"""
+                    select lower(column_name), column_key = 'PRI', data_type in (
+                        'tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'decimal', 'date', 'datetime', 'timestamp'
+                    )
+                    from information_schema.columns
+                    where table_schema = '{schema_name}' and table_name = '{table_name}'
+                    order by ordinal_position;"""
+            )
+        elif source_type == 'mssql':
+            source_cursor.execute(
+                f"""
+                    select
+                        lower(columns.[name]),
+                        case when index_columns.column_id is null then 0 else 1 end,
+                        case when lower(types.[name]) in (
+                            'tinyint', 'smallint', 'int', 'bigint', 'decimal', 'numeric',
+                            'date', 'datetime', 'datetime2', 'smalldatetime'
+                        ) then 1 else 0 end
+                    from
+                        sys.columns
+                            inner join sys.types on columns.user_type_id = types.user_type_id
+                            left outer join sys.indexes on columns.object_id = indexes.object_id and indexes.is_primary_key = 1
+                            left outer join sys.index_columns on indexes.object_id = index_columns.object_id
+                                and indexes.index_id = index_columns.index_id and columns.column_id = index_columns.column_id
+                    where
+                        columns.object_id = object_id('{schema_name}.{table_name}')
+                    order by
+                        columns.column_id;"""
+            )
+        else:
+            raise ValueError(f'source_type has no key range support: {source_type}')
+
+        columns = source_cursor.fetchall()
+        primary_key = [column for column in columns if column[1] == 1]
+
+        # configured column, else a single column numeric or date primary key
+        split_column = (split_columns or {}).get(table_name, '')
+        if split_column == '':
+            if len(primary_key) != 1 or primary_key[0][2] != 1:
+                return []
+            split_column = primary_key[0][0]
+
+        # boundaries from the source statistics histogram, else evenly spaced between the minimum & maximum
+        boundaries = self.__key_range_histogram(
+            source_type, source_cursor, schema_name, table_name, split_column, split_ranges
+        )
+        if len(boundaries) == 0:
+            source_cursor.execute(f'select min({split_column}), max({split_column}) from {schema_name}.{table_name};')
+            minimum, maximum = source_cursor.fetchone()
+
+            if minimum is None or minimum == maximum:
+                return []
+
+            for range_index in range(1, split_ranges):
+                if isinstance(minimum, int):
+                    boundaries.append(minimum + (maximum - minimum) * range_index // split_ranges)
+                else:
+                    boundaries.append(minimum + (maximum - minimum) * range_index / split_ranges)
+
+        # ascending & distinct, a boundary at the minimum would only make an empty range
+        boundaries = sorted(set(boundaries))
+
+        if len(boundaries) == 0:
+            return []
+
+        # first range takes the nulls, last range is open so rows past the maximum are still loaded
+        key_ranges = [(f'{split_column} < %s or {split_column} is null', (boundaries[0],))]
+        for lower, upper in zip(boundaries, boundaries[1:]):
+            key_ranges.append((f'{split_column} >= %s and {split_column} < %s', (lower, upper)))
+        key_ranges.append((f'{split_column} >= %s', (boundaries[-1],)))
+
+        return key_ranges
+
+    def __key_range_histogram(
+        self, source_type: str, source_cursor, schema_name: str, table_name: str, split_column: str, split_ranges: int
+    ) -> list:
+        """ Returns the split_ranges - 1 boundaries from a column's histogram, empty when it has none """
+
+        # (upper value, cumulative fraction of rows) per histogram step
+        steps = []
+
+        if source_type == 'mysql':
+            # mysql 8 histograms - analyze table ... update histogram on column
+            source_cursor.execute(
+                f"""
+                    select histogram
+                    from information_schema.column_statistics
+                    where schema_name = '{schema_name}' and table_name = '{table_name}' and column_name = '{split_column}';"""
+            )
+            histogram = source_cursor.fetchone()
+
+            if histogram is not None:
+                # equi-height [lower, upper, cumulative, distinct] & singleton [value, cumulative] buckets
+                for bucket in json.loads(histogram[0])['buckets']:
+                    steps.append((bucket[1], bucket[2]) if len(bucket) == 4 else (bucket[0], bucket[1]))
+        else:
+            # first statistics object leading with the column
+            source_cursor.execute(
+                f"""
+                    select histogram.range_high_key, histogram.range_rows + histogram.equal_rows
+                    from
+                        sys.stats
+                            inner join sys.stats_columns on stats.object_id = stats_columns.object_id
+                                and stats.stats_id = stats_columns.stats_id and stats_columns.stats_column_id = 1
+                            inner join sys.columns on stats_columns.object_id = columns.object_id
+                                and stats_columns.column_id = columns.column_id
+                            cross apply sys.dm_db_stats_histogram(stats.object_id, stats.stats_id) as histogram
+                    where
+                        stats.object_id = object_id('{schema_name}.{table_name}')
+                        and lower(columns.[name]) = '{split_column}'
+                        and stats.stats_id = (
+                            select min(leading_columns.stats_id)
+                            from sys.stats_columns as leading_columns
+                            where leading_columns.object_id = stats.object_id
+                                and leading_columns.column_id = columns.column_id and leading_columns.stats_column_id = 1
+                        )
+                    order by
+                        histogram.step_number;"""
+            )
+            histogram = source_cursor.fetchall()
+            total_rows = sum(step[1] for step in histogram)
+
+            cumulative_rows = 0
+            for step in histogram if total_rows > 0 else []:
+                cumulative_rows += step[1]
+                steps.append((step[0], cumulative_rows / total_rows))
+
+        # first step reaching each fraction of the rows
+        boundaries = []
+        for range_index in range(1, split_ranges):
+            for upper_value, cumulative_fraction in steps:
+                if cumulative_fraction >= range_index / split_ranges:
+                    boundaries.append(upper_value)
+                    break
+
+        return boundaries
+
+    def __key_range_snapshots(self, lock_reader: MySqlReader, snapshot_queue, futures: list):
+        """ Unlocks the mysql tables once every key range has started its snapshot (or a range failed) """
+
+        started_count = 0
+        while started_count < len(futures):
+            try:
+                snapshot_queue.get(timeout=1)
+                started_count += 1
+            except queue.Empty:
+                # a range failed before its snapshot started, its error is raised as the results are gathered
+                if any(future.done() and future.exception() is not None for future in futures):
+                    break
+
+        lock_reader.unlock_tables()
+
+    def __load_source_rows(
+        self, table_source, data_schema: str, table_name: str, create_sql_schema: bool = True
+    ) -> int:
+        """ Queues the rows of a source reader's batches after its columns, returns the table row count """
+
+        for row_batch in table_source:
+            # rows the columns don't fit - the table is altered first
+            if isinstance(row_batch, ColumnChanges):
+                self.__source_columns_changed(data_schema, table_name, row_batch)
+                continue
+
+            # column batches go into the copy batch by column
+            if isinstance(row_batch, ColumnBatch):
+                self.__queue_column_batch(data_schema, table_name, row_batch, create_sql_schema)
+                continue
+
+            for row_values in row_batch:
+                # queue row values
+                self.__queue_row(data_schema, table_name, row_values, create_sql_schema)
+
+        # load anything left in the batch & queue
+        return self.__end_table_rows(data_schema, table_name, create_sql_schema)
+
     def __modify_column_name(self, column: str) -> str:
         """ Adds an underscore after the column name if it's a reserved keyword in postgresql """
 
@@ -1086,6 +2119,334 @@ class DataPipeline(PgSql):
 
         return column
 
+    def __overflow_rows(self, data_schema: str, overflow_tables: list):
+        """ Yields the source rows of the overflow tables in row_id order, read a copy batch at a time """
+
+        for overflow_table in overflow_tables:
+            last_row_id = -1
+
+            while True:
+                overflow_batch = self.sql_all_records(
+                    f"""
+                        select row_id, row_values
+                        from {data_schema}.{overflow_table}
+                        where row_id > {last_row_id}
+                        order by row_id
+                        limit {self.__copy_batch_size};"""
+                )
+
+                if len(overflow_batch) == 0:
+                    break
+
+                # jsonb arrays come back as lists
+                for _, row_values in overflow_batch:
+                    yield row_values
+
+                last_row_id = overflow_batch[-1][0]
+
+    def __primary_key_clause(self, watermark: dict) -> str:
+        """ Returns the primary key clause for create table when loading incrementally """
+
+        if watermark is None or len(watermark['primary_key']) == 0:
+            return ''
+
+        return f", primary key ({', '.join(watermark['primary_key'])})"
+
+    def __print_bulk_stats(self):
+        """ Prints the unlogged load & set logged timings of a bulk load, then resets them """
+
+        if self.__bulk_stats['tables'] > 0:
+            print(
+                f"Bulk load: {self.__bulk_stats['tables']:,} unlogged tables loaded in "
+                f"{self.__bulk_stats['unlogged_seconds']:,.1f} seconds, "
+                f"set logged in {self.__bulk_stats['logged_seconds']:,.1f} seconds"
+            )
+
+        self.__bulk_stats = {'tables': 0, 'unlogged_seconds': 0.0, 'logged_seconds': 0.0}
+
+    def __print_empty_tables(self):
+        """ Prints the 0 record tables that were never created, then resets them """
+
+        if len(self.__empty_tables) > 0:
+            print(f"Skipped {len(self.__empty_tables):,} empty tables: {', '.join(sorted(self.__empty_tables))}")
+
+        self.__empty_tables.clear()
+
+    def __print_spreadsheet_summary(
+        self,
+        work_sheets: dict,
+        path: str,
+        table_count: int,
+        row_count: int,
+        seconds: float,
+        table_seconds: float,
+        workers: int,
+    ):
+        """ Prints the tables, files, rows & throughput of a spreadsheet load, with workers the parallel speed up
+            (the table times added up over the load time)
+        """
+
+        source_bytes = sum(os.path.getsize(os.path.join(path, file_list_table)) for file_list_table in work_sheets)
+        seconds = max(seconds, 0.001)
+
+        print(
+            f"Loaded {table_count - len(self.__empty_tables):,} tables from {len(work_sheets):,} files: "
+            f"{row_count:,} rows ({row_count / seconds:,.0f} rows/sec, {source_bytes / 1048576 / seconds:,.1f} MB/sec"
+            + (f", {workers} workers {table_seconds / seconds:,.1f}x speed up)" if workers > 1 else ")")
+        )
+
+    def __queue_column_batch(
+        self, data_schema: str, table_name: str, column_batch: ColumnBatch, create_sql_schema: bool = True
+    ):
+        """ Queues a ColumnBatch into the copy batch a slice at a time, rows are only built for insert into
+            statements & the compressed journal rows
+        """
+
+        if self.__load_mode == 'insert' or (
+            create_sql_schema and self.__journal_mode == 'compressed' and self.__load_mode != 'copy'
+        ):
+            for row_values in column_batch:
+                self.__queue_row(data_schema, table_name, row_values, create_sql_schema)
+            return
+
+        # first row - the table is created now
+        if self.__pending_table is not None:
+            self.__table_create_pending()
+
+        # the copy batch holds the table's columns from its first batch
+        if len(self.__copy_rows) == 0:
+            self.__copy_rows = ColumnBatch(column_batch.get_column_kinds())
+
+        batch_start = 0
+        while batch_start < len(column_batch):
+            batch_end = batch_start + self.__copy_batch_size - len(self.__copy_rows)
+            self.__copy_rows.extend(column_batch, batch_start, batch_end)
+            self.__row_count += min(batch_end, len(column_batch)) - batch_start
+            batch_start = batch_end
+
+            if len(self.__copy_rows) >= self.__copy_batch_size:
+                self.__copy_rows_flush(data_schema, table_name, create_sql_schema)
+
+    def __queue_row(self, data_schema: str, table_name: str, row_values: list, create_sql_schema: bool = True):
+        """ Queues a row as an insert into statement or into the copy batch """
+
+        # first row - the table is created now
+        if self.__pending_table is not None:
+            self.__table_create_pending()
+
+        self.__row_count += 1
+
+        # compressed journal - copy text mode reuses its own payload instead
+        if create_sql_schema and self.__journal_mode == 'compressed' and self.__load_mode != 'copy':
+            self.__journal_rows.append(row_values)
+
+            if len(self.__journal_rows) >= self.__copy_batch_size:
+                self.__journal_rows_flush(data_schema, table_name)
+
+        # insert into statements
+        if self.__load_mode == 'insert':
+            self.__insert_into_statements(data_schema, table_name, self.__sql_row_values(row_values), create_sql_schema)
+
+        # copy from stdin
+        else:
+            # the copy batch holds rows again after a table read as column batches
+            if isinstance(self.__copy_rows, ColumnBatch) and len(self.__copy_rows) == 0:
+                self.__copy_rows = ArrayList()
+
+            self.__copy_rows.append(row_values)
+
+            if len(self.__copy_rows) >= self.__copy_batch_size:
+                self.__copy_rows_flush(data_schema, table_name, create_sql_schema)
+
+    def __set_load_options(self, load_mode: str, journal_mode: str):
+        """ Sets the load & journal modes for the current etl call
+
+            load_mode - insert, copy (text format) or copy_binary (binary format)
+            journal_mode - sql (sql_[data_type] tables), compressed (sys.journal blocks) or none
+        """
+
+        if load_mode not in self.__load_modes:
+            raise ValueError(f'load_mode must be one of {self.__load_modes}: {load_mode}')
+        if journal_mode not in self.__journal_modes:
+            raise ValueError(f'journal_mode must be one of {self.__journal_modes}: {journal_mode}')
+
+        self.__load_mode = load_mode
+        self.__journal_mode = journal_mode
+        self.__copy_rows.clear()
+        self.__journal_rows.clear()
+        self.__copy_encoder = None
+        self.__row_count = 0
+        self.__lazy_create = False
+        self.__pending_table = None
+        self.__empty_tables.clear()
+        self.__staging = False
+
+    def __source_loaded(self, path: str, file_list_table: str, data_schema: str):
+        """ Records the signature taken before the load of a source file in sys.manifest """
+
+        source_path = os.path.join(path, file_list_table)
+        signature = self.__source_signatures.pop(source_path, None)
+
+        if signature is None:
+            signature = FileSignature(source_path)
+
+        self.sql_manifest_update(
+            data_schema, source_path, signature.get_size(), signature.get_mtime(), signature.get_hash()
+        )
+
+    def __source_columns_changed(self, data_schema: str, table_name: str, column_changes: ColumnChanges):
+        """ Adds or widens the columns of rows a source's columns don't fit, journaled after the create table """
+
+        # the table of a lazy create is altered once it exists
+        if self.__pending_table is not None:
+            self.__table_create_pending()
+
+        # rows batched before the change are loaded first, copy binary picks its encoder again
+        self.__copy_rows_flush(data_schema, table_name)
+        self.__journal_rows_flush(data_schema, table_name)
+        self.__copy_encoder = None
+
+        sql_alter = f"alter table {data_schema}.{table_name} {', '.join(column_changes)};"
+        journal_alter = f"alter table {self.__journal_schema(data_schema)}.{table_name} {', '.join(column_changes)};"
+
+        # compressed journal - a sql block between the copy blocks
+        if self.__journal_mode == 'compressed':
+            self.__journal_sequence += 1
+            self.sql_journal_block(
+                data_schema, table_name, self.__journal_sequence, 'sql', 0, journal_alter.encode(self.__encoding)
+            )
+        # sql_[data_type] schema - replayed with the create table, before every row
+        elif self.__journal_mode == 'sql':
+            self.sql_queue_exec(
+                f"""
+                    insert into {self._sql_schema + data_schema}.{table_name}
+                    (sorting, data) values (2, '{journal_alter.replace("'", "''")}');"""
+            )
+
+        self.sql_queue_exec(sql_alter, execute=True)
+
+    def __source_table_setup(
+        self,
+        data_schema: str,
+        table_name: str,
+        columns: list,
+        create_sql_schema: bool = True,
+        primary_key: str = '',
+        modify_names: bool = True,
+    ):
+        """ Queues the drop & create table statements for a source reader's columns """
+
+        # queue drop table statements
+        sql_drop = self.__drop_table_statements(data_schema, table_name, create_sql_schema)
+
+        # create table string - data schema, column names are made valid unless the source already did
+        sql_create = f'create table if not exists {data_schema}.{table_name}('
+        sql_create += ', '.join(
+            f'"{self.__modify_column_name(column_name) if modify_names else column_name}" {column_type}'
+            for column_name, column_type in columns
+        )
+        sql_create += primary_key + ');'
+
+        # queue create table statements
+        self.__table_setup(data_schema, table_name, sql_drop, sql_create, create_sql_schema, primary_key)
+
+    def __spreadsheet_reader(
+        self,
+        path: str,
+        file_list_table: str,
+        delimiter_char: str,
+        header_line: int = 1,
+        bottom_lines_skipped: int = 0,
+        type_sample_rows: int = 1000,
+    ) -> SpreadsheetReader:
+        """ Opens a workbook's reader, csv & tsv files can be read in chunks """
+
+        reader_class = CsvReader if file_list_table.lower().endswith(('.csv', '.tsv')) else SpreadsheetReader
+
+        return reader_class(
+            os.path.join(path, file_list_table),
+            self.__encoding,
+            delimiter_char,
+            header_line,
+            bottom_lines_skipped,
+            type_sample_rows,
+            self.__source_batch_size,
+        )
+
+    def __spreadsheet_work_sheets(
+        self,
+        path: str,
+        file_list: ArrayList,
+        file_table_name: bool,
+        sheet_table_name: bool,
+        delimiter_char: str,
+        exclude_tables: ArrayList,
+    ) -> dict:
+        """ Returns each file's (work sheet, table name) list, raises ValueError when sheets share a table name """
+
+        work_sheets = {}
+        table_sources = {}
+
+        for file_list_table in file_list:
+            # get list of work_sheets and remove any from exclude_tables
+            with self.__spreadsheet_reader(path, file_list_table, delimiter_char) as spreadsheet_reader:
+                sheet_names = ArrayList(spreadsheet_reader.tables())
+
+            if isinstance(exclude_tables, list):
+                for table_name in exclude_tables:
+                    sheet_names.remove(table_name)
+            else:
+                sheet_names.remove(exclude_tables)
+
+            work_sheets[file_list_table] = []
+
+            for work_sheet in sheet_names:
+                # get table_name from file and/or sheet
+                table_name = ""
+                if file_table_name:
+                    table_name = re.sub(
+                        "\\W+",
+                        "_",
+                        os.path.splitext(file_list_table)[0].lower() + f"{'_' if sheet_table_name else ''}",
+                    )
+                # set table_name from sheet_name regardless
+                else:
+                    table_name = re.sub("\\W+", "_", work_sheet.lower())
+
+                work_sheets[file_list_table].append((work_sheet, table_name))
+                table_sources.setdefault(table_name, []).append(f"{file_list_table} ({work_sheet})")
+
+        # the later sheet would drop & replace the earlier one's table
+        collisions = [
+            f"{table_name}: {', '.join(sources)}" for table_name, sources in table_sources.items() if len(sources) > 1
+        ]
+        if len(collisions) > 0:
+            raise ValueError(f"work sheets load into the same table, check file_table_name: {'; '.join(collisions)}")
+
+        return work_sheets
+
+    def __sql_row_values(self, row_values: list) -> str:
+        """ Returns the values of a row formatted for an insert into statement """
+
+        sql_row = ''
+        # columns from each row
+        for column in row_values:
+            # nulls
+            if column is None:
+                sql_row += 'null, '
+            # numbers & boolean
+            elif isinstance(column, (bool, int, float, decimal.Decimal)):
+                sql_row += f'{column}, '
+            # bytes
+            elif isinstance(column, bytes):
+                sql_row += f'{self.__transform_byte_data(column)}, '
+            # strings & dates
+            else:
+                sql_row += f"E'{self.__transform_string_data(str(column))}', "
+
+        # remove last comma and space
+        return sql_row.rstrip(', ')
+
     def __sql_schema_create(self, schema: str, table: str) -> str:
         """ Returns create table sql statement for sql_data_schema.table_name """
 
@@ -1098,21 +2459,99 @@ class DataPipeline(PgSql):
     def __sql_table_setup(self, data_schema: str, table_name: str, sql_drop: str, sql_create: str):
         """ Insert into sql_[data_schema] drop & create, delayed until sql_[data_type].table is setup """
 
+        # staging - the journal names the schema the staging schema is swapped in as
+        if self.__staging:
+            journal_table = f'{self.__journal_schema(data_schema)}.{table_name}'
+            sql_drop = sql_drop.replace(f'{data_schema}.{table_name}', journal_table, 1)
+            sql_create = sql_create.replace(f'{data_schema}.{table_name}', journal_table, 1)
+
+        # compressed journal - drop & create are the first block of the table
+        if self.__journal_mode == 'compressed':
+            self.__journal_sequence = 1
+            self.sql_journal_block(
+                data_schema, table_name, self.__journal_sequence, 'sql', 0, f'{sql_drop}\n{sql_create}'.encode(self.__encoding)
+            )
+            return
+
+        # no journal - only execute the drop & create statements
+        if self.__journal_mode == 'none':
+            self.sql_queue_exec(execute=True)
+            return
+
+        sql_drop = sql_drop.replace("'", "''")
+        sql_create = sql_create.replace("'", "''")
+
         # sql drop
         self.sql_queue_exec(
             f"""
                 insert into {self._sql_schema + data_schema}.{table_name}
-                (sorting, data) values (1, '{0}');""".format(sql_drop.replace("'", "''"))
+                (sorting, data) values (1, '{sql_drop}');"""
         )
 
         # sql create
         self.sql_queue_exec(
             f"""
                 insert into {self._sql_schema + data_schema}.{table_name}
-                (sorting, data) values (2, '{0}');""".format(sql_create.replace("'", "''")),
+                (sorting, data) values (2, '{sql_create}');""",
             execute=True,
         )
 
+    def __staging_schema(self, data_schema: str, staging: bool, partial_load: bool) -> str:
+        """ Returns the schema an etl call loads into, an emptied stage_[data_schema] when staging """
+
+        self.__staging = staging
+
+        if not staging:
+            return data_schema
+
+        # the swap replaces every table of the schema
+        if partial_load:
+            raise ValueError('staging replaces the whole schema: not with incremental, a single file or table')
+
+        # a failed staging load's tables & journal blocks
+        stage_schema = self._stage_schema + data_schema
+        self.drop_schema(stage_schema)
+        self.drop_schema(self._sql_schema + stage_schema)
+        self.sql_journal_delete(stage_schema)
+        self.sql_queue_exec(execute=True)
+
+        return stage_schema
+
+    def __table_create_pending(self):
+        """ Creates the table held back by __table_setup """
+
+        data_schema, table_name, sql_drop, sql_create, create_sql_schema, primary_key = self.__pending_table
+        self.__pending_table = None
+
+        # queue create table statements
+        self.__create_table_statements(data_schema, table_name, sql_create, create_sql_schema, primary_key)
+
+        # write drop & create statments after sql_[data_type].table is setup
+        if create_sql_schema:
+            self.__sql_table_setup(data_schema, table_name, sql_drop, sql_create)
+
+    def __table_loaded(self, data_schema: str, table_name: str):
+        """ Records a table created or changed by this run for __vacuum_loaded_tables """
+
+        if not self.__loaded_tables.exists(f'{data_schema}.{table_name}'):
+            self.__loaded_tables.append(f'{data_schema}.{table_name}')
+
+    def __table_setup(
+        self,
+        data_schema: str,
+        table_name: str,
+        sql_drop: str,
+        sql_create: str,
+        create_sql_schema: bool = True,
+        primary_key: str = '',
+    ):
+        """ Creates the table & its journal, held back until the first row when 0 record tables aren't kept """
+
+        self.__pending_table = (data_schema, table_name, sql_drop, sql_create, create_sql_schema, primary_key)
+
+        if not self.__lazy_create:
+            self.__table_create_pending()
+
     def __transform_byte_data(self, byte_data: bytes) -> str:
         """ ETL - Formats byte data for postgresql """
 
@@ -1122,77 +2561,187 @@ class DataPipeline(PgSql):
     def __transform_string_data(self, str_data: str) -> str:
         """ ETL - Formats string data for postgresql """
 
-        # Remove spaces
-        str_data = str_data.rstrip()
+        # removes trailing spaces & invalid characters, escapes backslashes & single quotes
+        return self.__insert_sanitizer.sanitize(str_data)
 
-        # remove hexadecimal values - 20 thru 7E are valid
-        str_data = re.sub(
-            r'\x00|\x01|\x02|\x03|\x04|\x05|\x06|\x07|\x08|\x0B|\x0C|\x0E|\x0F',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        # str_data = re.sub(r'\x09', '\t', str_data, flags=re.IGNORECASE)       # tab
-        # str_data = re.sub(r'\x0A', '\n', str_data, flags=re.IGNORECASE)       # newline / line feed
-        # str_data = re.sub(r'\x0D', '\r', str_data, flags=re.IGNORECASE)       # carriage return
-        str_data = re.sub(
-            r'\x10|\x11|\x12|\x13|\x14|\x15|\x16|\x17|\x18|\x19|\x1A|\x1B|\x1C|\x1D|\x1E|\x1F',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(r'\x5C', '\\\\\\\\', str_data, flags=re.IGNORECASE)   # backslash
-        str_data = re.sub(r'\x7F', '', str_data, flags=re.IGNORECASE)           # delete
-        str_data = re.sub(
-            r'\x80|\x81|\x82|\x83|\x84|\x85|\x86|\x87|\x88|\x89|\x8A|\x8B|\x8C|\x8D|\x8E|\x8F',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(
-            r'\x90|\x91|\x92|\x93|\x94|\x95|\x96|\x97|\x98|\x99|\x9A|\x9B|\x9C|\x9D|\x9E|\x9F',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(
-            r'\xA0|\xA1|\xA2|\xA3|\xA4|\xA5|\xA6|\xA7|\xA8|\xA9|\xAA|\xAB|\xAC|\xAD|\xAE|\xAF',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(
-            r'\xB0|\xB1|\xB2|\xB3|\xB4|\xB5|\xB6|\xB7|\xB8|\xB9|\xBA|\xBB|\xBC|\xBD|\xBE|\xBF',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(
-            r'\xC0|\xC1|\xC2|\xC3|\xC4|\xC5|\xC6|\xC7|\xC8|\xC9|\xCA|\xCB|\xCC|\xCD|\xCE|\xCF',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(
-            r'\xD0|\xD1|\xD2|\xD3|\xD4|\xD5|\xD6|\xD7|\xD8|\xD9|\xDA|\xDB|\xDC|\xDD|\xDE|\xDF',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(
-            r'\xE0|\xE1|\xE2|\xE3|\xE4|\xE5|\xE6|\xE7|\xE8|\xE9|\xEA|\xEB|\xEC|\xED|\xEE|\xEF',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
-        str_data = re.sub(
-            r'\xF0|\xF1|\xF2|\xF3|\xF4|\xF5|\xF6|\xF7|\xF8|\xF9|\xFA|\xFB|\xFC|\xFD|\xFE|\xFF',
-            '',
-            str_data,
-            flags=re.IGNORECASE,
-        )
+    def __vacuum_loaded_tables(self):
+        """ Vacuums & analyzes only the tables this run loaded, frozen when bulk loaded """
+
+        # tables loaded by process pool workers come back with their results
+        self.sql_vacuum(tables=ArrayList(self.__loaded_tables), workers=self.__vacuum_workers, freeze=self.__bulk_load)
+
+        self.__loaded_tables.clear()
+
+    def __watermark_loaded(self, data_schema: str, table_name: str, watermark: dict):
+        """ Records the maximum watermark read before the load in sys.watermark """
 
-        # replace single quote with two quotes - quote escaping for postgresql
-        str_data = str_data.replace("'", "''")
+        if watermark['column'] == '' or len(watermark['primary_key']) == 0 or watermark['new'] is None:
+            return
 
-        return str_data
+        # types that can be rebuilt from text for the next run's where clause
+        new_watermark = watermark['new']
+        if isinstance(new_watermark, (bytes, bytearray)):
+            watermark_type, watermark_value = 'binary', bytes(new_watermark).hex()
+        elif isinstance(new_watermark, datetime):
+            watermark_type, watermark_value = 'datetime', new_watermark.isoformat()
+        elif isinstance(new_watermark, date):
+            watermark_type, watermark_value = 'date', new_watermark.isoformat()
+        elif isinstance(new_watermark, int):
+            watermark_type, watermark_value = 'integer', str(new_watermark)
+        elif isinstance(new_watermark, decimal.Decimal):
+            watermark_type, watermark_value = 'numeric', str(new_watermark)
+        else:
+            watermark_type, watermark_value = 'text', str(new_watermark)
+
+        self.sql_watermark_update(data_schema, table_name, watermark['column'], watermark_type, watermark_value)
+
+    def __watermark_setup(
+        self,
+        source_type: str,
+        source_cursor,
+        schema_name: str,
+        table_name: str,
+        data_schema: str,
+        watermark_columns: dict = None,
+    ) -> dict:
+        """ Returns the primary key, watermark column, last loaded & current maximum watermark of a source table
+
+            watermark_columns - {table_name: column} overrides the detected rowversion, on update timestamp
+                or identity (auto_increment) column
+            last is None when the table needs a full load
+        """
+
+        # primary key & detected watermark columns
+        if source_type == 'mysql':
+            source_cursor.execute(
+                f"""
+                    select lower(column_name), column_key, lower(extra)
+                    from information_schema.columns
+                    where table_schema = '{schema_name}' and table_name = '{table_name}'
+                    order by ordinal_position;"""
+            )
+            # (column_name, primary key, on update timestamp, auto_increment)
+            columns = [
+                (column[0], column[1] == 'PRI', 'on update' in column[2], 'auto_increment' in column[2])
+                for column in source_cursor.fetchall()
+            ]
+        elif source_type == 'mssql':
+            source_cursor.execute(
+                f"""
+                    select
+                        lower(columns.[name]),
+                        case when index_columns.column_id is null then 0 else 1 end,
+                        case when lower(types.[name]) in ('rowversion', 'timestamp') then 1 else 0 end,
+                        columns.is_identity
+                    from
+                        sys.columns
+                            inner join sys.types on columns.user_type_id = types.user_type_id
+                            left outer join sys.indexes on columns.object_id = indexes.object_id and indexes.is_primary_key = 1
+                            left outer join sys.index_columns on indexes.object_id = index_columns.object_id
+                                and indexes.index_id = index_columns.index_id and columns.column_id = index_columns.column_id
+                    where
+                        columns.object_id = object_id('{schema_name}.{table_name}')
+                    order by
+                        columns.column_id;"""
+            )
+            # (column_name, primary key, rowversion, identity)
+            columns = [(column[0], column[1] == 1, column[2] == 1, column[3] == 1) for column in source_cursor.fetchall()]
+        else:
+            raise ValueError(f'source_type has no watermark support: {source_type}')
+
+        primary_key = ArrayList(self.__modify_column_name(column[0]) for column in columns if column[1])
+
+        # configured column, else rowversion or on update timestamp, else identity
+        watermark_column = (watermark_columns or {}).get(table_name, '')
+        if watermark_column == '':
+            detected_columns = [column[0] for column in columns if column[2]] + [column[0] for column in columns if column[3]]
+            watermark_column = detected_columns[0] if detected_columns else ''
+
+        watermark = {'primary_key': primary_key, 'column': watermark_column, 'last': None, 'new': None}
+
+        # no watermark or no primary key to upsert on - always a full load
+        if watermark_column == '' or len(primary_key) == 0:
+            return watermark
+
+        # maximum read before the extract, rows changed during the load are picked up by the next run
+        source_cursor.execute(f'select max({watermark_column}) from {schema_name}.{table_name};')
+        watermark['new'] = source_cursor.fetchone()[0]
+
+        # previous load with the same watermark column & a matching primary key in postgresql
+        last_watermark = self.sql_watermark_get(data_schema, table_name)
+        if (
+            last_watermark is not None
+            and last_watermark[0] == watermark_column
+            and sorted(self.sql_primary_key(data_schema, table_name)) == sorted(primary_key)
+        ):
+            watermark['last'] = self.__watermark_value(last_watermark[1], last_watermark[2])
+
+        return watermark
+
+    def __watermark_value(self, watermark_type: str, watermark_value: str):
+        """ Returns the sys.watermark text as the python type of the source column """
+
+        if watermark_type == 'binary':
+            return bytes.fromhex(watermark_value)
+        elif watermark_type == 'datetime':
+            return datetime.fromisoformat(watermark_value)
+        elif watermark_type == 'date':
+            return date.fromisoformat(watermark_value)
+        elif watermark_type == 'integer':
+            return int(watermark_value)
+        elif watermark_type == 'numeric':
+            return decimal.Decimal(watermark_value)
+
+        return watermark_value
+
+
+# process pool worker - one DataPipeline per worker process, its connections (pg & dataflex odbc) are reused by
+# its tables & closed by the pool's close tasks
+_worker_arguments = ()
+_worker_close_barrier = None
+_worker_pipeline = None
+
+def _close_table_worker():
+    """ Closes the worker process DataPipeline & its pg connections, then waits for the pool's other workers """
+
+    global _worker_pipeline
+    if _worker_pipeline is not None:
+        _worker_pipeline.close()
+        _worker_pipeline = None
+    PG_CONNECTION_POOL.close_all()
+
+    _worker_close_barrier.wait()
+
+def _init_table_worker(
+    database: str,
+    connection: str,
+    sql_queue_count: int,
+    copy_batch_size: int,
+    adaptive_queue: bool,
+    bulk_load: bool,
+    close_barrier,
+):
+    """ Creates the worker process DataPipeline with its own pg connection """
+
+    global _worker_arguments, _worker_close_barrier, _worker_pipeline
+    _worker_arguments = (database, connection, sql_queue_count, copy_batch_size, adaptive_queue, bulk_load)
+    _worker_close_barrier = close_barrier
+    _worker_pipeline = DataPipeline(*_worker_arguments)
+
+def _run_table_worker(
+    source_type: str, load_mode: str, journal_mode: str, lazy_create: bool, staging: bool, table_arguments: tuple
+) -> dict:
+    """ Loads a single table in the worker process """
+
+    global _worker_pipeline
+    # a table failed before - the worker's next table gets a new DataPipeline
+    if _worker_pipeline is None:
+        _worker_pipeline = DataPipeline(*_worker_arguments)
+
+    try:
+        return _worker_pipeline._etl_table(source_type, load_mode, journal_mode, lazy_create, staging, table_arguments)
+    except Exception as error:
+        # the failed table's queue & copy batch are discarded with its connections
+        _worker_pipeline.close()
+        _worker_pipeline = None
+        raise error
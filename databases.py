@@ -1,119 +1,419 @@
 """ PG SQL """
 
 # standard library imports
+import io
 import os
 import re
+import time
+import zlib
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from datetime import datetime
 
 # third party library imports
 import psycopg2
+import psycopg2.extensions
 
 # local library imports
+from copy_format import CopyTextEncoder
+from utilities import AdaptiveBatchSize
 from utilities import ArrayList
 from utilities import Timer
 from utilities import Logger
 from utilities import Toml
 
+class CopyPipe:
+    """ Bounded file-like pipe streaming a copy to stdout into a copy from stdin on another connection """
+
+    def __init__(self, chunk_size: int = 65536, max_chunks: int = 16):
+        # chunk_size - written rows are gathered into chunks of about this many bytes
+        # max_chunks - chunks waiting for the reader, the writer blocks when full (backpressure)
+
+        # constants - private
+        self.__chunk_size = chunk_size
+
+        # variables - private
+        self.__chunks = queue.Queue(maxsize=max_chunks)
+        self.__pending = bytearray()
+        self.__buffer = bytearray()
+        self.__bytes = 0
+        self.__error = None
+        self.__finished = False
+
+    # Public
+    def abort(self, error: Exception):
+        """ Fails the other side of the pipe with the error """
+
+        self.__error = error
+
+    def close(self):
+        """ Writer is done - sends what is pending & the end of data """
+
+        if self.__pending:
+            self.__put(bytes(self.__pending))
+            self.__pending.clear()
+
+        self.__put(None)
+
+    def get_bytes(self) -> int:
+        """ Returns the bytes written """
+
+        return self.__bytes
+
+    def read(self, size: int = -1) -> bytes:
+        """ Copy from stdin side - returns up to size bytes, b'' at the end of data """
+
+        while (size < 0 or len(self.__buffer) < size) and not self.__finished:
+            if self.__error is not None:
+                raise self.__error
+
+            try:
+                chunk = self.__chunks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if chunk is None:
+                self.__finished = True
+            else:
+                self.__buffer += chunk
+
+        if size < 0:
+            size = len(self.__buffer)
+
+        data = bytes(self.__buffer[:size])
+        del self.__buffer[:size]
+
+        return data
+
+    def write(self, data) -> int:
+        """ Copy to stdout side - psycopg2 writes one row at a time """
+
+        self.__pending += data
+        self.__bytes += len(data)
+
+        if len(self.__pending) >= self.__chunk_size:
+            self.__put(bytes(self.__pending))
+            self.__pending.clear()
+
+        return len(data)
+
+    # Private
+    def __put(self, chunk: bytes):
+        """ Waits for room for the chunk, raises if the reader failed """
+
+        while True:
+            if self.__error is not None:
+                raise self.__error
+
+            try:
+                self.__chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+
+class PgConnectionPool:
+    """ Thread-safe pool of autocommit pg connections keyed by (credential, database) """
+
+    def __init__(self, max_size: int = 20, health_check_seconds: int = 30, wait_seconds: int = 60):
+        # max_size - open connections (idle & in use) per credential & database
+        # health_check_seconds - idle connections older than this are tested with select 1 before reuse
+        # wait_seconds - how long get waits for a released connection when max_size are in use
+
+        # constants - private
+        self.__max_size = max_size
+        self.__health_check_seconds = health_check_seconds
+        self.__wait_seconds = wait_seconds
+
+        # variables - private
+        self.__condition = threading.Condition()
+        self.__idle_connections = {}  # key -> [(connection, idle since)]
+        self.__open_count = {}  # key -> idle & in use connections
+        self.__connection_keys = {}  # connection -> key
+
+    # Public
+    def close_all(self):
+        """ Closes the idle connections, connections in use are closed when released """
+
+        with self.__condition:
+            for key, idle_connections in self.__idle_connections.items():
+                for connection, _ in idle_connections:
+                    self.__discard(key, connection)
+            self.__idle_connections.clear()
+
+    def get(self, credential: str, credentials: dict, database: str):
+        """ Returns a healthy connection, an idle one when available or a new one under max_size """
+
+        key = (credential, database)
+
+        with self.__condition:
+            while True:
+                # most recently released first - the least likely to have gone stale
+                idle_connections = self.__idle_connections.get(key, [])
+                while idle_connections:
+                    connection, idle_since = idle_connections.pop()
+                    if self.__healthy(connection, idle_since):
+                        return connection
+                    self.__discard(key, connection)
+
+                # reserve a new connection
+                if self.__open_count.get(key, 0) < self.__max_size:
+                    self.__open_count[key] = self.__open_count.get(key, 0) + 1
+                    break
+
+                if not self.__condition.wait(self.__wait_seconds):
+                    raise TimeoutError(f'no pg connection released in {self.__wait_seconds} seconds: {key}')
+
+        # connect outside the lock so a slow server doesn't hold up the other keys
+        try:
+            connection = psycopg2.connect(
+                host=credentials['host'],
+                port=credentials['port'],
+                user=credentials['user'],
+                password=credentials['password'],
+                database=database,
+                sslmode=credentials['ssl']
+            )
+            connection.autocommit = True
+        except Exception as error:
+            with self.__condition:
+                self.__open_count[key] -= 1
+                self.__condition.notify()
+            raise error
+
+        with self.__condition:
+            self.__connection_keys[connection] = key
+
+        return connection
+
+    def release(self, connection):
+        """ Returns a connection to the pool, broken connections are closed & dropped """
+
+        with self.__condition:
+            key = self.__connection_keys.get(connection)
+
+            # not from this pool
+            if key is None:
+                if connection.closed == 0:
+                    connection.close()
+                return
+
+            reusable = connection.closed == 0
+            # anything left open in a transaction is rolled back before reuse
+            if reusable and connection.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    reusable = False
+
+            if reusable:
+                self.__idle_connections.setdefault(key, []).append((connection, time.monotonic()))
+            else:
+                self.__discard(key, connection)
+
+            self.__condition.notify()
+
+    # Private
+    def __discard(self, key: tuple, connection):
+        """ Closes a connection & frees its place in the pool """
+
+        if connection.closed == 0:
+            connection.close()
+
+        self.__connection_keys.pop(connection, None)
+        self.__open_count[key] -= 1
+        self.__condition.notify()
+
+    def __healthy(self, connection, idle_since: float) -> bool:
+        """ Returns True if the connection is open & answers select 1 after a long idle """
+
+        if connection.closed != 0:
+            return False
+
+        if time.monotonic() - idle_since < self.__health_check_seconds:
+            return True
+
+        try:
+            with connection.cursor() as health_cursor:
+                health_cursor.execute('select 1;')
+            return True
+        except psycopg2.Error:
+            return False
+
+
+# shared by every PgSql & DataPipeline in the process
+PG_CONNECTION_POOL = PgConnectionPool()
+
 class PgSql:
     """ PostgreSQL database access """
 
+    # per process - reserved keywords per credential & (credential, database) already created with sys.log
+    __keywords_cache = {}
+    __databases_ready = set()
+
     #def __init__(self, database: str, cloud: bool = False, sql_queue_count: int = 500):
-    def __init__(self, database: str, connection: str, sql_queue_count: int = 500):
+    def __init__(self, database: str, connection: str, sql_queue_count: int = 500, adaptive_queue: bool = True):
         # sql_queue_count to small ~< 100 and to big ~> 800 it becomes slower
+        # adaptive_queue tunes sql_queue_count at runtime from each batch's round trip time & throughput
 
         self.__login_info = Toml(os.path.join(os.path.dirname(__file__), 'info'), 'logins.toml')
         self.__error_log = Logger(os.path.join(os.path.dirname(__file__), 'info', 'error.log'))
 
         # constants
         # protected
+        self._login_info = self.__login_info.get()
         self._sql_schema = 'sql_'
         self._sys_schema = 'sys'
+        # staging loads & the schema a swap replaced
+        self._stage_schema = 'stage_'
+        self._previous_schema = 'previous_'
         # private
         self.__sql_string_maximum = 100000000  # larger than 230,000,000 creates a string failure
         self.__sql_variables = {}
 
-        self.__semicolon_maximum = sql_queue_count
+        self.__adaptive_queue = adaptive_queue
         self._reserved_keywords = ArrayList()
 
         # variables
         self.__pg_database = database
+        self.__connection = connection
         self.__login_credentials = self.__login_info.get(connection)
-        self.__sql_statements = ''
-        self.__semicolon_count = 0
+        # queued statements are kept as chunks & joined once when executed
+        self.__sql_chunks = []
+        self.__sql_chunks_size = 0
+        self.__batch_size = AdaptiveBatchSize(sql_queue_count, adaptive=adaptive_queue)
         self.__log_queue = ArrayList()
         self.__log_written = ArrayList()
+        self.__journal_created = False
+        self.__manifest_created = False
+        self.__watermark_created = False
+        # background schema drops, waited on by the next swap
+        self.__drop_threads = []
+
+        # connections from PG_CONNECTION_POOL, returned by close
+        self.__pg_connection = None
+        self.__pg_cursor = None
+        self.__pg_sql_connection = None
+        self.__pg_sql_cursor = None
 
         if self.__login_credentials is not None:
+            database_ready = (connection, database) in PgSql.__databases_ready
 
-            # initalize connection to postgres database
-            self.__init_pg_connection('postgres', self.__login_credentials, main_connection=False)
+            # initalize connection to postgres database - only needed for the first instance per database
+            if not database_ready or connection not in PgSql.__keywords_cache:
+                self.__init_pg_connection('postgres', self.__login_credentials, main_connection=False)
 
-            # check if database exists or not
-            self.__pg_sql_cursor.execute(f"select datname from pg_catalog.pg_database where datname = '{database}';")
-            # create database if empty rowcount
-            if self.__pg_sql_cursor.rowcount == 0:
-                self.__pg_sql_cursor.execute(f'create database "{database}";')
+            if not database_ready:
+                # check if database exists or not
+                self.__pg_sql_cursor.execute(
+                    f"select datname from pg_catalog.pg_database where datname = '{database}';"
+                )
+                # create database if empty rowcount
+                if self.__pg_sql_cursor.rowcount == 0:
+                    self.__pg_sql_cursor.execute(f'create database "{database}";')
 
             # get reserved keywords - constant
-            self.__pg_sql_cursor.execute("select word from pg_get_keywords() where catcode in ('R', 'T');")
-            for keyword in self.__pg_sql_cursor.fetchall():
-                self._reserved_keywords.append(keyword[0])
+            if connection not in PgSql.__keywords_cache:
+                self.__pg_sql_cursor.execute("select word from pg_get_keywords() where catcode in ('R', 'T');")
+                PgSql.__keywords_cache[connection] = [keyword[0] for keyword in self.__pg_sql_cursor.fetchall()]
+            self._reserved_keywords = ArrayList(PgSql.__keywords_cache[connection])
 
             # initalize connection to specified database
             self.__init_pg_connection(self.__pg_database, self.__login_credentials)
 
             # create sys.log if not exists
-            self.__create_log()
+            if not database_ready:
+                self.__create_log()
+                PgSql.__databases_ready.add((connection, database))
 
         else:
             print(f'{connection}: not in {self.__toml_settings_file} file')
 
     # Public
     def close(self):
-        """ Closes cursor & connection """
+        """ Closes cursors & returns the connections to the pool """
 
         # pg
-        self.__pg_cursor.close()
-        self.__pg_connection.close()
+        if self.__pg_connection is not None:
+            self.__pg_cursor.close()
+            PG_CONNECTION_POOL.release(self.__pg_connection)
+            self.__pg_connection = None
 
         # psql
-        self.__pg_sql_cursor.close()
-        self.__pg_sql_connection.close()
-
-    def copy(self, dest_database: str, dest_schema: str = 'wt', dest_cloud: bool = False):
-        """ Copy from source table to destination table """
-
-        """
-        # get login credentials
-        pg_server = self._login_info['cloud_pg' if dest_cloud else 'local_pg']['host']
-        pg_port = self._login_info['cloud_pg' if dest_cloud else 'local_pg']['port']
-        pg_username = self._login_info['cloud_pg' if dest_cloud else 'local_pg']['user']
-        pg_password = self._login_info['cloud_pg' if dest_cloud else 'local_pg']['password']
-        ssl = self._login_info['cloud_pg' if dest_cloud else 'local_pg']['ssl']
-
-        # create destination connection
-        self.__pg_sql_connection = psycopg2.connect(
-            host=pg_server,
-            port=pg_port,
-            user=pg_username,
-            password=pg_password,
-            database=self.__pg_default_db,
-            sslmode=ssl,
-        )
+        if self.__pg_sql_connection is not None:
+            self.__pg_sql_cursor.close()
+            PG_CONNECTION_POOL.release(self.__pg_sql_connection)
+            self.__pg_sql_connection = None
+
+    def copy(
+        self,
+        dest_database: str,
+        dest_schema: str = 'wt',
+        dest_cloud: bool = False,
+        source_schema: str = '',
+        tables: ArrayList = ArrayList(),
+        workers: int = 4,
+    ):
+        """ Copies a schema's tables to another database, streaming copy binary from source to destination
+
+            source_schema - schema in this database, dest_schema when empty
+            tables - only these tables, otherwise every table in source_schema
         """
 
-        self.__init_pg_connection('postgres', credentials, False)
+        # total timing
+        copy_timer = Timer()
 
-        # create table for destination
+        source_schema = source_schema if source_schema != '' else dest_schema
+        dest_credential = 'cloud_pg' if dest_cloud else 'local_pg'
 
-        # copy from source pg connection - using pg copy
-        with self.__pg_cursor().copy('COPY source TO STDOUT (FORMAT BINARY)') as copy1:
-            # copy to destination connection - using pg copy
-            with dest_connection.cursor().copy('COPY target FROM STDIN (FORMAT BINARY)') as copy2:
-                # loop thru source table data
-                for data in copy1:
-                    # write in destination table
-                    copy2.write(data)
+        print(f'Copying {source_schema} to {dest_database}.{dest_schema}...')
+
+        # every table in the source schema
+        if len(tables) == 0:
+            self.__pg_cursor.execute(
+                f"""select table_name
+                    from information_schema.tables
+                    where table_schema = '{source_schema}' and table_type = 'BASE TABLE'
+                    order by table_name;"""
+            )
+            tables = ArrayList(table[0] for table in self.__pg_cursor.fetchall())
+
+        # destination database, schema & tables - created from the source catalog
+        dest_pg = PgSql(dest_database, dest_credential, adaptive_queue=False)
+
+        try:
+            dest_pg.create_schema(dest_schema)
+
+            for table_name in tables:
+                dest_pg.sql_queue_exec(f'drop table if exists {dest_schema}.{table_name} cascade;')
+                dest_pg.sql_queue_exec(self.__copy_table_create(source_schema, dest_schema, table_name))
+
+            dest_pg.sql_queue_exec(execute=True)
+        finally:
+            dest_pg.close()
+
+        # thread pool - each table streams over its own source & destination connections
+        copied_bytes = 0
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            futures = [
+                pool.submit(self.__copy_table, source_schema, dest_credential, dest_database, dest_schema, table_name)
+                for table_name in tables
+            ]
+
+            # print each table as it completes
+            for future in as_completed(futures):
+                result = future.result()
+                copied_bytes += result['bytes']
+                print(f"  {result['table']} completed in: {self.__copy_result(result)}")
+
+        # print total timer & throughput
+        seconds = copy_timer.get_seconds()
+        bytes_per_second = copied_bytes / seconds if seconds > 0 else copied_bytes
+        copy_timer.print_time(
+            f'Copied {copied_bytes / 1048576:,.1f} MB ({bytes_per_second / 1048576:,.1f} MB/sec) in: '
+        )
 
     def create_data_transfer_schema(self, schema: str = 'dt'):
         """ Creates data transfer schema """
@@ -127,8 +427,8 @@ class PgSql:
 
         print('Creating sys functions in: ', end='', flush=True)
 
-        # initialize connect to cloud database
-        pg_cloud = PgSql('CoreInfo', 'cloud_pg', sql_queue_count=1)
+        # initialize connect to cloud database - pooled connections, keywords & sys.log are only checked once
+        pg_cloud = PgSql('CoreInfo', 'cloud_pg', sql_queue_count=1, adaptive_queue=False)
 
         # get all pgsql functions
         pg_cloud.sql_queue_exec(f'select * from {self._sys_schema}.function')
@@ -156,6 +456,9 @@ class PgSql:
             # build function into sys schema
             self.sql_queue_exec(function_str)
 
+        # return the cloud connections to the pool for the next call
+        pg_cloud.close()
+
         functions_timer.print_time()
     
     def create_schema(self, schema: str):
@@ -183,6 +486,17 @@ class PgSql:
 
         self.__pg_cursor.execute(f"drop schema if exists {schema} cascade;")
 
+    def print_queue_stats(self):
+        """ Prints the batch size sql_queue_exec settled on & its throughput """
+
+        stats = self.sql_queue_stats()
+
+        if stats['batches'] > 0:
+            print(
+                f"SQL batch size: {stats['batch_size']:,} statements "
+                f"({stats['batches']:,} batches, {stats['statements_per_second']:,.0f} statements/sec)"
+            )
+
     def rename_schema(self, old_schema: str, new_schema: str):
         """ Renames current schema to new schema name """
 
@@ -191,6 +505,24 @@ class PgSql:
         self.__insert_log()
         self.__pg_cursor.execute(sql)
 
+    def rollback_schema(self, schema: str):
+        """ Swaps previous_[schema] back in for schema, the rolled back schema is dropped in the background """
+
+        previous_schema = self._previous_schema + schema
+
+        if not self.__schema_exists(previous_schema):
+            print(f"Schema doesn't exist in database: {previous_schema}")
+            return
+
+        rollback_timer = Timer()
+        print(f'Rolled back {schema} in: ', end='', flush=True)
+
+        discarded_schema = self._stage_schema + schema
+        self.__swap_schemas(previous_schema, schema, discarded_schema)
+        self.__drop_schema_background(discarded_schema)
+
+        rollback_timer.print_time()
+
     def set_sql_variables(self, new_variables: dict):
         """ Sets SQL variables into dictionary """
 
@@ -226,7 +558,151 @@ class PgSql:
         # returns all records
         return self.__pg_cursor.fetchall()
 
-    def sql_refresh_data(self, schema: str = '', table: str = '', ignore_tables: ArrayList = ArrayList()):
+    def sql_column_types(self, schema: str, table: str) -> ArrayList:
+        """ Returns the column types of a table in column order """
+
+        # execute anything queued so the table exists
+        self.sql_queue_exec(execute=True)
+
+        self.__pg_cursor.execute(
+            f"""select format_type(atttypid, atttypmod)
+                from pg_attribute
+                where attrelid = '{schema}.{table}'::regclass and attnum > 0 and not attisdropped
+                order by attnum;"""
+        )
+
+        return ArrayList(column_type[0] for column_type in self.__pg_cursor.fetchall())
+
+    def sql_copy_from(self, schema: str, table: str, copy_data: bytes, copy_format: str = 'text', columns: str = ''):
+        """ Loads a copy text or binary payload into the table with copy from stdin """
+
+        # execute anything queued first so drop & create statements happen before the copy
+        self.sql_queue_exec(execute=True)
+
+        if copy_data == b'':
+            return
+
+        copy_options = ' (format binary)' if copy_format == 'binary' else ''
+        copy_columns = f' ({columns})' if columns != '' else ''
+        sql_statement = f'copy {schema}.{table}{copy_columns} from stdin{copy_options};'
+
+        try:
+            self.__pg_cursor.copy_expert(sql_statement, io.BytesIO(copy_data))
+        except Exception as error:
+            print(sql_statement)
+            self.__error_log.error(sql_statement)
+            raise error
+
+    def sql_journal_block(self, schema: str, table: str, sequence: int, block_type: str, row_count: int, data: bytes):
+        """ Writes a zlib compressed block to sys.journal, sequence 1 replaces the table's journal
+
+            block_type - sql: statements executed as is, copy: copy text rows for the table
+        """
+
+        # create sys.journal if not exists
+        if not self.__journal_created:
+            self.sql_queue_exec(self.__sql_journal(), execute=True)
+            self.__journal_created = True
+
+        # first block of the table - remove the previous load
+        if sequence == 1:
+            self.sql_journal_delete(schema, table)
+
+        # level 1 - the fastest compression, copy text still compresses well
+        journal_row = (schema, table, sequence, block_type, row_count, zlib.compress(data, 1))
+
+        self.sql_copy_from(
+            self._sys_schema,
+            'journal',
+            CopyTextEncoder().encode_rows([journal_row]),
+            columns='db_schema, db_table, sequence, block_type, row_count, payload',
+        )
+
+    def sql_journal_delete(self, schema: str, table: str = ''):
+        """ Queues the removal of a table's sys.journal blocks when sys.journal exists
+
+            table - every table of the schema when empty
+        """
+
+        if self.__journal_exists():
+            table_filter = f" and db_table = '{table}'" if table != '' else ''
+            self.sql_queue_exec(
+                f"""delete from {self._sys_schema}.journal
+                    where db_schema = '{schema}'{table_filter};"""
+            )
+
+    def sql_journal_sequence(self, schema: str, table: str) -> int:
+        """ Returns the last sys.journal block sequence of a table, 0 when it has none """
+
+        self.__pg_cursor.execute(f"select to_regclass('{self._sys_schema}.journal') is not null;")
+        if not self.__pg_cursor.fetchone()[0]:
+            return 0
+
+        self.__pg_cursor.execute(
+            f"""select coalesce(max(sequence), 0)
+                from {self._sys_schema}.journal
+                where db_schema = '{schema}' and db_table = '{table}';"""
+        )
+
+        return self.__pg_cursor.fetchone()[0]
+
+    def sql_manifest_get(self, data_schema: str, source_path: str) -> tuple:
+        """ Returns the (file_size, file_mtime, file_hash) of the last load of a source file or None """
+
+        self.__create_manifest()
+
+        self.__pg_cursor.execute(
+            f"""select file_size, file_mtime, file_hash
+                from {self._sys_schema}.manifest
+                where data_schema = '{data_schema}' and source_path = '{source_path.replace("'", "''")}';"""
+        )
+
+        return self.__pg_cursor.fetchone()
+
+    def sql_manifest_update(
+        self, data_schema: str, source_path: str, file_size: int, file_mtime: float, file_hash: str
+    ):
+        """ Records the size, modified time & content hash of a loaded source file """
+
+        self.__create_manifest()
+
+        self.__pg_cursor.execute(
+            f"""insert into {self._sys_schema}.manifest
+                (data_schema, source_path, file_size, file_mtime, file_hash, loaded)
+                values (
+                    '{data_schema}', '{source_path.replace("'", "''")}', {file_size}, {file_mtime!r}, '{file_hash}', now()
+                )
+                on conflict (data_schema, source_path) do update set
+                    file_size = excluded.file_size,
+                    file_mtime = excluded.file_mtime,
+                    file_hash = excluded.file_hash,
+                    loaded = excluded.loaded;"""
+        )
+
+    def sql_primary_key(self, schema: str, table: str) -> ArrayList:
+        """ Returns the primary key columns of a table, empty when the table or key doesn't exist """
+
+        # execute anything queued so a created table is seen
+        self.sql_queue_exec(execute=True)
+
+        self.__pg_cursor.execute(
+            f"""select attname
+                from pg_index
+                    inner join pg_attribute on attrelid = indrelid and attnum = any(indkey)
+                where indrelid = to_regclass('{schema}.{table}') and indisprimary
+                order by array_position(indkey::int2[], attnum);"""
+        )
+
+        return ArrayList(column[0] for column in self.__pg_cursor.fetchall())
+
+    def sql_refresh_data(
+        self,
+        schema: str = '',
+        table: str = '',
+        ignore_tables: ArrayList = ArrayList(),
+        fetch_size: int = 10000,
+        workers: int = 1,
+    ):
         """ Refreshes complete schema or single table from sql_[data_type].table """
 
         # total timing
@@ -235,10 +711,10 @@ class PgSql:
         print('Refreshing data...')
 
         # add single table to tables list
-        tables = ArrayList([table])
+        tables = ArrayList([table] if table != '' else [])
 
         # initialize connect to current database for sql_[data_type].table data
-        self.__init_pg_connection(self.__pg_database, self.__login_credentials)
+        self.__init_pg_connection(self.__pg_database, self.__login_credentials, main_connection=False)
 
         # complete schema refresh
         if table == '':
@@ -257,30 +733,29 @@ class PgSql:
             for table_name in ignore_tables:
                 tables.remove(table_name.lower())
 
-        # loop thru table list
-        for table_name in tables:
-            # table timing
-            table_timer = Timer()
-            print(f'  {table_name} completed in: ', end='', flush=True)
-
-            # get data from sql_[data_type].table
-            sql_statement = f'select data from {self._sql_schema + schema}.{table_name} order by sorting, id;'
-            self.__pg_sql_cursor.execute(sql_statement)                
+        # thread pool - each table refreshes over its own pair of connections
+        if workers > 1 and len(tables) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(self.__refresh_table_worker, schema, table_name, fetch_size) for table_name in tables
+                ]
 
-            record_count = 1
-            while record_count <= self.__pg_sql_cursor.rowcount:
-                # gets next table.data record and adds it to the queue
-                self.sql_queue_exec(self.__pg_sql_cursor.fetchone()[0])
-                record_count += 1
+                # print each table as it completes
+                for future in as_completed(futures):
+                    result = future.result()
+                    print(f"  {result['table']} completed in: {self.__refresh_result(result)}")
 
-            # execute last queued statements
-            self.sql_queue_exec(execute=True)
+        else:
+            # loop thru table list
+            for table_name in tables:
+                print(f'  {table_name} completed in: ', end='', flush=True)
 
-            # print table timer
-            table_timer.print_time()
+                # print table timer & rows per second
+                print(self.__refresh_result(self.__refresh_table(schema, table_name, fetch_size)))
 
-        # vacuums
-        self.sql_vacuum()
+        # vacuums - only the refreshed tables
+        self.sql_vacuum(tables=[f'{schema}.{table_name}' for table_name in tables], workers=workers)
+        self.print_queue_stats()
 
         # print total timer
         refresh_timer.print_time('Data refreshed in: ')
@@ -332,21 +807,40 @@ class PgSql:
 
         # execute all sql_statements
         if execute:
-            # execute the remainder of sql strings - less than semicolon_maximum
-            if self.__sql_statements.count(';') > 0:
-                self.__insert_log()
-
-                try:
-                    self.__pg_cursor.execute(self.__sql_statements)
-                except Exception as error:
-                    print(self.__sql_statements)
-                    self.__error_log.error(self.__sql_statements)
-                    raise error
-
-                self.__sql_statements = ''
+            # execute the remainder of sql strings - less than the batch size
+            if self.__sql_chunks:
+                self.__execute_sql_chunks()
+
+    def sql_queue_stats(self) -> dict:
+        """ Returns the current batch size, batches, statements & statements per second of sql_queue_exec """
+
+        stats = self.__batch_size.get_stats()
+
+        return {
+            'batch_size': stats['batch_size'],
+            'batches': stats['batches'],
+            'statements': stats['items'],
+            'statements_per_second': stats['items_per_second'],
+        }
+
+    def sql_vacuum(
+        self,
+        full: bool = False,
+        analyze: bool = True,
+        printing: bool = True,
+        tables: list = None,
+        workers: int = 1,
+        freeze: bool = False,
+    ):
+        """ Vacuums with full, freeze, analyze
+
+            tables - only these tables (schema.table), otherwise the whole database, nothing when empty
+            workers - tables are vacuumed across this many connections
+        """
 
-    def sql_vacuum(self, full: bool = False, analyze: bool = True, printing: bool = True):
-        """ Vacuums with full, analyze """
+        # nothing loaded
+        if tables is not None and len(tables) == 0:
+            return
 
         if printing:
             vacuum_timer = Timer()
@@ -356,15 +850,79 @@ class PgSql:
         sql_statement = 'vacuum'
         if full:
             sql_statement += ' full'
+        if freeze:
+            sql_statement += ' freeze'
         if analyze:
             sql_statement += ' analyze'
 
         # execute
-        self.__pg_cursor.execute(sql_statement)
+        if tables is None:
+            self.__pg_cursor.execute(sql_statement)
+        # thread pool - each table on its own pooled connection
+        elif workers > 1 and len(tables) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(self.__vacuum_table, sql_statement, table) for table in tables]
+
+                for future in as_completed(futures):
+                    future.result()
+        else:
+            self.__pg_cursor.execute(f"{sql_statement} {', '.join(tables)};")
 
         if printing:
             vacuum_timer.print_time()
 
+    def sql_watermark_get(self, data_schema: str, table: str) -> tuple:
+        """ Returns the (watermark_column, watermark_type, watermark_value) of a table's last load or None """
+
+        self.__create_watermark()
+
+        self.__pg_cursor.execute(
+            f"""select watermark_column, watermark_type, watermark_value
+                from {self._sys_schema}.watermark
+                where data_schema = '{data_schema}' and db_table = '{table}';"""
+        )
+
+        return self.__pg_cursor.fetchone()
+
+    def sql_watermark_update(
+        self, data_schema: str, table: str, watermark_column: str, watermark_type: str, watermark_value: str
+    ):
+        """ Records the highest watermark column value loaded for a table """
+
+        self.__create_watermark()
+
+        self.__pg_cursor.execute(
+            f"""insert into {self._sys_schema}.watermark
+                (data_schema, db_table, watermark_column, watermark_type, watermark_value, loaded)
+                values (
+                    '{data_schema}', '{table}', '{watermark_column}', '{watermark_type}',
+                    '{watermark_value.replace("'", "''")}', now()
+                )
+                on conflict (data_schema, db_table) do update set
+                    watermark_column = excluded.watermark_column,
+                    watermark_type = excluded.watermark_type,
+                    watermark_value = excluded.watermark_value,
+                    loaded = excluded.loaded;"""
+        )
+
+    def swap_schema(self, new_schema: str, schema: str, keep_previous: bool = True):
+        """ Swaps new_schema in for schema in one transaction, its sql_ schema & sys.journal blocks included
+
+            keep_previous - the replaced schema is kept as previous_[schema] for rollback_schema,
+                otherwise it's dropped in the background
+        """
+
+        swap_timer = Timer()
+        print(f'Swapped {new_schema} in as {schema} in: ', end='', flush=True)
+
+        previous_schema = self._previous_schema + schema
+        self.__swap_schemas(new_schema, schema, previous_schema)
+
+        if not keep_previous:
+            self.__drop_schema_background(previous_schema)
+
+        swap_timer.print_time()
+
     # Private
     def __check_log(self, check_string: str) -> bool:
         """ Checks if check_string is in log ArrayLists """
@@ -381,6 +939,112 @@ class PgSql:
 
         return False
 
+    def __copy_from_pipe(self, dest_connection, sql_statement: str, copy_pipe: CopyPipe) -> int:
+        """ Loads the pipe into the destination table, returns the row count """
+
+        try:
+            with dest_connection.cursor() as dest_cursor:
+                dest_cursor.copy_expert(sql_statement, copy_pipe, size=65536)
+                return dest_cursor.rowcount
+        except Exception as error:
+            # stop the source copy writing into a pipe nobody reads
+            copy_pipe.abort(error)
+            raise error
+
+    def __copy_result(self, result: dict) -> str:
+        """ Returns the copy time, rows, size & bytes per second of a table """
+
+        bytes_per_second = result['bytes'] / result['seconds'] if result['seconds'] > 0 else result['bytes']
+
+        return (
+            f"{result['time']} ({result['rows']:,} rows, {result['bytes'] / 1048576:,.1f} MB, "
+            f"{bytes_per_second / 1048576:,.1f} MB/sec)"
+        )
+
+    def __copy_table(
+        self, source_schema: str, dest_credential: str, dest_database: str, dest_schema: str, table_name: str
+    ) -> dict:
+        """ Streams a table's copy binary into the destination table, returns the table, rows, bytes & timing """
+
+        # table timing
+        table_timer = Timer()
+
+        copy_pipe = CopyPipe()
+
+        source_connection = PG_CONNECTION_POOL.get(self.__connection, self.__login_credentials, self.__pg_database)
+        dest_connection = None
+
+        try:
+            dest_connection = PG_CONNECTION_POOL.get(
+                dest_credential, self.__login_info.get(dest_credential), dest_database
+            )
+
+            with ThreadPoolExecutor(max_workers=1) as loader:
+                # destination copy reads the pipe while the source copy writes it, nothing is materialized
+                load = loader.submit(
+                    self.__copy_from_pipe,
+                    dest_connection,
+                    f'copy {dest_schema}.{table_name} from stdin (format binary);',
+                    copy_pipe,
+                )
+
+                try:
+                    with source_connection.cursor() as source_cursor:
+                        source_cursor.copy_expert(
+                            f'copy {source_schema}.{table_name} to stdout (format binary);', copy_pipe
+                        )
+                    copy_pipe.close()
+                except Exception as error:
+                    # fail the destination copy so a partial table is never committed
+                    copy_pipe.abort(error)
+                    raise error
+
+                row_count = load.result()
+        finally:
+            PG_CONNECTION_POOL.release(source_connection)
+            if dest_connection is not None:
+                PG_CONNECTION_POOL.release(dest_connection)
+
+        return {
+            'table': table_name,
+            'rows': row_count,
+            'bytes': copy_pipe.get_bytes(),
+            'seconds': table_timer.get_seconds(),
+            'time': table_timer.return_time(),
+        }
+
+    def __copy_table_create(self, source_schema: str, dest_schema: str, table_name: str) -> str:
+        """ Returns the destination create table statement from the source table's columns & primary key """
+
+        self.__pg_cursor.execute(
+            f"""select attname, format_type(atttypid, atttypmod), attnotnull, pg_get_expr(adbin, adrelid)
+                from pg_attribute
+                    left outer join pg_attrdef on adrelid = attrelid and adnum = attnum
+                where attrelid = '{source_schema}.{table_name}'::regclass and attnum > 0 and not attisdropped
+                order by attnum;"""
+        )
+
+        columns = ArrayList()
+        for column_name, column_type, not_null, column_default in self.__pg_cursor.fetchall():
+            column = f'"{column_name}" {column_type}'
+            # sequences aren't copied - serial columns keep their copied values without the nextval default
+            if column_default is not None and 'nextval(' not in column_default:
+                column += f' default {column_default}'
+            if not_null:
+                column += ' not null'
+            columns.append(column)
+
+        # primary key
+        self.__pg_cursor.execute(
+            f"""select pg_get_constraintdef(oid)
+                from pg_constraint
+                where conrelid = '{source_schema}.{table_name}'::regclass and contype = 'p';"""
+        )
+        for primary_key in self.__pg_cursor.fetchall():
+            columns.append(primary_key[0])
+
+        return f"create table {dest_schema}.{table_name} ({', '.join(columns)});"
+
     def __create_log(self):
         """ Creates the schema & table: sys.log """
 
@@ -416,64 +1080,103 @@ class PgSql:
             self.__log_queue.append(f'{self._sys_schema}~log~table created~{datetime_now}')
             #log_created = True
 
+    def __create_manifest(self):
+        """ Creates the table: sys.manifest, once per instance """
+
+        if not self.__manifest_created:
+            self.__pg_cursor.execute(self.__sql_manifest())
+            self.__manifest_created = True
+
+    def __create_watermark(self):
+        """ Creates the table: sys.watermark, once per instance """
+
+        if not self.__watermark_created:
+            self.__pg_cursor.execute(self.__sql_watermark())
+            self.__watermark_created = True
+
+    def __drop_schema_background(self, schema: str):
+        """ Drops a schema, its sql_ schema & sys.journal blocks on a pooled connection in a background thread """
+
+        # not a daemon - the drop finishes before the process exits
+        drop_thread = threading.Thread(target=self.__drop_schema_worker, args=(schema,), name=f'drop_{schema}')
+        drop_thread.start()
+
+        self.__drop_threads.append(drop_thread)
+
+    def __drop_schema_worker(self, schema: str):
+        """ Drops a schema for __drop_schema_background """
+
+        drop_connection = PG_CONNECTION_POOL.get(self.__connection, self.__login_credentials, self.__pg_database)
+
+        try:
+            with drop_connection.cursor() as drop_cursor:
+                drop_cursor.execute(self.__sql_schema_drop(schema))
+        finally:
+            PG_CONNECTION_POOL.release(drop_connection)
+
+    def __execute_sql_chunks(self, full_batch: bool = False):
+        """ Executes the queued chunks as one string, full batches are timed for the batch size """
+
+        self.__insert_log()
+
+        sql_statements = ''.join(self.__sql_chunks)
+        statement_count = len(self.__sql_chunks)
+        self.__sql_chunks = []
+        self.__sql_chunks_size = 0
+
+        batch_start = time.perf_counter()
+
+        try:
+            self.__pg_cursor.execute(sql_statements)
+        except Exception as error:
+            print(sql_statements)
+            self.__error_log.error(sql_statements)
+            raise error
+
+        if full_batch:
+            self.__batch_size.record(statement_count, time.perf_counter() - batch_start)
+
     def __execute_sql_when_maximum(self, sql_line: str):
-        """ Executes the sql statements if maximum semicolons or string length """
+        """ Executes the sql statements if the batch size or max string length is reached """
 
         # queue in log ArrayList
         self.__queue_log(sql_line)
 
-        # set sql_statements and semicolon_count if under string maximum
-        #   or current sql_line is greater than string maximum
-        if len(self.__sql_statements) + len(sql_line) <= self.__sql_string_maximum or (
-                self.__sql_statements == '' and len(sql_line) > self.__sql_string_maximum
-        ):
-            self.__sql_statements += sql_line
-            self.__semicolon_count += 1
-            sql_line = ''
-
-        # semicolon count reaches max constant or string length max then execute sql string
-        if (
-                self.__semicolon_count == self.__semicolon_maximum
-                or len(self.__sql_statements) + len(sql_line) > self.__sql_string_maximum
-        ):
-            self.__insert_log()
-            self.__pg_cursor.execute(self.__sql_statements)
-            self.__sql_statements = sql_line
-            self.__semicolon_count = 1 if sql_line.endswith(';') else 0
+        # string maximum - execute what is queued before adding sql_line
+        if self.__sql_chunks and self.__sql_chunks_size + len(sql_line) > self.__sql_string_maximum:
+            self.__execute_sql_chunks()
+
+        self.__sql_chunks.append(sql_line)
+        self.__sql_chunks_size += len(sql_line)
+
+        # batch size reached
+        if len(self.__sql_chunks) >= self.__batch_size.get_size():
+            self.__execute_sql_chunks(full_batch=True)
 
     def __init_pg_connection(self, database: str, credentials: str, main_connection : bool = True):
-        """ Initialize pg connection for data usage """
+        """ Initialize pg connection for data usage from the connection pool """
+
+        connection = PG_CONNECTION_POOL.get(self.__connection, credentials, database)
 
         if main_connection:
-            # if already connected to the database
-            #if str(self.__pg_cursor.connection).count(database) == 0:
-            # new connection for getting sql.table data
-            self.__pg_connection = psycopg2.connect(
-                host=credentials['host'],
-                port=credentials['port'],
-                user=credentials['user'],
-                password=credentials['password'],
-                database=database,
-                sslmode=credentials['ssl']
-            )
-            self.__pg_connection.autocommit = True
+            # return the previous connection to the pool
+            if self.__pg_connection is not None:
+                self.__pg_cursor.close()
+                PG_CONNECTION_POOL.release(self.__pg_connection)
+
+            self.__pg_connection = connection
 
             # connection -> cursor
             self.__pg_cursor = self.__pg_connection.cursor()
 
         else:
-            # if already connected to the database
-            #if str(self.__pg_sql_cursor.connection).count(database) == 0:
-            # new connection for getting sql.table data
-            self.__pg_sql_connection = psycopg2.connect(
-                host=credentials['host'],
-                port=credentials['port'],
-                user=credentials['user'],
-                password=credentials['password'],
-                database=database,
-                sslmode=credentials['ssl']
-            )
-            self.__pg_sql_connection.autocommit = True
+            # return the previous connection to the pool
+            if self.__pg_sql_connection is not None:
+                self.__pg_sql_cursor.close()
+                PG_CONNECTION_POOL.release(self.__pg_sql_connection)
+
+            # connection for getting sql.table data
+            self.__pg_sql_connection = connection
 
             # connection -> cursor
             self.__pg_sql_cursor = self.__pg_sql_connection.cursor()
@@ -499,6 +1202,15 @@ class PgSql:
                     values ('{log[0]}', '{log[1]}', '{log[2]}', '{log[3]}')"""
             )
 
+    def __journal_exists(self) -> bool:
+        """ Returns True if sys.journal exists, checked until it does """
+
+        if not self.__journal_created:
+            self.__pg_cursor.execute(f"select to_regclass('{self._sys_schema}.journal') is not null;")
+            self.__journal_created = self.__pg_cursor.fetchone()[0]
+
+        return self.__journal_created
+
     def __queue_log(self, sql_statement: str):
         """ Adds log statements if it doesn't exist in ArrayList """
 
@@ -566,6 +1278,118 @@ class PgSql:
             if not self.__check_log(f'{sql_schema}~{sql_table}~{description}'):
                 self.__log_queue.append(f'{sql_schema}~{sql_table}~{description}~{time_stamp}')
 
+    def __refresh_result(self, result: dict) -> str:
+        """ Returns the refresh time, rows & rows per second of a table """
+
+        rows_per_second = result['rows'] / result['seconds'] if result['seconds'] > 0 else result['rows']
+
+        return f"{result['time']} ({result['rows']:,} rows, {rows_per_second:,.0f} rows/sec)"
+
+    def __refresh_table(self, schema: str, table_name: str, fetch_size: int) -> dict:
+        """ Replays sql_[data_type].table through the sql queue, returns the table, row count & timing """
+
+        # table timing
+        table_timer = Timer()
+
+        # compressed journal when the table has blocks in sys.journal
+        if self.__refresh_journal_exists(schema, table_name):
+            return self.__refresh_journal(schema, table_name, table_timer)
+
+        # named cursor - rows stay on the server and come over in fetch_size batches,
+        #   withhold lets it live outside a transaction on the autocommit connection
+        replay_cursor = self.__pg_sql_connection.cursor(name=f'refresh_{schema}_{table_name}', withhold=True)
+        replay_cursor.itersize = fetch_size
+
+        # get data from sql_[data_type].table
+        replay_cursor.execute(f'select data from {self._sql_schema + schema}.{table_name} order by sorting, id;')
+
+        row_count = 0
+        replay_rows = replay_cursor.fetchmany(fetch_size)
+        while replay_rows:
+            # adds each table.data record to the queue
+            for replay_row in replay_rows:
+                self.sql_queue_exec(replay_row[0])
+            row_count += len(replay_rows)
+            replay_rows = replay_cursor.fetchmany(fetch_size)
+
+        replay_cursor.close()
+
+        # execute last queued statements
+        self.sql_queue_exec(execute=True)
+
+        return {
+            'table': table_name,
+            'rows': row_count,
+            'seconds': table_timer.get_seconds(),
+            'time': table_timer.return_time(),
+        }
+
+    def __refresh_journal(self, schema: str, table_name: str, table_timer: Timer) -> dict:
+        """ Replays the sys.journal blocks of a table in sequence order, returns the table, row count & timing """
+
+        # named cursor - one compressed block over at a time
+        replay_cursor = self.__pg_sql_connection.cursor(name=f'journal_{schema}_{table_name}', withhold=True)
+        replay_cursor.itersize = 1
+
+        replay_cursor.execute(
+            f"""select block_type, row_count, payload
+                from {self._sys_schema}.journal
+                where db_schema = '{schema}' and db_table = '{table_name}'
+                order by sequence;"""
+        )
+
+        row_count = 0
+        for block_type, block_rows, payload in replay_cursor:
+            block_data = zlib.decompress(payload)
+
+            # drop & create statements
+            if block_type == 'sql':
+                self.sql_queue_exec(block_data.decode('utf-8'), execute=True)
+            # copy text rows
+            else:
+                self.sql_copy_from(schema, table_name, block_data)
+                row_count += block_rows
+
+        replay_cursor.close()
+
+        return {
+            'table': table_name,
+            'rows': row_count,
+            'seconds': table_timer.get_seconds(),
+            'time': table_timer.return_time(),
+        }
+
+    def __refresh_journal_exists(self, schema: str, table_name: str) -> bool:
+        """ Returns True if sys.journal has blocks for the table """
+
+        self.__pg_sql_cursor.execute(f"select to_regclass('{self._sys_schema}.journal') is not null;")
+        if not self.__pg_sql_cursor.fetchone()[0]:
+            return False
+
+        self.__pg_sql_cursor.execute(
+            f"""select 1
+                from {self._sys_schema}.journal
+                where db_schema = '{schema}' and db_table = '{table_name}'
+                limit 1;"""
+        )
+
+        return self.__pg_sql_cursor.rowcount > 0
+
+    def __refresh_table_worker(self, schema: str, table_name: str, fetch_size: int) -> dict:
+        """ Refreshes a table on its own PgSql instance for a thread pool """
+
+        refresh_pg = PgSql(
+            self.__pg_database, self.__connection, self.__batch_size.get_size(), self.__adaptive_queue
+        )
+
+        try:
+            # read sql_[data_type].table from the current database instead of postgres
+            refresh_pg.__init_pg_connection(self.__pg_database, self.__login_credentials, main_connection=False)
+
+            return refresh_pg.__refresh_table(schema, table_name, fetch_size)
+        finally:
+            refresh_pg.close()
+
     def __remove_sql_comments(self, sql_statement: str):
         """ Removes all comments from sql string """
 
@@ -594,6 +1418,30 @@ class PgSql:
 
         return str(sql_statement)
 
+    def __vacuum_table(self, sql_statement: str, table: str):
+        """ Vacuums a table on a pooled connection for a thread pool """
+
+        vacuum_connection = PG_CONNECTION_POOL.get(self.__connection, self.__login_credentials, self.__pg_database)
+
+        try:
+            with vacuum_connection.cursor() as vacuum_cursor:
+                vacuum_cursor.execute(f'{sql_statement} {table};')
+        finally:
+            PG_CONNECTION_POOL.release(vacuum_connection)
+
+    def __schema_exists(self, schema: str) -> bool:
+        """ Returns True if the schema exists """
+
+        return (
+            self.sql_count(
+                f"""
+                    select schema_name
+                    from information_schema.schemata
+                    where schema_name = '{schema}'"""
+            )
+            > 0
+        )
+
     def __sql_data_transfer(self, schema: str) -> str:
         """ Returns create table sql statement for data transfer """
 
@@ -678,6 +1526,43 @@ class PgSql:
 
         return sql_statement
 
+    def __sql_journal(self) -> str:
+        """ Returns create table sql statement for the compressed journal, sequence is bigint as csv chunks & key
+            ranges each write their blocks 10,000,000 sequences apart
+        """
+
+        return f"""
+            create table if not exists {self._sys_schema}.journal (
+                db_schema varchar(63) not null,
+                db_table varchar(63) not null,
+                sequence bigint not null,
+                block_type varchar(10) not null,
+                row_count integer default 0,
+                payload bytea not null,
+                primary key (db_schema, db_table, sequence));
+            do $$
+            begin
+                if (
+                    select data_type
+                    from information_schema.columns
+                    where table_schema = '{self._sys_schema}' and table_name = 'journal' and column_name = 'sequence'
+                ) = 'integer' then
+                    alter table {self._sys_schema}.journal alter column sequence type bigint;
+                end if;
+            end $$;"""
+
+    def __sql_schema_drop(self, schema: str) -> str:
+        """ Returns the drop statements of a schema, its sql_ schema & sys.journal blocks """
+
+        sql_statement = (
+            f'drop schema if exists {schema} cascade;drop schema if exists {self._sql_schema + schema} cascade;'
+        )
+
+        if self.__journal_exists():
+            sql_statement += f"delete from {self._sys_schema}.journal where db_schema = '{schema}';"
+
+        return sql_statement
+
     def __sql_log(self) -> str:
         """ Returns create table sql statement for log """
 
@@ -688,3 +1573,68 @@ class PgSql:
                 db_table varchar(63) default '',
                 description varchar(50) default '',
                 start timestamp);"""
+
+
+    def __sql_manifest(self) -> str:
+        """ Returns create table sql statement for the source file manifest """
+
+        return f"""
+            create table if not exists {self._sys_schema}.manifest (
+                data_schema varchar(63) not null,
+                source_path text not null,
+                file_size bigint default 0,
+                file_mtime double precision default 0,
+                file_hash varchar(64) default '',
+                loaded timestamp,
+                primary key (data_schema, source_path));"""
+
+    def __sql_watermark(self) -> str:
+        """ Returns create table sql statement for the incremental extraction watermarks """
+
+        return f"""
+            create table if not exists {self._sys_schema}.watermark (
+                data_schema varchar(63) not null,
+                db_table varchar(63) not null,
+                watermark_column varchar(63) not null,
+                watermark_type varchar(10) not null,
+                watermark_value text not null,
+                loaded timestamp,
+                primary key (data_schema, db_table));"""
+
+    def __swap_schemas(self, new_schema: str, schema: str, old_schema: str):
+        """ Renames schema to old_schema & new_schema to schema, with their sql_ schemas & sys.journal blocks
+
+            the statements run as one query, postgres executes it as a single transaction
+        """
+
+        # background drops & the last swap's old schema go first, nothing may hold the old name
+        for drop_thread in self.__drop_threads:
+            drop_thread.join()
+        self.__drop_threads.clear()
+        self.__pg_cursor.execute(self.__sql_schema_drop(old_schema))
+
+        sql_statements = []
+
+        # data schema & sql_[data_type] schema
+        for schema_prefix in ('', self._sql_schema):
+            if self.__schema_exists(schema_prefix + schema):
+                sql_statements.append(f'alter schema {schema_prefix + schema} rename to {schema_prefix + old_schema};')
+            if self.__schema_exists(schema_prefix + new_schema):
+                sql_statements.append(f'alter schema {schema_prefix + new_schema} rename to {schema_prefix + schema};')
+
+        # compressed journal blocks are keyed by schema
+        if self.__journal_exists():
+            for from_schema, to_schema in ((schema, old_schema), (new_schema, schema)):
+                sql_statements.append(
+                    f"""update {self._sys_schema}.journal set db_schema = '{to_schema}'
+                        where db_schema = '{from_schema}';"""
+                )
+
+        if len(sql_statements) == 0:
+            return
+
+        for sql_statement in sql_statements:
+            self.__queue_log(sql_statement)
+        self.__insert_log()
+
+        self.__pg_cursor.execute(''.join(sql_statements))
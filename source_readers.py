@@ -0,0 +1,939 @@
+""" Source Readers """
+
+# standard library imports
+import os
+import re
+import itertools
+from abc import ABC
+from abc import abstractmethod
+
+# third party library imports
+import dbfread
+import pymssql
+import pymysql
+import pymysql.cursors
+import pyodbc
+
+# local library imports
+from column_batch import ColumnBatch
+from type_inference import TypeInference
+from utilities import ArrayList
+from utilities import DataLocation
+from workbook_reader import WorkbookReader
+
+# constants
+# ColumnBatch kind of each transformed dbf field type
+FOX_PRO_COLUMN_KINDS = {
+    'boolean': 'boolean',
+    'integer': 'integer',
+    'float': 'float',
+    'decimal': 'object',
+    'string': 'object',
+    'date': 'object',
+}
+
+class ColumnChanges(list):
+    """ Alter table clauses (add column, alter column type) the next batch of rows needs, yielded before it """
+
+
+class OverflowRows(list):
+    """ Source rows the table's column types don't fit, yielded before the batch of the rest of their rows """
+
+
+class SourceReader(ABC):
+    """ Reads the tables of a source in batches: a table's columns, then its rows ready to load """
+
+    def __init__(self, fetch_size: int = 1000):
+        # fetch_size - rows per batch
+
+        # constants - protected
+        self._fetch_size = fetch_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    # Public
+    @abstractmethod
+    def batches(self, table: str):
+        """ Yields a table's columns [(column name, pg type)], empty when it has nothing to load, then its rows in
+            batches of lists, each after the ColumnChanges that fit the table to it
+        """
+
+    def close(self):
+        """ Closes the source """
+
+    def columns(self, table: str, *arguments) -> list:
+        """ Returns a table's columns [(column name, pg type)] without reading its rows """
+
+        table_source = self.batches(table, *arguments)
+
+        try:
+            return next(table_source)
+        finally:
+            table_source.close()
+
+    @abstractmethod
+    def tables(self) -> list:
+        """ Returns the tables of the source """
+
+
+class DataFlexReader(SourceReader):
+    """ Reads the vld files of a dataflex directory in fetch_size batches over one odbc connection """
+
+    def __init__(self, path: str, fetch_size: int = 1000, connect: callable = None):
+        # path - the directory, the dataflex driver serves every vld file in it from one connection
+        # connect - DB-API connect function given the connection string, pyodbc.connect unless it's a stand-in
+        #   source (benchmarks & tests on machines without the dataflex driver)
+
+        super().__init__(fetch_size)
+
+        # constants - private
+        self.__path = path
+        self.__connection_string = f'DRIVER={{DataFlex Driver}};DBQ={path}'
+        self.__connect = pyodbc.connect if connect is None else connect
+
+        # variables - private
+        self.__connection = None
+        self.__cursors = []
+        self.__connection_count = 0
+
+    # Public
+    def batches(self, file_list_table: str):
+        """ Yields a vld file's columns then its rows in fetch_size batches, the cursor is closed once read or when
+            the reader is closed
+        """
+
+        table_name = file_list_table.split('.')[0]
+
+        data_cursor = self.__get_connection().cursor()
+        self.__cursors.append(data_cursor)
+
+        try:
+            # the driver fetches each batch in one call
+            data_cursor.arraysize = self._fetch_size
+            data_cursor.execute(f'select * from {table_name}')
+
+            # description (name, type_code, display_size, internal_size, precision, scale, null_ok)
+            yield [(str(column[0]).lower(), self.__column_type(column)) for column in data_cursor.description]
+
+            row_batch = data_cursor.fetchmany(self._fetch_size)
+            while row_batch:
+                yield [list(row) for row in row_batch]
+                row_batch = data_cursor.fetchmany(self._fetch_size)
+        finally:
+            # close() may have closed it already
+            if data_cursor in self.__cursors:
+                self.__cursors.remove(data_cursor)
+                data_cursor.close()
+
+    def close(self):
+        """ Closes the open cursors & the connection """
+
+        for data_cursor in self.__cursors:
+            data_cursor.close()
+        self.__cursors.clear()
+
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def get_connection_count(self) -> int:
+        """ Returns the number of connections opened """
+
+        return self.__connection_count
+
+    def tables(self) -> list:
+        """ Returns the vld files of the directory """
+
+        return list(DataLocation(self.__path, '', ['vld']).get_file_list())
+
+    # Private
+    def __column_type(self, column: tuple) -> str:
+        """ Returns the pg type of a cursor description column """
+
+        if str(column[1]) == "<class 'str'>":
+            return f'varchar({column[3]})'
+        elif str(column[1]) == "<class 'int'>":
+            return 'integer'
+        elif str(column[1]) == "<class 'decimal.Decimal'>":
+            return f'numeric({column[4]},{column[5]})'
+        elif str(column[1]) == "<class 'datetime.date'>":
+            return 'date NULL'
+
+        return ''
+
+    def __get_connection(self):
+        """ Returns the directory's connection, opened on first use """
+
+        if self.__connection is None:
+            self.__connection = self.__connect(self.__connection_string)
+            self.__connection_count += 1
+
+        return self.__connection
+
+
+class FoxProReader(SourceReader):
+    """ Reads the dbf files of a fox pro directory, transforming the records in batches """
+
+    def __init__(self, path: str, streaming: bool = False, fetch_size: int = 1000):
+        # streaming - reads records lazily from the file as they are loaded, memory is then bounded by the copy
+        #   batch or sql queue instead of the table size
+
+        super().__init__(fetch_size)
+
+        # constants - private
+        self.__path = path
+        self.__streaming = streaming
+        self.__encoding = 'cp1252'
+
+    # Public
+    def batches(self, file_list_table: str):
+        """ Yields a dbf file's columns then its transformed rows in ColumnBatch batches, fields.dbf with a
+            record_number
+        """
+
+        dbf_cursor = dbfread.DBF(
+            filename=os.path.join(self.__path, file_list_table),
+            encoding=self.__encoding,
+            lowernames=True,
+            load=not self.__streaming,
+            # records as lists of (name, value) items, no dict is built per record
+            recfactory=None,
+        )
+        dbf_fields = dbf_cursor.fields
+
+        columns = [(field.name, self.__column_type(field)) for field in dbf_fields]
+        columns = [column for column in columns if column[1] != '']
+        # special exception - creating record_number column
+        if file_list_table == 'fields.dbf':
+            columns.append(('record_number', 'bigint'))
+
+        yield columns
+
+        # loaded fields with how their values are transformed
+        table_fields = [
+            (field_index, field, self.__field_type(field))
+            for field_index, field in enumerate(dbf_fields)
+            if self.__field_type(field) != 'invalid'
+        ]
+        column_kinds = [FOX_PRO_COLUMN_KINDS[field_type] for _, _, field_type in table_fields]
+        if file_list_table == 'fields.dbf':
+            column_kinds.append('integer')
+
+        record_number = 1
+        records = iter(dbf_cursor.records)
+
+        # transforms a column at a time over a batch of records
+        record_batch = list(itertools.islice(records, self._fetch_size))
+        while record_batch:
+            # each field's (name, value) items of the batch, then its values
+            record_columns = [list(zip(*field_items))[1] for field_items in zip(*record_batch)]
+            columns = [
+                self.__transform_column(record_columns[field_index], field, field_type)
+                for field_index, field, field_type in table_fields
+            ]
+            # special exception - adding record_number as the last column
+            if file_list_table == 'fields.dbf':
+                columns.append(range(record_number, record_number + len(record_batch)))
+                record_number += len(record_batch)
+
+            yield ColumnBatch.from_columns(column_kinds, columns)
+
+            record_batch = list(itertools.islice(records, self._fetch_size))
+
+    def tables(self) -> list:
+        """ Returns the dbf files of the directory """
+
+        return list(DataLocation(self.__path, '', ['dbf']).get_file_list())
+
+    # Private
+    def __column_type(self, field) -> str:
+        """ Returns the pg type & default of a dbf field, empty for the fields that aren't loaded """
+
+        if field.type in ('C', 'V'):
+            return f"varchar({field.length}) not NULL default ''"
+        elif field.type == 'L':
+            return 'boolean not NULL default false'
+        elif field.type == 'D':
+            return 'date NULL'
+        elif field.type in ('T', '@'):
+            return 'timestamp NULL'
+        elif field.type in ('I', '+'):
+            return 'integer not NULL default 0'
+        elif field.type == 'N':
+            return f'numeric({field.length},{field.decimal_count}) not NULL default 0'
+        elif field.type == 'F':
+            return 'float4 not NULL default 0'
+        elif field.type == 'B':
+            return 'float8 not NULL default 0'
+        elif field.type == 'Y':
+            return f'decimal({field.length + field.decimal_count},{field.decimal_count}) not NULL default 0'
+        elif field.type == 'M':
+            return "text not NULL default ''"
+
+        return ''
+
+    def __field_type(self, field) -> str:
+        """ Returns how a dbf field's values are transformed """
+
+        if field.type in ('C', 'V', 'M'):
+            return 'string'
+        elif field.type == 'L':
+            return 'boolean'
+        elif field.type in ('D', 'T', '@'):
+            return 'date'
+        elif field.type in ('I', '+'):
+            return 'integer'
+        elif field.type in ('F', 'B'):
+            return 'float'
+        elif field.type in ('N', 'Y'):
+            return 'decimal'
+
+        return 'invalid'
+
+    def __transform_column(self, values: tuple, field, field_type: str) -> list:
+        """ Returns a batch of a dbf field's values transformed for loading """
+
+        # boolean
+        if field_type == 'boolean':
+            return [str(value) == 'True' for value in values]
+        # int / float
+        elif field_type in ('integer', 'float'):
+            return [0 if value is None else value for value in values]
+        # numeric / decimal
+        elif field_type == 'decimal':
+            # vfp can do 1,000,000.000 is valid in numeric(10, 4)
+            #   but pgsql can only have 999,999.9999
+            integer_length = field.length - field.decimal_count
+            clamped_value = float('9' * integer_length + '.' + '9' * field.decimal_count)
+
+            return [
+                0 if value is None
+                else clamped_value if len(str(value).split('.', maxsplit=1)[0]) > integer_length
+                else str(value).strip()[0 : field.length]
+                for value in values
+            ]
+        # string
+        elif field_type == 'string':
+            return ['' if value is None else str(value) for value in values]
+
+        # date / time - nulls stay null
+        return list(values)
+
+
+class MySqlReader(SourceReader):
+    """ Reads the tables of a mysql database from an unbuffered (streaming) cursor in fetch_size batches """
+
+    def __init__(self, database: str, login: dict, fetch_size: int = 10000, snapshot: bool = False):
+        # login - host, user & password
+        # snapshot - every read is from one consistent snapshot taken as the connection opens, readers opened while
+        #   another holds lock_table on the table they read all read the same snapshot
+
+        super().__init__(fetch_size)
+
+        # constants - private
+        self.__database = database
+        self.__login = login
+        self.__snapshot = snapshot
+
+        # variables - private
+        self.__connection = None
+
+    # Public
+    def batches(self, table: str, where: str = '', parameters: tuple = None):
+        """ Yields a schema.table's columns then its rows (those matching where when given) in fetch_size batches,
+            the unbuffered cursor streams rows from the server instead of buffering the whole result set
+        """
+
+        schema_name, table_name = table.split('.')
+
+        column_cursor = self.cursor()
+        column_cursor.execute(
+            f"""
+                SELECT
+                    ordinal_position,
+                lower(column_name) as column_name,
+                    case
+                        when data_type = 'bool' then 'boolean'
+                        when data_type = 'tinyint' then 'smallint'
+                        when data_type = 'mediumint' then 'int'
+                        when data_type = 'float' then 'real'
+                        when data_type = 'double' then 'double precision'
+                        when data_type = 'time' then 'interval hour to second'
+                        when data_type = 'datetime' then 'timestamp without time zone'
+                        when data_type = 'timestamp' then 'timestamp with time zone'
+                        when data_type = 'tinytext' then 'varchar(255)'
+                        when left(data_type, 6) = 'binary' or left(data_type, 9) = 'varbinary' then 'bytea'
+                        else data_type end as data_type,
+                    case when is_nullable = 'YES' then 'True' else 'False' end as is_nullable
+                from
+                    information_schema.columns
+                where
+                    table_schema = '{schema_name}' and table_name = '{table_name}'
+                order by
+                    lower(table_name), ordinal_position;"""
+        )
+        # columns (ordinal_position, column_name, data_type, is_nullable)
+        columns = [
+            (column[1], f"{column[2]}{'' if column[3] == 'True' else ' NOT NULL'}")
+            for column in column_cursor.fetchall()
+        ]
+        column_cursor.close()
+
+        yield columns
+
+        yield from _cursor_batches(
+            self.cursor(unbuffered=True),
+            f"select * from {table}{'' if where == '' else ' where ' + where};",
+            self._fetch_size,
+            parameters,
+        )
+
+    def close(self):
+        """ Closes the connection """
+
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def cursor(self, unbuffered: bool = False):
+        """ Returns a cursor of the connection, unbuffered cursors stream their rows """
+
+        if self.__connection is None:
+            self.__connection = pymysql.connect(
+                host=self.__login["host"],
+                database=self.__database,
+                user=self.__login["user"],
+                password=self.__login["password"],
+            )
+
+            if self.__snapshot:
+                snapshot_cursor = self.__connection.cursor()
+                snapshot_cursor.execute('set session transaction isolation level repeatable read;')
+                snapshot_cursor.execute('start transaction with consistent snapshot;')
+                snapshot_cursor.close()
+
+        if unbuffered:
+            return self.__connection.cursor(pymysql.cursors.SSCursor)
+
+        return self.__connection.cursor()
+
+    def lock_table(self, table: str):
+        """ Read locks a schema.table until unlock_tables (needs the lock tables privilege), no writes to it commit
+            while it's locked & the connection only reads the locked table
+        """
+
+        lock_cursor = self.cursor()
+        lock_cursor.execute(f'lock tables {table} read;')
+        lock_cursor.close()
+
+    def tables(self) -> list:
+        """ Returns the schema.table names of the database """
+
+        table_cursor = self.cursor()
+        table_cursor.execute(
+            f"""
+                select
+                    lower(table_schema) as table_schema,
+                    lower(table_name) as table_name,
+                    table_rows
+                from
+                    information_schema.tables
+                where
+                    table_schema = '{self.__database}' /*and table_type = 'BASE TABLE'*/
+                order by
+                    lower(table_schema),
+                    lower(table_name);"""
+        )
+        my_tables = [f"{my_table[0]}.{my_table[1]}" for my_table in table_cursor.fetchall()]
+        table_cursor.close()
+
+        return my_tables
+
+    def unlock_tables(self):
+        """ Releases the lock_table read lock """
+
+        lock_cursor = self.cursor()
+        lock_cursor.execute('unlock tables;')
+        lock_cursor.close()
+
+
+class SqlServerReader(SourceReader):
+    """ Reads the tables of a sql server database in fetch_size batches """
+
+    def __init__(self, database: str, login: dict, fetch_size: int = 10000):
+        # login - host, server, user & password
+
+        super().__init__(fetch_size)
+
+        # constants - private
+        self.__database = database
+        self.__login = login
+
+        # variables - private
+        self.__connection = None
+
+    # Public
+    def batches(self, table: str, where: str = '', parameters: tuple = None):
+        """ Yields a table's (dbo when it has no schema) columns then its rows (those matching where when given)
+            in fetch_size batches, pymssql reads rows off the tds stream as they are fetched
+        """
+
+        schema_name, table_name = table.split('.') if table.count('.') != 0 else ('dbo', table)
+
+        column_cursor = self.cursor()
+        column_cursor.execute(
+            f"""
+                select
+                    --lower(tables.[name]) as table_name,
+                    columns.column_id,
+                    lower(columns.[name]) as column_name,
+                    case
+                        when lower(types.[name]) in ('binary', 'image', 'rowversion', 'timestamp', 'varbinary') then 'bytea'
+                        when lower(types.[name]) = 'bit' then 'boolean'
+                        when lower(types.[name]) = 'datetime' then 'timestamp(3) without time zone'
+                        when lower(types.[name]) = 'datetime2' then 'timestamp without time zone'
+                        when lower(types.[name]) = 'datetimeoffset' then 'timestamp'
+                        when lower(types.[name]) = 'decimal' then 'decimal(' + cast(columns.precision as varchar) + ',' + cast(columns.scale as varchar) + ')'
+                        when lower(types.[name]) = 'float' then 'float8'
+                        when lower(types.[name]) in ('nchar', 'char') then 'varchar' + case when columns.max_length is not null then '(' + cast(columns.max_length as varchar) + ')' else '' end
+                        when lower(types.[name]) in ('ntext', 'text') or lower(types.[name]) in ('nvarchar', 'varchar') and columns.max_length = -1 then 'text'
+                        when lower(types.[name]) in ('nvarchar', 'varchar') then 'varchar' + case when columns.max_length is not null then '(' + cast(columns.max_length as varchar) + ')' else '' end
+                        when lower(types.[name]) = 'smalldatetime' then 'timestamp(0) without time zone'
+                        when lower(types.[name]) = 'smallmoney' then 'money'
+                        when lower(types.[name]) = 'time' then 'time without time zone'
+                        when lower(types.[name]) = 'tinyint' then 'smallint'
+                        when lower(types.[name]) = 'uniqueidentifier' then 'uuid'
+                        when lower(types.[name]) in ('cursor', 'hiearchyid', 'sql_variant', 'table') then ''
+                        else lower(types.[name]) end as data_type,
+                    case when columns.is_nullable = 1 then 'True' else 'False' end as is_nullable
+                from
+                    sys.tables
+                        inner join sys.columns on tables.object_id = columns.object_id
+                        inner join sys.types on columns.system_type_id = types.system_type_id and lower(types.[name]) != 'sysname'
+                where
+                    tables.[name] = '{table_name}'
+                order by
+                    tables.[name], columns.column_id;"""
+        )
+        # columns (column_id, column_name, data_type, is_nullable)
+        columns = [
+            (column[1], f"{column[2]}{'' if column[3] == 'True' else ' NOT NULL'}")
+            for column in column_cursor.fetchall()
+        ]
+        column_cursor.close()
+
+        yield columns
+
+        yield from _cursor_batches(
+            self.cursor(),
+            f"select * from {schema_name}.{table_name}{'' if where == '' else ' where ' + where};",
+            self._fetch_size,
+            parameters,
+        )
+
+    def close(self):
+        """ Closes the connection """
+
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def create_snapshot(self) -> str:
+        """ Creates a database snapshot beside the data files & returns its name, readers of the snapshot all read
+            the database as it was when the snapshot was created
+        """
+
+        snapshot_name = f'{self.__database}_etl_snapshot'
+
+        file_cursor = self.cursor()
+        file_cursor.execute('select [name], physical_name from sys.database_files where type = 0;')
+        snapshot_files = ', '.join(
+            f"(name = [{file_name}], filename = '{physical_name}.etl_snapshot')"
+            for file_name, physical_name in file_cursor.fetchall()
+        )
+        file_cursor.close()
+
+        # a snapshot left by a failed load is replaced
+        self.__autocommit_execute(
+            f"if db_id('{snapshot_name}') is not null drop database [{snapshot_name}];",
+            f'create database [{snapshot_name}] on {snapshot_files} as snapshot of [{self.__database}];'
+        )
+
+        return snapshot_name
+
+    def cursor(self, unbuffered: bool = False):
+        """ Returns a cursor of the connection, its rows are always read off the stream as they're fetched """
+
+        if self.__connection is None:
+            self.__connection = pymssql.connect(
+                host=self.__login["host"],
+                server=self.__login["server"],
+                database=self.__database,
+                user=self.__login["user"],
+                password=self.__login["password"],
+                # autocommit = True,
+                as_dict=False,
+            )
+
+        return self.__connection.cursor()
+
+    def drop_snapshot(self, snapshot_name: str):
+        """ Drops a create_snapshot database snapshot """
+
+        self.__autocommit_execute(f'drop database [{snapshot_name}];')
+
+    def tables(self) -> list:
+        """ Returns the table names of the database, schema.table outside of dbo """
+
+        table_cursor = self.cursor()
+        table_cursor.execute(
+            """
+                select
+                    schema_name(tables.schema_id) as schema_name,
+                    lower(tables.[name]) as table_name,
+                    sum(partitions.rows) as row_count
+                from
+                    sys.tables
+                        left outer join sys.partitions on tables.object_id = partitions.object_id
+                group by
+                    tables.schema_id, lower(tables.[name])
+                --having
+                    --sum(partitions.rows) != 0
+                order by
+                    tables.schema_id, lower(tables.[name]);"""
+        )
+        ms_tables = [
+            ms_table[1] if ms_table[0] == "dbo" else f"{ms_table[0]}.{ms_table[1]}"
+            for ms_table in table_cursor.fetchall()
+        ]
+        table_cursor.close()
+
+        return ms_tables
+
+    # Private
+    def __autocommit_execute(self, *sql_statements: str):
+        """ Executes statements that can't run in a transaction (create & drop database) on their own connection """
+
+        autocommit_connection = pymssql.connect(
+            host=self.__login["host"],
+            server=self.__login["server"],
+            database=self.__database,
+            user=self.__login["user"],
+            password=self.__login["password"],
+            autocommit=True,
+        )
+
+        try:
+            autocommit_cursor = autocommit_connection.cursor()
+            for sql_statement in sql_statements:
+                autocommit_cursor.execute(sql_statement)
+            autocommit_cursor.close()
+        finally:
+            autocommit_connection.close()
+
+
+class SpreadsheetReader(SourceReader):
+    """ Reads the work sheets of a workbook with column types inferred from a sample, widened as the rows need """
+
+    def __init__(
+        self,
+        file_path: str,
+        encoding: str = 'utf-8',
+        delimiter: str = ',',
+        header_line: int = 1,
+        bottom_lines_skipped: int = 0,
+        type_sample_rows: int = 1000,
+        fetch_size: int = 1000,
+    ):
+        # header_line - the line with the column names, 0 names the columns column_#
+
+        super().__init__(fetch_size)
+
+        # constants - protected
+        self._file_path = file_path
+        self._encoding = encoding
+        self._delimiter = delimiter
+        self._header_line = header_line
+        self._bottom_lines_skipped = bottom_lines_skipped
+        self._type_sample_rows = type_sample_rows
+
+        # variables - protected
+        # open file - sheets are streamed a row at a time, never loaded whole
+        self._workbook = WorkbookReader(file_path, encoding, delimiter)
+
+    # Public
+    def batches(self, work_sheet: str, type_inference: TypeInference = None):
+        """ Yields a work sheet's columns, empty when it has no data rows, then its rows in batches, type_inference
+            are column types the sample is added to (ie validated over the whole file)
+        """
+
+        sheet_rows, header_row, type_inference, sample_rows = self.__sample(work_sheet, type_inference)
+
+        # empty sheet - no table is created
+        if len(sample_rows) == 0:
+            yield []
+            return
+
+        yield from self._sheet_batches(
+            itertools.chain(sample_rows, sheet_rows), self._column_names(header_row, type_inference), type_inference
+        )
+
+    def close(self):
+        """ Closes the workbook """
+
+        self._workbook.close()
+
+    def sample_types(self, work_sheet: str) -> TypeInference:
+        """ Returns the column types & sizes of a work sheet inferred from a sample of its rows """
+
+        return self.__sample(work_sheet)[2]
+
+    def tables(self) -> list:
+        """ Returns the work sheet names, a csv file is a single sheet named after the file """
+
+        return self._workbook.sheet_names()
+
+    # Protected
+    def _column_changes(
+        self, column_names: ArrayList, old_types: list, type_inference: TypeInference, changed_columns: list
+    ) -> ColumnChanges:
+        """ Returns the clauses that add or widen the changed columns """
+
+        column_types = type_inference.get_types()
+        column_sizes = type_inference.get_sizes()
+
+        column_changes = ColumnChanges()
+        for column_index in changed_columns:
+            # columns past the header
+            if column_index >= len(column_names):
+                column_names.append("column_" + str(column_index + 1))
+
+            column_name = column_names[column_index]
+            column_definition = self.__column_type(column_types[column_index], column_sizes[column_index])
+
+            # new column
+            if column_index >= len(old_types):
+                column_changes.append(f'add column "{column_name}" {column_definition}')
+                continue
+
+            # a longer varchar only changes the catalog, the rows aren't rewritten
+            pg_type, _, default = column_definition.partition(' default ')
+            if old_types[column_index] == column_types[column_index]:
+                column_changes.append(f'alter column "{column_name}" type {pg_type}')
+                continue
+
+            column_change = (
+                f'alter column "{column_name}" drop default, '
+                f'alter column "{column_name}" type {pg_type} using "{column_name}"::{pg_type}'
+            )
+            if default != '':
+                column_change += f', alter column "{column_name}" set default {default}'
+            column_changes.append(column_change)
+
+        return column_changes
+
+    def _column_names(self, header_row: list, type_inference: TypeInference) -> ArrayList:
+        """ Returns the column names from the header row, column_# when there's no name or it's already used """
+
+        column_names = ArrayList()
+        for column_index in range(len(type_inference.get_types())):
+            # uses column_# for names if no header_line used
+            if self._header_line == 0:
+                column_names.append("column_" + str(column_index + 1))
+            else:
+                # trims column names and replace whitespace characters with underscore
+                new_column_name = re.sub(
+                    "\\W+",
+                    "_",
+                    str(header_row[column_index] if column_index < len(header_row) else "").strip().lower(),
+                )
+                # uses column_# if empty column name
+                if new_column_name == "":
+                    column_names.append("column_" + str(column_index + 1))
+                # uses column name plus _# if column name is already used once
+                elif column_names.exists(new_column_name):
+                    column_names.append(new_column_name + "_" + str(column_index + 1))
+                # uses column name in spreadsheet
+                else:
+                    column_names.append(new_column_name)
+
+        return column_names
+
+    def _row_batch(self, column_types: list, rows: list) -> ArrayList:
+        """ Returns the rows transformed for their column types """
+
+        number_of_columns = len(column_types)
+        row_batch = ArrayList()
+
+        for row in rows:
+            row_values = ArrayList()
+
+            # short rows have empty cells at the end
+            if len(row) < number_of_columns:
+                row = list(row) + [""] * (number_of_columns - len(row))
+
+            # column from each row
+            for column_index, cell_value in enumerate(row):
+                # boolean
+                if column_types[column_index] == "boolean":
+                    row_values.append(str(cell_value).lower() == "true")
+                # integer, bigint & numeric
+                elif (
+                    column_types[column_index] == "integer"
+                    or column_types[column_index] == "bigint"
+                    or column_types[column_index] == "numeric"
+                ):
+                    row_values.append(0 if str(cell_value) == "" else cell_value)
+                # dates
+                elif column_types[column_index] == "date":
+                    if str(cell_value).strip() == "":
+                        row_values.append(None)
+                    else:
+                        row_values.append(str(cell_value).strip())
+                # strings
+                elif column_types[column_index] == "varchar":
+                    row_values.append(str(cell_value))
+            row_batch.append(row_values)
+
+        return row_batch
+
+    def _sheet_batches(self, rows, column_names: ArrayList, type_inference: TypeInference, overflow: bool = False):
+        """ Yields the columns then the transformed rows in batches, each after the ColumnChanges its rows need,
+            overflow keeps the types as they are & yields the rows they don't fit as OverflowRows instead
+        """
+
+        yield [
+            (column_name, self.__column_type(column_type, column_size))
+            for column_name, column_type, column_size in zip(
+                column_names, type_inference.get_types(), type_inference.get_sizes()
+            )
+        ]
+
+        row_batch = list(itertools.islice(rows, self._fetch_size))
+        while row_batch:
+            # overflow - the rows the types don't fit are set aside untransformed
+            if overflow:
+                misfit_rows = type_inference.misfits(row_batch)
+                if len(misfit_rows) > 0:
+                    yield OverflowRows(row_batch[row_index] for row_index in misfit_rows)
+
+                    misfit_rows = set(misfit_rows)
+                    row_batch = [row for row_index, row in enumerate(row_batch) if row_index not in misfit_rows]
+            else:
+                old_types = type_inference.get_types()
+                changed_columns = type_inference.widen(row_batch)
+
+                # rows the types don't fit - their columns are added or widened first
+                if len(changed_columns) > 0:
+                    yield self._column_changes(column_names, old_types, type_inference, changed_columns)
+
+            yield self._row_batch(type_inference.get_types(), row_batch)
+            row_batch = list(itertools.islice(rows, self._fetch_size))
+
+    # Private
+    def __column_type(self, column_type: str, column_size: int) -> str:
+        """ Returns the pg type & default of a spreadsheet column """
+
+        # string - can't have a varchar(0)
+        if column_type == "varchar":
+            return f"varchar({max(column_size, 1)}) default ''"
+        # integer or bigint
+        elif column_type == "integer" or column_type == "bigint":
+            return f"{column_type} default 0"
+        # numeric
+        elif column_type == "numeric":
+            return "float default 0"
+        # boolean
+        elif column_type == "boolean":
+            return "boolean default 'false'"
+
+        # date
+        return "timestamp"
+
+    def __sample(self, work_sheet: str, type_inference: TypeInference = None) -> tuple:
+        """ Returns a work sheet's rows after the sample, its header row, the sampled types & the sample rows """
+
+        # header line is kept for the column names
+        sheet_rows = self._workbook.rows(work_sheet, self._bottom_lines_skipped)
+        header_rows = list(itertools.islice(sheet_rows, self._header_line))
+        header_row = header_rows[-1] if len(header_rows) == self._header_line > 0 else []
+
+        # column types & sizes - inferred from a sample of the rows, widened as the rows need
+        if type_inference is None:
+            type_inference = TypeInference(self._type_sample_rows)
+        sample_rows = type_inference.sample(sheet_rows)
+
+        # header columns past the data are varchar
+        type_inference.widen([[""] * len(header_row)])
+
+        return sheet_rows, header_row, type_inference, sample_rows
+
+
+class CsvReader(SpreadsheetReader):
+    """ Reads a csv or tsv file like a single sheet workbook, or one of its record aligned chunks """
+
+    # Public
+    def chunk_batches(self, chunk_start: int, chunk_end: int, bottom_lines_skipped: int, type_inference: TypeInference):
+        """ Yields the columns then the rows of a chunk in batches, type_inference are the table's column types
+            (sampled, see chunks), the rows they don't fit are yielded as OverflowRows before each batch
+        """
+
+        yield from self._sheet_batches(
+            self._workbook.chunk_rows(chunk_start, chunk_end, bottom_lines_skipped),
+            self._column_names([], type_inference),
+            type_inference,
+            overflow=True,
+        )
+
+    def chunks(self, chunk_size: int) -> list:
+        """ Returns the (start, end) byte ranges of the file split into chunk_size record aligned chunks after the
+            header line, loaded with the sampled column types by chunk_batches
+        """
+
+        return self._workbook.chunks(chunk_size, self._header_line)
+
+    def overflow_batches(self, rows, column_names: list, type_inference: TypeInference, overflow_types: list):
+        """ Yields the ColumnChanges that widen the table's column types (type_inference) to hold every chunk's
+            overflow types, then the chunks' OverflowRows transformed in batches
+        """
+
+        old_types = type_inference.get_types()
+
+        # one change of each column for every chunk
+        changed_columns = []
+        for chunk_types in overflow_types:
+            for column_index in type_inference.merge(chunk_types):
+                if column_index not in changed_columns:
+                    changed_columns.append(column_index)
+
+        if len(changed_columns) > 0:
+            yield self._column_changes(ArrayList(column_names), old_types, type_inference, sorted(changed_columns))
+
+        # the merged types hold every row
+        column_types = type_inference.get_types()
+
+        row_batch = list(itertools.islice(rows, self._fetch_size))
+        while row_batch:
+            yield self._row_batch(column_types, row_batch)
+            row_batch = list(itertools.islice(rows, self._fetch_size))
+
+
+def _cursor_batches(data_cursor, sql_statement: str, fetch_size: int, parameters: tuple = None):
+    """ Yields a query's rows as lists in fetch_size batches, closes the cursor when done """
+
+    try:
+        if parameters is None:
+            data_cursor.execute(sql_statement)
+        else:
+            data_cursor.execute(sql_statement, parameters)
+
+        row_batch = data_cursor.fetchmany(fetch_size)
+        while row_batch:
+            yield [list(row) for row in row_batch]
+            row_batch = data_cursor.fetchmany(fetch_size)
+    finally:
+        data_cursor.close()
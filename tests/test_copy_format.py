@@ -0,0 +1,130 @@
+""" Tests - copy text & binary payloads """
+
+# standard library imports
+import decimal
+import os
+import struct
+import sys
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# local library imports
+from column_batch import ColumnBatch
+from copy_format import BINARY_SIGNATURE
+from copy_format import CopyBinaryEncoder
+from copy_format import CopyTextEncoder
+
+def binary_payload(*fields: bytes) -> bytes:
+    """ Returns the copy binary payload of one row with the encoded fields (length & data) """
+
+    return BINARY_SIGNATURE + struct.pack('!iih', 0, 0, len(fields)) + b''.join(fields) + b'\xff\xff'
+
+def numeric_field(groups: list, weight: int, sign: int, display_scale: int) -> bytes:
+    """ Returns a numeric field - its length then base 10000 digit count, weight, sign, display scale & digits """
+
+    data = struct.pack(f'!hhHH{len(groups)}H', len(groups), weight, sign, display_scale, *groups)
+
+    return struct.pack('!i', len(data)) + data
+
+
+class CopyTextEncoderTest(unittest.TestCase):
+    """ Copy text lines, escapes & nulls """
+
+    def test_rows(self):
+        rows = [
+            [1, 'a\tb\\c\nd\re', None, True, decimal.Decimal('-1.50'), date(2024, 2, 29), b'\x00\xff'],
+            [0.25, '', None, False, 0, None, bytearray(b'')],
+        ]
+
+        self.assertEqual(
+            CopyTextEncoder().encode_rows(rows),
+            b'1\ta\\tb\\\\c\\nd\\re\t\\N\tt\t-1.50\t2024-02-29\t\\\\x00ff\n0.25\t\t\\N\tf\t0\t\\N\t\\\\x\n',
+        )
+
+    def test_no_rows(self):
+        self.assertEqual(CopyTextEncoder().encode_rows([]), b'')
+
+    def test_column_batch(self):
+        column_batch = ColumnBatch.from_columns(
+            ['integer', 'boolean', 'float', 'object'], [[1, None], [True, None], [0.5, None], ['x\ty', None]]
+        )
+
+        self.assertEqual(CopyTextEncoder().encode_rows(column_batch), b'1\tt\t0.5\tx\\ty\n\\N\t\\N\t\\N\t\\N\n')
+
+
+class CopyBinaryEncoderTest(unittest.TestCase):
+    """ Copy binary fields, numeric base 10000 packing & the types left to the text format """
+
+    def numeric(self, value) -> bytes:
+        """ Returns the payload of a one numeric column row """
+
+        return CopyBinaryEncoder(['numeric(20,8)']).encode_rows([[value]])
+
+    def test_nulls(self):
+        payload = CopyBinaryEncoder(['integer', 'character varying(8)']).encode_rows([[None, None], [7, 'é']])
+
+        self.assertEqual(
+            payload,
+            BINARY_SIGNATURE
+            + struct.pack('!iih', 0, 0, 2)
+            + b'\xff\xff\xff\xff\xff\xff\xff\xff'
+            + struct.pack('!h', 2)
+            + struct.pack('!ii', 4, 7)
+            + struct.pack('!i', 2)
+            + 'é'.encode()
+            + b'\xff\xff',
+        )
+
+    def test_numeric_zero(self):
+        self.assertEqual(self.numeric(decimal.Decimal('0')), binary_payload(numeric_field([], 0, 0x0000, 0)))
+        # negative zero is written as zero, keeping its scale
+        self.assertEqual(self.numeric(decimal.Decimal('-0.00')), binary_payload(numeric_field([], 0, 0x0000, 2)))
+
+    def test_numeric_negative(self):
+        self.assertEqual(
+            self.numeric(decimal.Decimal('-12345.678')), binary_payload(numeric_field([1, 2345, 6780], 1, 0x4000, 3))
+        )
+
+    def test_numeric_scale_past_digits(self):
+        self.assertEqual(self.numeric(decimal.Decimal('0.001')), binary_payload(numeric_field([10], -1, 0x0000, 3)))
+        self.assertEqual(
+            self.numeric(decimal.Decimal('0.00001')), binary_payload(numeric_field([1000], -2, 0x0000, 5))
+        )
+
+    def test_numeric_trailing_zero_groups(self):
+        self.assertEqual(self.numeric(decimal.Decimal('1E+8')), binary_payload(numeric_field([1], 2, 0x0000, 0)))
+        self.assertEqual(self.numeric(10000), binary_payload(numeric_field([1], 1, 0x0000, 0)))
+        self.assertEqual(
+            self.numeric(decimal.Decimal('12.50000000')), binary_payload(numeric_field([12, 5000], 0, 0x0000, 8))
+        )
+
+    def test_numeric_text_value(self):
+        self.assertEqual(self.numeric(' 1.5 '), binary_payload(numeric_field([1, 5000], 0, 0x0000, 1)))
+
+    def test_numeric_nan(self):
+        self.assertEqual(self.numeric(decimal.Decimal('NaN')), binary_payload(numeric_field([], 0, 0xC000, 0)))
+
+    def test_bytea(self):
+        self.assertEqual(
+            CopyBinaryEncoder(['bytea']).encode_rows([[b'\x00\xff']]),
+            binary_payload(struct.pack('!i', 2) + b'\x00\xff'),
+        )
+
+    def test_text_fallback(self):
+        # no binary encoder - the table is loaded with the text format instead
+        for column_types in (['integer', 'money'], ['timestamp with time zone'], ['time with time zone']):
+            self.assertFalse(CopyBinaryEncoder.supports(column_types))
+            with self.assertRaises(ValueError):
+                CopyBinaryEncoder(column_types)
+
+        self.assertTrue(
+            CopyBinaryEncoder.supports(
+                ['integer', 'numeric(12,2)', 'character varying(8)', 'timestamp without time zone', 'bytea', 'uuid']
+            )
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
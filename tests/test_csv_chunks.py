@@ -0,0 +1,154 @@
+""" Tests - csv chunks loaded by the process pool workers """
+
+# standard library imports
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# local library imports
+from data_loading import DataPipeline
+from source_readers import CsvReader
+
+class RecordingCursor:
+    """ Stand-in pg cursor keeping the statements & copy payloads it's given, the table has column_types """
+
+    def __init__(self, column_types: list):
+        self.column_types = column_types
+        self.statements = []
+        self.copies = []
+
+    def copy_expert(self, sql_statement: str, copy_file):
+        self.copies.append((sql_statement, copy_file.read()))
+
+    def execute(self, sql_statement: str):
+        self.statements.append(sql_statement)
+
+    def fetchall(self):
+        return [(column_type,) for column_type in self.column_types]
+
+    def fetchone(self):
+        return None
+
+
+class CsvChunkTest(unittest.TestCase):
+    """ The chunk workers load with copy whatever load_mode the etl call was given, the rows the sampled types
+        don't fit go to the chunk's overflow table
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'orders.csv')
+        with open(self.file_path, 'w', encoding='utf-8', newline='') as csv_file:
+            csv_file.write('id,name,amount\n')
+            for row in range(1, 200):
+                csv_file.write(f'{row},"name {row:03}",{row}.25\n')
+            csv_file.write('200,"name 200",n/a\n')
+
+        # no pg login - the worker pipeline is given a cursor that records what it's sent
+        patches = [
+            mock.patch('databases.Toml'),
+            mock.patch('databases.Logger'),
+            mock.patch('data_loading.Logger'),
+            mock.patch('databases.PG_CONNECTION_POOL'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.pipeline = DataPipeline('test', 'test_pg')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load_chunk(
+        self,
+        load_mode: str,
+        chunk_index: int,
+        column_types: list = ('integer', 'character varying(8)', 'double precision'),
+        journal_mode: str = 'none',
+    ) -> dict:
+        """ Loads a chunk of the file as a worker would, with the types of the first 100 rows (a 10 row sample),
+            column_types are the format_type of the table's columns
+        """
+
+        with CsvReader(self.file_path, type_sample_rows=10) as csv_reader:
+            csv_chunks = csv_reader.chunks(1024)
+            type_inference = csv_reader.sample_types('orders')
+
+        # the columns the parent created from the sampled types
+        self.cursor = RecordingCursor(list(column_types))
+        self.pipeline._PgSql__pg_cursor = self.cursor
+
+        self.assertEqual(len(csv_chunks), 5)
+        chunk_start, chunk_end = csv_chunks[chunk_index]
+
+        result = self.pipeline._etl_table(
+            'csv_chunk',
+            load_mode,
+            journal_mode,
+            False,
+            False,
+            (
+                self.file_path,
+                'orders',
+                'csv',
+                ',',
+                chunk_start,
+                chunk_end,
+                0,
+                type_inference,
+                chunk_index * 10000000 + 1,
+                f'orders_overflow_{chunk_index + 1}',
+            ),
+        )
+
+        self.assertGreater(result['rows'], 0)
+        self.assertFalse([statement for statement in self.cursor.statements if 'insert into csv.' in statement])
+
+        return result
+
+    def test_insert_loads_with_copy(self):
+        result = self.load_chunk('insert', 1)
+
+        self.assertEqual([sql_statement for sql_statement, _ in self.cursor.copies], ['copy csv.orders from stdin;'])
+        self.assertIsNone(result['overflow'])
+
+    def test_copy_binary(self):
+        self.load_chunk('copy_binary', 1)
+        copies = self.cursor.copies
+
+        self.assertEqual(
+            [sql_statement for sql_statement, _ in copies], ['copy csv.orders from stdin (format binary);']
+        )
+        self.assertTrue(copies[0][1].startswith(b'PGCOPY\n\xff\r\n\x00'))
+
+    def test_text_fallback_journaled_once(self):
+        # money has no binary encoder, the chunk is copied as text & its rows are journaled in one block
+        result = self.load_chunk('copy_binary', 1, ['integer', 'money', 'double precision'], 'compressed')
+
+        self.assertEqual(self.cursor.copies[0][0], 'copy csv.orders from stdin;')
+        journal_copies = [payload for sql_statement, payload in self.cursor.copies if 'sys.journal' in sql_statement]
+        self.assertEqual(len(journal_copies), 1)
+        self.assertIn(f"\tcopy\t{result['rows']}\t".encode(), journal_copies[0])
+
+    def test_overflow_rows(self):
+        result = self.load_chunk('copy', 4)
+
+        self.assertEqual(
+            self.cursor.copies[0],
+            ('copy csv.orders_overflow_5 (row_id, row_values) from stdin;', b'0\t[200, "name 200", "n/a"]\n'),
+        )
+        self.assertEqual(self.cursor.copies[1][0], 'copy csv.orders from stdin;')
+        self.assertEqual(len(self.cursor.copies[1][1].splitlines()), result['rows'])
+
+        overflow_table, overflow_types = result['overflow']
+        self.assertEqual(overflow_table, 'orders_overflow_5')
+        self.assertEqual(overflow_types.get_types(), ['integer', 'varchar', 'varchar'])
+
+
+if __name__ == '__main__':
+    unittest.main()
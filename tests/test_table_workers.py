@@ -0,0 +1,83 @@
+""" Tests - process pool workers closing their DataPipeline """
+
+# standard library imports
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# local library imports
+import data_loading
+
+class TableWorkerTest(unittest.TestCase):
+    """ A worker closes its DataPipeline after a failed table & in its close task at pool shutdown """
+
+    def setUp(self):
+        # no pg login - the connections come from a mock connection pool
+        self.connection_pool = mock.Mock()
+        patches = [
+            mock.patch('databases.Toml'),
+            mock.patch('databases.Logger'),
+            mock.patch('data_loading.Logger'),
+            mock.patch('databases.PG_CONNECTION_POOL', self.connection_pool),
+            mock.patch('data_loading.PG_CONNECTION_POOL', self.connection_pool),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.close_barrier = mock.Mock()
+        data_loading._init_table_worker('test', 'test_pg', 500, 1000, True, False, self.close_barrier)
+        self.addCleanup(setattr, data_loading, '_worker_pipeline', None)
+
+    def run_table(self) -> dict:
+        """ Runs a table task in the worker """
+
+        return data_loading._run_table_worker('fox_pro', 'copy', 'none', False, False, ('/tmp', 'orders.dbf', 'dbf'))
+
+    def test_close_twice(self):
+        pipeline = data_loading._worker_pipeline
+
+        pipeline.close()
+        release_count = self.connection_pool.release.call_count
+        pipeline.close()
+
+        self.assertGreater(release_count, 0)
+        self.assertEqual(self.connection_pool.release.call_count, release_count)
+
+    def test_failed_table(self):
+        pipeline = data_loading._worker_pipeline
+
+        with mock.patch.object(pipeline, 'close') as close, mock.patch.object(
+            pipeline, '_etl_table', side_effect=ValueError('orders.dbf')
+        ):
+            with self.assertRaises(ValueError):
+                self.run_table()
+            close.assert_called_once_with()
+
+        self.assertIsNone(data_loading._worker_pipeline)
+
+        # the worker's next table gets a new DataPipeline
+        with mock.patch.object(data_loading.DataPipeline, '_etl_table', return_value={'rows': 6}):
+            self.assertEqual(self.run_table(), {'rows': 6})
+        self.assertIsNotNone(data_loading._worker_pipeline)
+        self.assertIsNot(data_loading._worker_pipeline, pipeline)
+
+    def test_close_task(self):
+        with mock.patch.object(data_loading._worker_pipeline, 'close') as close:
+            data_loading._close_table_worker()
+
+        close.assert_called_once_with()
+        self.assertIsNone(data_loading._worker_pipeline)
+        self.connection_pool.close_all.assert_called_once_with()
+        self.close_barrier.wait.assert_called_once_with()
+
+        # a worker whose last table failed has nothing left to close
+        data_loading._close_table_worker()
+        self.assertEqual(self.close_barrier.wait.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+""" Type Inference """
+
+# standard library imports
+import random
+import itertools
+from datetime import date
+
+# constants
+INTEGER_MAXIMUM = 2147483647
+BIGINT_MAXIMUM = 9223372036854775807
+
+class TypeInference:
+    """ Infers column types from the head window of rows, a column at a time, & widens them for the rows that don't
+        fit
+    """
+
+    def __init__(self, window_rows: int = 1000, seed: int = 0):
+        # window_rows - the head window is the first 10 x window_rows rows: the first window_rows of them, plus as
+        # many drawn at random from the rest, rows past the window are never sampled
+        # seed - the window draws the same rows from the same file on every load
+
+        # constants - private
+        self.__window_rows = window_rows
+        self.__random = random.Random(seed)
+        # numeric types from narrowest to widest
+        self.__numeric_types = ('integer', 'bigint', 'numeric')
+
+        # variables - private
+        self.__column_types = []
+        self.__column_sizes = []
+
+    # Public
+    def get_sizes(self) -> list:
+        """ Returns the longest value of each column """
+
+        return list(self.__column_sizes)
+
+    def get_types(self) -> list:
+        """ Returns the column types: boolean, date, integer, bigint, numeric or varchar """
+
+        return list(self.__column_types)
+
+    def merge(self, other: 'TypeInference') -> list:
+        """ Widens the column types & sizes to hold another inference's, returns the indexes of the changed columns """
+
+        changed_columns = []
+
+        for column_index, (column_type, column_size) in enumerate(zip(other.get_types(), other.get_sizes())):
+            # new columns
+            if column_index == len(self.__column_types):
+                self.__column_types.append('')
+                self.__column_sizes.append(0)
+                changed_columns.append(column_index)
+
+            if self.__widen_column(column_index, column_type, column_size) and column_index not in changed_columns:
+                changed_columns.append(column_index)
+
+        return changed_columns
+
+    def misfits(self, rows: list) -> list:
+        """ Returns the indexes of the rows the column types & sizes don't hold, without widening them """
+
+        width = len(self.__column_types)
+
+        # rows wider than the columns
+        misfit_rows = {row_index for row_index, row in enumerate(rows) if len(row) > width}
+
+        # one column of the batch at a time like widen, a value at a time only in the columns that don't fit
+        for column_index, column in enumerate(itertools.zip_longest(*rows, fillvalue='')):
+            if column_index == width:
+                break
+
+            if not self.__widens(column_index, self.__column_type(column), max(map(len, map(str, column)))):
+                continue
+
+            for row_index, value in enumerate(column):
+                if self.__widens(column_index, self.__column_type((value,)), len(str(value))):
+                    misfit_rows.add(row_index)
+
+        return sorted(misfit_rows)
+
+    def sample(self, rows) -> list:
+        """ Infers the column types from the head window of rows, returns every row of the window for loading """
+
+        # the first rows
+        read_rows = list(itertools.islice(rows, self.__window_rows))
+        sample = list(read_rows)
+
+        # window_rows drawn at random from the 9 x window_rows rows left in the window
+        window_draws = []
+        for row_index, row in enumerate(itertools.islice(rows, self.__window_rows * 9)):
+            read_rows.append(row)
+
+            if row_index < self.__window_rows:
+                window_draws.append(row)
+            else:
+                draw = self.__random.randint(0, row_index)
+                if draw < self.__window_rows:
+                    window_draws[draw] = row
+
+        self.widen(sample + window_draws)
+
+        return read_rows
+
+    def widen(self, rows: list) -> list:
+        """ Widens the column types & sizes to fit the rows, returns the indexes of the columns that changed """
+
+        changed_columns = []
+
+        # new columns - rows wider than any before them
+        width = max((len(row) for row in rows), default=0)
+        for column_index in range(len(self.__column_types), width):
+            self.__column_types.append('')
+            self.__column_sizes.append(0)
+            changed_columns.append(column_index)
+
+        # one column of the batch at a time, short rows are empty at the end,
+        #   a column with only empty cells when it's first seen is varchar
+        for column_index, column in enumerate(itertools.zip_longest(*rows, fillvalue='')):
+            column_type = self.__column_type(column)
+            column_size = max(map(len, map(str, column)))
+
+            if self.__widen_column(column_index, column_type, column_size) and column_index not in changed_columns:
+                changed_columns.append(column_index)
+
+        return changed_columns
+
+    # Private
+    def __column_type(self, column: tuple) -> str:
+        """ Returns the narrowest type of a column's values, empty cells don't decide the type """
+
+        values = [value for value in column if value is not None and value != '']
+
+        if len(values) == 0:
+            return ''
+
+        value_types = set(map(type, values))
+
+        # boolean - true & false are booleans as text too
+        if value_types <= {bool, str} and all(str(value).lower() in ('true', 'false') for value in values):
+            return 'boolean'
+        # date - datetime is a date subclass
+        if all(issubclass(value_type, date) for value_type in value_types):
+            return 'date'
+        # integer or bigint
+        if value_types == {int}:
+            largest = max(abs(min(values)), abs(max(values)))
+            if largest <= INTEGER_MAXIMUM:
+                return 'integer'
+            if largest <= BIGINT_MAXIMUM:
+                return 'bigint'
+            return 'numeric'
+        # numeric
+        if value_types <= {int, float}:
+            return 'numeric'
+
+        return 'varchar'
+
+    def __widens(self, column_index: int, column_type: str, column_size: int) -> bool:
+        """ Returns True if holding a type & size would change a column's type or varchar size """
+
+        old_type = self.__column_types[column_index]
+        new_type = self.__wider_type(old_type, column_type) or 'varchar'
+
+        return new_type != old_type or (new_type == 'varchar' and column_size > self.__column_sizes[column_index])
+
+    def __widen_column(self, column_index: int, column_type: str, column_size: int) -> bool:
+        """ Widens a column to hold a type & size, returns True if its type or varchar size changed """
+
+        old_type = self.__column_types[column_index]
+        old_size = self.__column_sizes[column_index]
+
+        self.__column_types[column_index] = self.__wider_type(old_type, column_type) or 'varchar'
+        self.__column_sizes[column_index] = max(old_size, column_size)
+
+        return self.__column_types[column_index] != old_type or (
+            self.__column_types[column_index] == 'varchar' and self.__column_sizes[column_index] > old_size
+        )
+
+    def __wider_type(self, column_type: str, other_type: str) -> str:
+        """ Returns the narrowest type that holds both types """
+
+        if column_type == other_type or other_type == '':
+            return column_type
+        if column_type == '':
+            return other_type
+        if column_type in self.__numeric_types and other_type in self.__numeric_types:
+            return max(column_type, other_type, key=self.__numeric_types.index)
+
+        return 'varchar'
@@ -2,10 +2,111 @@
 
 # standard library imports
 import os
+import re
+import hashlib
 import time
+import queue
+import threading
 import tomllib
 import logging
 
+# resource is not available on windows
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class AdaptiveBatchSize:
+    """ Tunes a batch size at runtime from the measured latency & throughput of each batch """
+
+    def __init__(
+        self,
+        initial_size: int = 500,
+        minimum_size: int = 50,
+        maximum_size: int = 5000,
+        target_seconds: float = 2.0,
+        adaptive: bool = True,
+    ):
+        # target_seconds - a batch slower than this shrinks the size whatever the throughput
+        # adaptive - False keeps initial_size & only records the stats
+
+        # constants - private
+        self.__minimum_size = min(minimum_size, initial_size)
+        self.__maximum_size = max(maximum_size, initial_size)
+        self.__target_seconds = target_seconds
+        self.__adaptive = adaptive
+        self.__step = 1.25  # size multiplier per adjustment
+        self.__window = 4  # batches measured at a size before adjusting
+
+        # variables - private
+        self.__size = initial_size
+        self.__direction = 1
+        self.__last_throughput = 0.0
+        self.__window_batches = 0
+        self.__window_items = 0
+        self.__window_seconds = 0.0
+        self.__total_batches = 0
+        self.__total_items = 0
+        self.__total_seconds = 0.0
+
+    # Private
+    def __resize(self, direction: int):
+        """ Steps the size up or down within the minimum & maximum, starts a new window """
+
+        self.__direction = direction
+        new_size = self.__size * self.__step if direction > 0 else self.__size / self.__step
+        self.__size = max(self.__minimum_size, min(self.__maximum_size, round(new_size)))
+
+        self.__window_batches = 0
+        self.__window_items = 0
+        self.__window_seconds = 0.0
+
+    # Public
+    def get_size(self) -> int:
+        """ Returns the current batch size """
+
+        return self.__size
+
+    def get_stats(self) -> dict:
+        """ Returns the current batch size, batches, items & items per second measured """
+
+        return {
+            'batch_size': self.__size,
+            'batches': self.__total_batches,
+            'items': self.__total_items,
+            'items_per_second': self.__total_items / self.__total_seconds if self.__total_seconds > 0 else 0.0,
+        }
+
+    def record(self, item_count: int, seconds: float):
+        """ Records a full batch, adjusts the size after each window of batches """
+
+        self.__total_batches += 1
+        self.__total_items += item_count
+        self.__total_seconds += seconds
+
+        if not self.__adaptive:
+            return
+
+        # latency - too slow a round trip always shrinks
+        if seconds > self.__target_seconds:
+            self.__last_throughput = 0.0
+            self.__resize(-1)
+            return
+
+        self.__window_batches += 1
+        self.__window_items += item_count
+        self.__window_seconds += seconds
+
+        if self.__window_batches < self.__window:
+            return
+
+        # throughput - keep stepping the same way while it improves, turn around when it drops
+        throughput = self.__window_items / self.__window_seconds if self.__window_seconds > 0 else float('inf')
+        direction = self.__direction if throughput >= self.__last_throughput else -self.__direction
+        self.__last_throughput = throughput
+        self.__resize(direction)
+
+
 class ArrayList(list):
     """ Extends list base class """
 
@@ -121,6 +222,53 @@ class DataLocation:
         return self.__path
 
 
+class FileSignature:
+    """ Size, modified time & content hash of a file for change detection """
+
+    def __init__(self, file_path: str):
+
+        file_stat = os.stat(file_path)
+
+        self.__file_path = file_path
+        self.__file_size = file_stat.st_size
+        self.__file_mtime = file_stat.st_mtime
+        self.__file_hash = ''
+
+    # Public
+    def get_hash(self) -> str:
+        """ Returns the blake2b hash of the file contents, read once in 1 MB blocks """
+
+        if self.__file_hash == '':
+            file_hash = hashlib.blake2b(digest_size=32)
+            with open(self.__file_path, 'rb') as hash_file:
+                for block in iter(lambda: hash_file.read(1048576), b''):
+                    file_hash.update(block)
+            self.__file_hash = file_hash.hexdigest()
+
+        return self.__file_hash
+
+    def get_mtime(self) -> float:
+        """ Returns the modified time in seconds since the epoch """
+
+        return self.__file_mtime
+
+    def get_size(self) -> int:
+        """ Returns the size in bytes """
+
+        return self.__file_size
+
+    def matches(self, file_size: int, file_mtime: float, file_hash: str) -> bool:
+        """ Returns True if the file is unchanged, the contents are only hashed when the mtime differs """
+
+        if file_size != self.__file_size:
+            return False
+
+        if file_mtime == self.__file_mtime:
+            return True
+
+        return file_hash == self.get_hash()
+
+
 class Logger(logging.Logger):
     """ Extends logging class to allow multiple files """
 
@@ -169,6 +317,167 @@ class Logger(logging.Logger):
         self.__log_file.warning(message)
 
 
+class MemoryUsage:
+    """ Peak resident memory (rss) of the current process from the start of the tracker """
+
+    def __init__(self):
+
+        # peak can only be reset on linux, elsewhere it's the peak since the process started
+        self.__reset_peak()
+
+    # Private
+    def __reset_peak(self):
+        """ Resets the linux peak rss (VmHWM) to the current rss """
+
+        try:
+            with open('/proc/self/clear_refs', 'w', encoding='utf-8') as clear_refs:
+                clear_refs.write('5')
+        except OSError:
+            pass
+
+    # Public
+    def get_peak(self) -> int:
+        """ Returns the peak rss in bytes, 0 when it can't be read """
+
+        # linux
+        try:
+            with open('/proc/self/status', 'r', encoding='utf-8') as status:
+                for line in status:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+
+        # mac (bytes) & other unix (kilobytes)
+        if resource is not None:
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return max_rss if os.uname().sysname == 'Darwin' else max_rss * 1024
+
+        return 0
+
+    def return_peak(self, print_string: str = '') -> str:
+        """ Returns the peak rss in megabytes """
+
+        if print_string != '':
+            print_string += ' '
+
+        return f'{print_string}{self.get_peak() / 1048576:,.1f} MB'
+
+
+class PrefetchQueue:
+    """ Runs table sources in order on a producer thread, handing their batches over a bounded queue """
+
+    def __init__(self, sources: list, max_batches: int = 4):
+        # sources - [(name, callable returning an iterable of batches)], read in order so the next
+        #   source is prefetched while the consumer is still working on the current one
+        # max_batches - batches waiting in the queue, the producer blocks when full (backpressure)
+
+        self.__queue = queue.Queue(maxsize=max_batches)
+        self.__stopped = threading.Event()
+        self.__end_of_source = object()
+
+        self.__producer = threading.Thread(target=self.__produce, args=(sources,), daemon=True)
+        self.__producer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    # Private
+    def __produce(self, sources: list):
+        """ Producer thread - reads every source in order, errors are passed on to the consumer """
+
+        try:
+            for name, source in sources:
+                for batch in source():
+                    if not self.__put((name, batch)):
+                        return
+                if not self.__put((name, self.__end_of_source)):
+                    return
+        except Exception as error:
+            self.__put((None, error))
+
+    def __put(self, item: tuple) -> bool:
+        """ Waits for room in the queue, returns False if the consumer closed the queue """
+
+        while not self.__stopped.is_set():
+            try:
+                self.__queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    # Public
+    def batches(self, name: str):
+        """ Yields the batches of the named source, sources must be consumed in order """
+
+        while True:
+            item_name, batch = self.__queue.get()
+
+            # producer error
+            if isinstance(batch, Exception):
+                raise batch
+            if item_name != name:
+                raise RuntimeError(f'prefetch sources read out of order: expected {name}, got {item_name}')
+            if batch is self.__end_of_source:
+                return
+
+            yield batch
+
+    def close(self):
+        """ Stops the producer & drops anything still queued """
+
+        self.__stopped.set()
+
+        while self.__producer.is_alive():
+            try:
+                self.__queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+class StringSanitizer:
+    """ Cleans & escapes string data for postgresql in a single pass """
+
+    def __init__(self, target: str = 'insert'):
+        # target - insert: E'' string literals, copy: copy text format, clean: no escaping
+
+        # remove hexadecimal values - 20 thru 7E are valid, tab, newline & carriage return are kept
+        #   U+0178, U+039C, U+03BC, U+1E9E & U+212B are the case insensitive matches of 80 thru FF
+        self.__invalid_characters = re.compile('[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\xFF\u0178\u039C\u03BC\u1E9E\u212B]+')
+
+        # escapes in order, backslash always first
+        if target == 'insert':
+            self.__escapes = (('\\', '\\\\'), ("'", "''"))
+        elif target == 'copy':
+            self.__escapes = (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r'))
+        elif target == 'clean':
+            self.__escapes = ()
+        else:
+            raise ValueError(f'target must be insert, copy or clean: {target}')
+
+    def sanitize(self, str_data: str) -> str:
+        """ Returns the string without trailing spaces & invalid characters, escaped for the target """
+
+        # Remove spaces
+        str_data = str_data.rstrip()
+
+        # printable ascii has nothing to remove
+        if not (str_data.isascii() and str_data.isprintable()):
+            str_data = self.__invalid_characters.sub('', str_data)
+
+        # only replace characters that are in the string
+        for character, escaped in self.__escapes:
+            if character in str_data:
+                str_data = str_data.replace(character, escaped)
+
+        return str_data
+
+
 class Timer:
     """ Print the time between beginning and end of the timer """
 
@@ -219,6 +528,11 @@ class Timer:
         return time_string
 
     # Public
+    def get_seconds(self) -> float:
+        """ Returns the seconds from start for this timer """
+
+        return time.time() - self.__start_time
+
     def return_time(self, print_string: str = '') -> str:
         """ Returns the time from start for this timer """
 
@@ -0,0 +1,217 @@
+""" Workbook Reader """
+
+# standard library imports
+import io
+import os
+import csv
+import math
+import mmap
+from collections import deque
+from datetime import date, datetime
+
+# third party library imports
+import openpyxl
+import pyexcel
+
+class WorkbookReader:
+    """ Streams the rows of a workbook's sheets: xlsx & xlsm read only, csv & tsv line by line or in chunks """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8', delimiter: str = ','):
+        # delimiter - csv files only, tsv files are tab delimited
+
+        # constants - private
+        self.__file_path = file_path
+        self.__file_type = os.path.splitext(file_path)[1].lower().lstrip('.')
+        self.__encoding = encoding
+        self.__delimiter = '\t' if self.__file_type == 'tsv' else delimiter
+
+        # variables - private
+        self.__workbook = None
+        self.__csv_file = None
+        self.__memory_map = None
+
+        # read only - rows are parsed from the sheet xml as they're iterated, never held as a whole
+        if self.__file_type in ('xlsx', 'xlsm'):
+            self.__workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        # xls is capped at 65,536 rows a sheet, pyexcel still loads it whole
+        elif self.__file_type == 'xls':
+            self.__workbook = pyexcel.get_book(file_name=file_path, encoding=encoding)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    # Public
+    def chunk_rows(self, start: int, end: int, bottom_lines_skipped: int = 0):
+        """ Yields the rows of a csv chunk like rows(), strict parsing raises csv.Error if a quoted field is split """
+
+        # chunks end on a newline so a multi-byte character is never split
+        chunk_text = self.__csv_memory_map()[start:end].decode(self.__encoding)
+        csv_rows = csv.reader(io.StringIO(chunk_text, newline=''), delimiter=self.__delimiter, strict=True)
+
+        yield from self.__held_back(
+            ([self.__csv_value(value) for value in row] for row in csv_rows), bottom_lines_skipped
+        )
+
+    def chunks(self, chunk_size: int, skip_lines: int = 0) -> list:
+        """ Returns the (start, end) byte ranges of a csv file split into chunk_size record aligned chunks,
+            after its first skip_lines records
+        """
+
+        if self.__file_type in ('xlsx', 'xlsm', 'xls'):
+            raise ValueError(f'only csv & tsv files split into chunks: {self.__file_path}')
+
+        memory_map = self.__csv_memory_map()
+
+        # empty file
+        if memory_map is None:
+            return []
+
+        position = 0
+        for _ in range(skip_lines):
+            position = self.__record_end(position, position)
+
+        boundaries = [position]
+
+        # each chunk ends on the first newline past chunk_size that isn't inside a quoted field
+        while boundaries[-1] + chunk_size < len(memory_map):
+            position = self.__record_end(boundaries[-1], boundaries[-1] + chunk_size)
+
+            if position >= len(memory_map):
+                break
+
+            boundaries.append(position)
+
+        boundaries.append(len(memory_map))
+
+        return [(start, end) for start, end in zip(boundaries[:-1], boundaries[1:]) if start < end]
+
+    def close(self):
+        """ Closes the workbook file """
+
+        if self.__file_type in ('xlsx', 'xlsm') and self.__workbook is not None:
+            self.__workbook.close()
+
+        if self.__memory_map is not None:
+            self.__memory_map.close()
+            self.__csv_file.close()
+
+        self.__workbook = None
+        self.__csv_file = None
+        self.__memory_map = None
+
+    def rows(self, sheet_name: str, bottom_lines_skipped: int = 0):
+        """ Yields the rows of a sheet as lists with '' for empty cells, holding back the last bottom_lines_skipped """
+
+        yield from self.__held_back(self.__sheet_rows(sheet_name), bottom_lines_skipped)
+
+    def sheet_names(self) -> list:
+        """ Returns the sheet names, a csv file is a single sheet named after the file """
+
+        if self.__file_type in ('xlsx', 'xlsm'):
+            return list(self.__workbook.sheetnames)
+        elif self.__file_type == 'xls':
+            return list(self.__workbook.sheet_names())
+
+        return [os.path.basename(self.__file_path)]
+
+    # Private
+    def __csv_memory_map(self):
+        """ Returns the read only memory map of a csv file, None for an empty file """
+
+        # the pages are shared with every process mapping the same file
+        if self.__memory_map is None and os.path.getsize(self.__file_path) > 0:
+            self.__csv_file = open(self.__file_path, 'rb')
+            self.__memory_map = mmap.mmap(self.__csv_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return self.__memory_map
+
+    @staticmethod
+    def __csv_value(value: str):
+        """ Returns a csv value as an int, float, date or datetime when it is one, like pyexcel's auto detection """
+
+        # leading zeros (zip codes, account numbers) stay strings
+        if value == '' or '_' in value or (value[0] == '0' and len(value) > 1 and value[1] != '.'):
+            return value
+
+        try:
+            return int(value)
+        except ValueError:
+            pass
+
+        try:
+            float_value = float(value)
+            # nan & inf stay strings
+            if math.isfinite(float_value):
+                return float_value
+        except ValueError:
+            pass
+
+        # yyyy-mm-dd & yyyy-mm-dd hh:mm:ss
+        if len(value) in (10, 19) and value[4:5] == '-' and value[7:8] == '-':
+            try:
+                if len(value) == 10:
+                    return date.fromisoformat(value)
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+
+        return value
+
+    @staticmethod
+    def __held_back(rows, bottom_lines_skipped: int):
+        """ Yields the rows, holding back the last bottom_lines_skipped """
+
+        # rows wait in the buffer until bottom_lines_skipped more rows follow them
+        held_rows = deque()
+
+        for row in rows:
+            held_rows.append(row)
+
+            if len(held_rows) > bottom_lines_skipped:
+                yield held_rows.popleft()
+
+    def __record_end(self, record_start: int, position: int) -> int:
+        """ Returns the position after the first newline from position that's outside quotes, counting the quotes
+            from record_start (the start of a record) to know whether position is inside a quoted field
+        """
+
+        memory_map = self.__memory_map
+
+        # an odd number of quotes - inside a quoted field, escaped quotes ("") come in pairs
+        quoted = memory_map[record_start:position].count(b'"') % 2 == 1
+
+        while True:
+            newline = memory_map.find(b'\n', position)
+
+            if newline == -1:
+                return len(memory_map)
+
+            quoted ^= memory_map[position:newline].count(b'"') % 2 == 1
+            position = newline + 1
+
+            if not quoted:
+                return position
+
+    def __sheet_rows(self, sheet_name: str):
+        """ Yields every row of a sheet as a list """
+
+        if self.__file_type in ('xlsx', 'xlsm'):
+            work_sheet = self.__workbook[sheet_name]
+
+            # chart sheets have no cells
+            if not hasattr(work_sheet, 'iter_rows'):
+                return
+
+            for row in work_sheet.iter_rows(values_only=True):
+                yield ['' if value is None else value for value in row]
+
+        elif self.__file_type == 'xls':
+            yield from self.__workbook[sheet_name].rows()
+
+        else:
+            with open(self.__file_path, 'r', encoding=self.__encoding, newline='') as csv_file:
+                for row in csv.reader(csv_file, delimiter=self.__delimiter):
+                    yield [self.__csv_value(value) for value in row]